@@ -15,8 +15,12 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with Chavier.  If not, see <http://www.gnu.org/licenses/>.
 
-import cairo
+import os
 
+# the charts are painted on GTK widgets, which use pycairo
+os.environ.setdefault('PYCHA_CAIRO_BACKEND', 'pycairo')
+
+from pycha.backend import cairo
 from pycha.chart import DEFAULT_OPTIONS
 from pycha.bar import HorizontalBarChart, VerticalBarChart
 from pycha.line import LineChart
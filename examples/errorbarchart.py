@@ -17,8 +17,7 @@
 
 import sys
 
-import cairo
-
+from pycha.backend import cairo
 import pycha.bar
 
 
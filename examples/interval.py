@@ -15,8 +15,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
 
-import cairo
-
+from pycha.backend import cairo
 import pycha.line
 
 
@@ -18,8 +18,7 @@
 import random
 import sys
 
-import cairo
-
+from pycha.backend import cairo
 import pycha.scatter
 
 
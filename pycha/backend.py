@@ -0,0 +1,192 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+"""Selection of the cairo binding used by all the charts.
+
+PyCha works with cairocffi and with pycairo, but a process should load only
+one of them: their surfaces and contexts can not be mixed. The binding is
+chosen once, when this module is imported:
+
+ * if the PYCHA_CAIRO_BACKEND environment variable is set to 'cairocffi'
+   or 'pycairo', that binding is used
+ * otherwise cairocffi is used if it can be imported (it needs the cairo
+   library) and pycairo if not
+
+The chart modules get the binding from here, so the surfaces given to the
+charts must be created with the same binding::
+
+  from pycha.backend import cairo
+  surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 400, 300)
+
+Running ``python -m pycha.backend`` measures the overhead of both bindings
+on some typical charts, to choose the fastest one for a deployment.
+"""
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+ENVIRONMENT_VARIABLE = 'PYCHA_CAIRO_BACKEND'
+
+# backend names and the modules providing them, in order of preference
+BACKENDS = (
+    ('cairocffi', 'cairocffi'),
+    ('pycairo', 'cairo'),
+)
+
+# time.perf_counter is not available in Python 2
+clock = getattr(time, 'perf_counter', time.time)
+
+
+def load_backend(name=None):
+    """Return the (name, module) of a cairo binding.
+
+    name is one of the BACKENDS names. If it is None the first binding
+    that can be imported is returned.
+    """
+    modules = dict(BACKENDS)
+    if name is not None:
+        if name not in modules:
+            raise ValueError('Cairo backend "%s" is invalid!' % name)
+        return name, importlib.import_module(modules[name])
+
+    for name, moduleName in BACKENDS:
+        try:
+            return name, importlib.import_module(moduleName)
+        except (ImportError, OSError):
+            # cairocffi raises OSError when the cairo library is missing
+            continue
+    raise ImportError('PyCha needs cairocffi or pycairo')
+
+
+name, cairo = load_backend(os.environ.get(ENVIRONMENT_VARIABLE) or None)
+
+
+def matrix_tuple(matrix):
+    """Return the (xx, yx, xy, yy, x0, y0) components of a cairo Matrix"""
+    if hasattr(matrix, 'as_tuple'):
+        return matrix.as_tuple()
+    return (matrix.xx, matrix.yx, matrix.xy, matrix.yy, matrix.x0, matrix.y0)
+
+
+def measure_calls(module, calls=10000):
+    """Return the average time in seconds of some cairo calls.
+
+    module is a cairo binding. The result is a dict with the time of a
+    line_to, a set_source_rgb and a text_extents call and of a small
+    rectangle filled on an image surface.
+    """
+    surface = module.ImageSurface(module.FORMAT_ARGB32, 400, 300)
+    cx = module.Context(surface)
+    cx.set_font_size(10)
+
+    def measure(function):
+        start = clock()
+        for i in range(calls):
+            function(i)
+        return (clock() - start) / calls
+
+    def fill(i):
+        cx.rectangle(i % 390, i % 290, 10, 10)
+        cx.fill()
+
+    times = {
+        'line_to': measure(lambda i: cx.line_to(i % 400, i % 300)),
+        'set_source_rgb': measure(lambda i: cx.set_source_rgb(0, 0, 0)),
+        'text_extents': measure(lambda i: cx.text_extents('label')),
+        'fill': measure(fill),
+    }
+    cx.new_path()
+    surface.finish()
+    return times
+
+
+def measure_charts(repeat=20):
+    """Return the average time in seconds to render some typical charts.
+
+    The charts are rendered with the binding selected by this module.
+    """
+    # imported here because the chart modules import this one
+    from pycha.bar import VerticalBarChart
+    from pycha.line import LineChart
+    from pycha.pie import PieChart
+
+    lines = [('line%d' % i, [(x, (x * (i + 3)) % 17) for x in range(200)])
+             for i in range(5)]
+    bars = [('bar%d' % i, [(x, (x * (i + 5)) % 11) for x in range(20)])
+            for i in range(3)]
+    slices = [('slice%d' % i, [(0, i + 1)]) for i in range(8)]
+
+    times = {}
+    for chartName, chartClass, dataset in (
+            ('line', LineChart, lines),
+            ('bar', VerticalBarChart, bars),
+            ('pie', PieChart, slices)):
+        start = clock()
+        for i in range(repeat):
+            surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 400, 300)
+            chart = chartClass(surface)
+            chart.addDataset(dataset)
+            chart.render()
+            surface.finish()
+        times[chartName] = (clock() - start) / repeat
+    return times
+
+
+def benchmark(calls=10000, repeat=20):
+    """Compare the available cairo bindings.
+
+    Return a dict with a (callTimes, chartTimes) tuple for each binding
+    that can be imported (see measure_calls and measure_charts). The
+    charts are rendered in a new process for each binding, so they never
+    share one.
+    """
+    results = {}
+    for backendName, moduleName in BACKENDS:
+        try:
+            module = importlib.import_module(moduleName)
+        except (ImportError, OSError):
+            continue
+
+        env = dict(os.environ)
+        env[ENVIRONMENT_VARIABLE] = backendName
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'import json, pycha.backend as b; '
+            'print(json.dumps(b.measure_charts(%d)))' % repeat,
+        ], env=env)
+        charts = json.loads(output.decode('ascii'))
+        results[backendName] = (measure_calls(module, calls), charts)
+    return results
+
+
+def main():
+    print('Selected backend: %s' % name)
+    for backendName, (calls, charts) in sorted(benchmark().items()):
+        print('')
+        print(backendName)
+        for label, seconds in sorted(calls.items()):
+            print('  %-16s %8.2f us/call' % (label, seconds * 1e6))
+        for label, seconds in sorted(charts.items()):
+            print('  %-16s %8.2f ms/chart' % (label + ' chart', seconds * 1e3))
+
+
+if __name__ == '__main__':
+    main()
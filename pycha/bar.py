@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
 
+from pycha.backend import matrix_tuple
 from pycha.chart import Chart, uniqueIndices
 from pycha.color import hex2rgb
 from pycha.utils import safe_unicode
@@ -55,6 +56,98 @@ class BarChart(Chart):
 
     def _renderChart(self, cx):
         """Renders a horizontal/vertical bar chart"""
+        xx, yx, xy, yy, x0, y0 = matrix_tuple(cx.get_matrix())
+        if yx == 0 and xy == 0 and xx > 0 and yy > 0:
+            self._renderAlignedBars(cx, xx, yy, x0, y0)
+        else:
+            self._renderBars(cx)
+
+    def _getBarRectangle(self, bar):
+        """Return the (x, y, w, h) rectangle of a bar in surface units"""
+        chart = self.layout.chart
+        return (chart.x + chart.w * bar.x, chart.y + chart.h * bar.y,
+                chart.w * bar.w, chart.h * bar.h)
+
+    def _renderAlignedBars(self, cx, xx, yy, x0, y0):
+        """Renders the bars when they are aligned with the device pixels.
+
+        The rectangles are snapped to whole pixels and each pass (shadows,
+        fill of each dataset and strokes) is a single cairo path, instead
+        of several cairo operations per bar.
+        """
+
+        def snap(value, scale, offset):
+            return (round(value * scale + offset) - offset) / scale
+
+        rectangles = []
+        for bar in self.bars:
+            x, y, w, h = self._getBarRectangle(bar)
+            if (w < 1 or h < 1) and self.options.yvals.skipSmallValues:
+                continue  # don't draw when the bar is too small
+
+            left, top = snap(x, xx, x0), snap(y, yy, y0)
+            # keep at least one pixel so small bars do not vanish
+            w = max(snap(x + w, xx, x0) - left, 1.0 / xx)
+            h = max(snap(y + h, yy, y0) - top, 1.0 / yy)
+            rectangles.append((bar, (left, top, w, h)))
+
+        cx.save()
+        stroke_width = self.options.stroke.width
+        cx.set_line_width(max(stroke_width / xx, stroke_width / yy))
+
+        if self.options.stroke.shadow:
+            cx.set_source_rgba(0, 0, 0, 0.15)
+            for bar, rectangle in rectangles:
+                cx.rectangle(*self._getShadowRectangle(*rectangle))
+            cx.fill()
+
+        if self.options.shouldFill:
+            groups = {}
+            for bar, rectangle in rectangles:
+                groups.setdefault(bar.name, []).append(rectangle)
+            for name in self._getDatasetsKeys():
+                if name in groups:
+                    cx.set_source_rgb(*self.colorScheme[name])
+                    for rectangle in groups.pop(name):
+                        cx.rectangle(*rectangle)
+                    cx.fill()
+
+        if not self.options.stroke.hide:
+            cx.set_source_rgb(*hex2rgb(self.options.stroke.color))
+            for bar, rectangle in rectangles:
+                cx.rectangle(*rectangle)
+            cx.stroke()
+
+        for bar, rectangle in rectangles:
+            self._renderBarDecorations(cx, bar, *rectangle)
+        cx.restore()
+
+    def _renderBarDecorations(self, cx, bar, x, y, w, h):
+        """Renders the error bar and the value of a bar"""
+        if bar.yerr:
+            self._renderError(cx, x, y, w, h, bar.yval, bar.yerr)
+
+        # render yvals above/beside bars
+        if self.options.yvals.show:
+            cx.save()
+            cx.set_font_size(self.options.yvals.fontSize)
+            cx.set_source_rgb(*hex2rgb(self.options.yvals.fontColor))
+
+            if callable(self.options.yvals.renderer):
+                label = safe_unicode(self.options.yvals.renderer(bar),
+                                     self.options.encoding)
+            else:
+                label = safe_unicode(bar.yval, self.options.encoding)
+            extents = cx.text_extents(label)
+            labelW = extents[2]
+            labelH = extents[3]
+
+            self._renderYVal(cx, label, labelW, labelH, x, y, w, h)
+
+            cx.restore()
+
+    def _renderBars(self, cx):
+        """Renders the bars one by one"""
 
         def drawBar(bar):
             stroke_width = self.options.stroke.width
@@ -64,10 +157,7 @@ class BarChart(Chart):
             cx.set_line_width(ux)
 
             # gather bar proportions
-            x = self.layout.chart.x + self.layout.chart.w * bar.x
-            y = self.layout.chart.y + self.layout.chart.h * bar.y
-            w = self.layout.chart.w * bar.w
-            h = self.layout.chart.h * bar.h
+            x, y, w, h = self._getBarRectangle(bar)
 
             if (w < 1 or h < 1) and self.options.yvals.skipSmallValues:
                 return  # don't draw when the bar is too small
@@ -90,27 +180,7 @@ class BarChart(Chart):
                     cx.rectangle(x, y, w, h)
                     cx.stroke()
 
-            if bar.yerr:
-                self._renderError(cx, x, y, w, h, bar.yval, bar.yerr)
-
-            # render yvals above/beside bars
-            if self.options.yvals.show:
-                cx.save()
-                cx.set_font_size(self.options.yvals.fontSize)
-                cx.set_source_rgb(*hex2rgb(self.options.yvals.fontColor))
-
-                if callable(self.options.yvals.renderer):
-                    label = safe_unicode(self.options.yvals.renderer(bar),
-                                         self.options.encoding)
-                else:
-                    label = safe_unicode(bar.yval, self.options.encoding)
-                extents = cx.text_extents(label)
-                labelW = extents[2]
-                labelH = extents[3]
-
-                self._renderYVal(cx, label, labelW, labelH, x, y, w, h)
-
-                cx.restore()
+            self._renderBarDecorations(cx, bar, x, y, w, h)
 
         cx.save()
         for bar in self.bars:
@@ -304,6 +374,8 @@ class HorizontalBarChart(BarChart):
 
 class Rect(object):
 
+    __slots__ = ('x', 'y', 'w', 'h', 'xval', 'yval', 'yerr', 'name')
+
     def __init__(self, x, y, w, h, xval, yval, name, yerr=0.0):
         self.x, self.y, self.w, self.h = x, y, w, h
         self.xval, self.yval, self.yerr = xval, yval, yerr
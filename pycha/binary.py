@@ -0,0 +1,156 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+"""Binary files of series that are read through memory maps.
+
+A series file has a 32 bytes header followed by the columns of the
+series. Every number is little endian:
+
+====== ===== ============================================================
+Offset Bytes Content
+====== ===== ============================================================
+0      8     Magic string ``PYCHASER``
+8      4     Format version, an unsigned integer (currently 1)
+12     4     Flags, an unsigned integer. Bit 0 is set if there is a yerr
+             column
+16     8     Number of points (n), an unsigned integer
+24     8     Reserved, must be zero
+32     8 n   x column, float64 numbers
+32+8n  8 n   y column, float64 numbers
+32+16n 8 n   yerr column, float64 numbers (only if bit 0 of flags is set)
+====== ===== ============================================================
+
+read_series maps the file in memory and returns a Series whose columns
+use that memory directly, so opening a file takes the same time whatever
+its size and several processes reading the same file share its pages.
+"""
+
+import array
+import mmap
+import struct
+import sys
+
+from pycha.compat import numpy
+from pycha.series import Series, as_store, columns
+
+MAGIC = b'PYCHASER'
+VERSION = 1
+HAS_YERR = 1
+
+HEADER = struct.Struct('<8sIIQQ')
+
+
+class MappedSeries(Series):
+    """Series whose columns are stored in a memory mapped file.
+
+    When pickled, for example to send it to the pycha.parallel workers,
+    only the file name is stored and the file is mapped again when it is
+    unpickled.
+    """
+
+    def __init__(self, path, data, count, hasYerr):
+        self.path = path
+        self._data = data
+        x = _column(data, 0, count)
+        y = _column(data, 1, count)
+        yerr = _column(data, 2, count) if hasYerr else None
+        super(MappedSeries, self).__init__(x, y, yerr)
+
+    def __reduce__(self):
+        return read_series, (self.path, )
+
+    def __repr__(self):
+        return '<pycha.binary.MappedSeries of %d points from %s>' % (
+            len(self), self.path)
+
+
+def _column(data, index, count):
+    start = HEADER.size + index * count * 8
+    if numpy is not None:
+        return numpy.frombuffer(data, dtype='<f8', count=count, offset=start)
+
+    view = memoryview(data)[start:start + count * 8]
+    if sys.byteorder == 'little':
+        # used in place as native doubles
+        return view
+    column = array.array('d')
+    column.frombytes(view.tobytes())
+    column.byteswap()
+    return column
+
+
+def read_series(path, maxPoints=None):
+    """Return a MappedSeries with the series stored in a file.
+
+    If maxPoints is given the series is reduced to at most that number of
+    points with pycha.stream.reduce_columns (which needs NumPy), reading
+    the file only once.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError('%s is not a series file' % path)
+        magic, version, flags, count, reserved = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError('%s is not a series file' % path)
+        if version != VERSION:
+            raise ValueError('Version %d of series files is not supported'
+                             % version)
+
+        hasYerr = bool(flags & HAS_YERR)
+        size = HEADER.size + (3 if hasYerr else 2) * count * 8
+        f.seek(0, 2)
+        if f.tell() < size:
+            raise ValueError('%s is truncated' % path)
+        data = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+    series = MappedSeries(path, data, count, hasYerr)
+    if maxPoints is not None:
+        from pycha.stream import reduce_columns
+        return reduce_columns(series.x, series.y, maxPoints)
+    return series
+
+
+def write_series(path, store):
+    """Write a dataset store to a series file.
+
+    store can be anything accepted by Chart.addDataset.
+    """
+    store = as_store(store)
+    if isinstance(store, Series):
+        x, y, yerr = store.x, store.y, store.yerr
+    else:
+        store = list(store)
+        x, y = columns(store)
+        if store and len(store[0]) == 3:
+            yerr = [item[2] for item in store]
+        else:
+            yerr = None
+
+    flags = HAS_YERR if yerr is not None else 0
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(x), 0))
+        for values in (x, y, yerr):
+            if values is not None:
+                _writeColumn(f, values)
+
+
+def _writeColumn(f, values):
+    if numpy is not None:
+        f.write(numpy.asarray(values, dtype='<f8').tobytes())
+    else:
+        f.write(struct.pack('<%dd' % len(values), *values))
@@ -0,0 +1,294 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+"""Cache of rendered charts.
+
+A RenderCache returns the bytes of a chart rendered before with the same
+class, options, datasets, size and format instead of drawing it again::
+
+  cache = RenderCache(DirectoryStore('/var/cache/charts'))
+  png = cache.render(VerticalBarChart, options, dataset, 400, 300)
+
+The rendered charts are kept in a store: MemoryStore keeps them in this
+process and DirectoryStore in files that can be shared by several
+processes. Both evict the least recently used charts when their size
+exceeds a number of bytes.
+"""
+
+import array
+import collections
+import hashlib
+import io
+import os
+import tempfile
+
+import six
+
+from pycha.chart import DEFAULT_OPTIONS
+from pycha.parallel import render_chart, resolve_chart_class
+from pycha.series import RingSeries, Series, as_store, column, columns
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def content_hash(chartClass, options, dataset, width, height, fileFormat):
+    """Return an hexadecimal digest identifying a rendered chart.
+
+    The options are merged with the defaults first, so equivalent options
+    give the same digest. Callable options and ticks are identified by
+    their repr, which is only stable inside a process. The datasets are
+    identified by the bytes of their columns, so a list of float points and
+    a Series with the same values give the same digest.
+    """
+    merged = DEFAULT_OPTIONS.copy()
+    if options:
+        merged.merge(options)
+
+    digest = hashlib.sha1()
+    _update(digest, '%s.%s' % (chartClass.__module__, chartClass.__name__))
+    _update(digest, (width, height, fileFormat))
+    _update(digest, merged)
+    digest.update(b'[')
+    for name, store in dataset:
+        _update(digest, name)
+        _updateStore(digest, as_store(store))
+    digest.update(b']')
+    return digest.hexdigest()
+
+
+def _updateStore(digest, store):
+    """Feed the x, y and yerr columns of a dataset store to digest.
+
+    Stores other than Series and RingSeries are converted to a Series
+    first, which fails for objects that are not sequences of points. The
+    labels of some charts show their values as they are given (3 and 3.0
+    are different labels) so the types of those values are fed too.
+    """
+    if not isinstance(store, (Series, RingSeries)):
+        store = list(store)
+        _updateTypes(digest, store)
+        store = Series.fromPairs(store)
+    x, y = columns(store)
+    digest.update(b'S')
+    for values in (x, y, getattr(store, 'yerr', None)):
+        if values is None:
+            digest.update(b'N')
+        else:
+            data = memoryview(column(values)).tobytes()
+            digest.update(six.b('%d:' % len(data)))
+            digest.update(data)
+
+
+def _updateTypes(digest, points):
+    """Feed the type of every value of points to digest.
+
+    Nothing is fed when all the values are floats, like those of a Series.
+    """
+    types = {}
+    codes = array.array('H', [types.setdefault(type(value), len(types))
+                              for point in points for value in point])
+    if list(types) in ([], [float]):
+        return
+    digest.update(b'T')
+    _update(digest, [kind.__name__ for kind in sorted(types, key=types.get)])
+    data = codes.tobytes()
+    digest.update(six.b('%d:' % len(data)))
+    digest.update(data)
+
+
+def _update(digest, value):
+    """Feed value to digest in a canonical form"""
+    if isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value):
+            _update(digest, key)
+            _update(digest, value[key])
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'[')
+        for item in value:
+            _update(digest, item)
+        digest.update(b']')
+    else:
+        text = repr(value).encode('utf-8')
+        digest.update(six.b('%d:' % len(text)))
+        digest.update(text)
+
+
+class MemoryStore(object):
+    """Keeps rendered charts in memory"""
+
+    def __init__(self, maxBytes=DEFAULT_MAX_BYTES):
+        self.maxBytes = maxBytes
+        self.size = 0
+        self._items = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """Return the data stored for key or None"""
+        data = self._items.pop(key, None)
+        if data is not None:
+            self._items[key] = data
+        return data
+
+    def put(self, key, data):
+        """Store data for key evicting the least recently used items"""
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self._items[key] = data
+        self.size += len(data)
+        while self.size > self.maxBytes and self._items:
+            self.size -= len(self._items.popitem(last=False)[1])
+
+    def clear(self):
+        self._items.clear()
+        self.size = 0
+
+
+class DirectoryStore(object):
+    """Keeps rendered charts as files of a directory.
+
+    The modification time of each file records when it was last used.
+    """
+
+    def __init__(self, path, maxBytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.maxBytes = maxBytes
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.size = sum(size for filename, mtime, size in self._files())
+
+    def __len__(self):
+        return len(self._files())
+
+    def _filename(self, key):
+        return os.path.join(self.path, key)
+
+    def _files(self):
+        files = []
+        for name in os.listdir(self.path):
+            if name.startswith('.'):
+                # temporary file being written
+                continue
+            filename = os.path.join(self.path, name)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                # removed by another process
+                continue
+            files.append((filename, stat.st_mtime, stat.st_size))
+        return files
+
+    def get(self, key):
+        """Return the data stored for key or None"""
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                data = f.read()
+            os.utime(filename, None)
+        except (IOError, OSError):
+            return None
+        return data
+
+    def put(self, key, data):
+        """Store data for key evicting the least recently used files"""
+        # write to a temporary file first so other processes never read
+        # a partial chart
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix='.')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        filename = self._filename(key)
+        if os.path.exists(filename):
+            self.size -= os.path.getsize(filename)
+        os.rename(tmp, filename)
+        self.size += len(data)
+        if self.size > self.maxBytes:
+            self._evict()
+
+    def _evict(self):
+        files = sorted(self._files(), key=lambda item: item[1])
+        self.size = sum(size for filename, mtime, size in files)
+        for filename, mtime, size in files:
+            if self.size <= self.maxBytes:
+                break
+            try:
+                os.remove(filename)
+            except OSError:
+                continue
+            self.size -= size
+
+    def clear(self):
+        for filename, mtime, size in self._files():
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+        self.size = 0
+
+
+class RenderCache(object):
+    """Renders charts only when they are not in its store"""
+
+    def __init__(self, store=None):
+        if store is None:
+            store = MemoryStore()
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hitRate(self):
+        """Fraction of the renders served from the store"""
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / float(total)
+
+    def stats(self):
+        """Return a dict with the hits, misses, hit rate and stored bytes"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': self.hitRate,
+            'entries': len(self.store),
+            'bytes': self.store.size,
+        }
+
+    def render(self, chartClass, options, dataset, width=400, height=300,
+               fileFormat='png'):
+        """Return the bytes of the chart, rendering it only if needed.
+
+        chartClass can also be the dotted name of a chart class.
+        """
+        chartClass = resolve_chart_class(chartClass)
+        key = content_hash(chartClass, options, dataset, width, height,
+                           fileFormat)
+        data = self.store.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        chart = chartClass(None, options or {})
+        target = io.BytesIO()
+        render_chart(chart, dataset, target, fileFormat, width, height)
+        data = target.getvalue()
+        self.store.put(key, data)
+        return data
@@ -15,14 +15,13 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
 
-import copy
 import math
 
-import cairocffi as cairo
-from six.moves import reduce
-
+from pycha.backend import cairo
 from pycha.color import ColorScheme, hex2rgb, DEFAULT_COLOR
 from pycha.compat import getfullargspec
+from pycha.series import append, as_store, extents
+from pycha.text import set_font, text_extents
 from pycha.utils import safe_unicode
 
 
@@ -35,6 +34,8 @@ class Chart(object):
 
         # initialize storage
         self.datasets = []
+        self._extentsCache = None
+        self._dataExtents = None
 
         # computed values used in several methods
         self.layout = Layout()
@@ -52,7 +53,7 @@ class Chart(object):
         self.yticks = []
 
         # set the default options
-        self.options = copy.deepcopy(DEFAULT_OPTIONS)
+        self.options = DEFAULT_OPTIONS.copy()
         if options:
             self.options.merge(options)
 
@@ -60,13 +61,19 @@ class Chart(object):
         self._initSurface(surface)
 
         self.colorScheme = None
+        self._colorSchemeKey = None
 
         # debug mode to draw aditional hints
         self.debug = debug
 
     def addDataset(self, dataset):
-        """Adds an object containing chart data to the storage hash"""
-        self.datasets += dataset
+        """Adds an object containing chart data to the storage hash.
+
+        Each store can be a sequence of (x, y) tuples, a pycha.series.Series
+        or a 2-D NumPy array with x, y (and optionally yerr) columns.
+        """
+        self.datasets += [(name, as_store(store)) for name, store in dataset]
+        self._extentsCache = None
 
     def _getDatasetsKeys(self):
         """Return the name of each data set"""
@@ -91,8 +98,9 @@ class Chart(object):
         In the next render the surface will be cleaned before any drawing.
         """
         self.resetFlag = True
-        self.options = copy.deepcopy(DEFAULT_OPTIONS)
+        self.options = DEFAULT_OPTIONS.copy()
         self.datasets = []
+        self._extentsCache = None
 
     def render(self, surface=None, options={}):
         """Renders the chart with the specified options.
@@ -130,9 +138,16 @@ class Chart(object):
     def _setColorscheme(self):
         """Sets the colorScheme used for the chart using the
         options.colorScheme option
+
+        The previous color scheme is kept if neither the dataset names nor
+        the color scheme options have changed.
         """
         name = self.options.colorScheme.name
         keys = self._getDatasetsKeys()
+        schemeKey = (name, keys, dict(self.options.colorScheme.args))
+        if self.colorScheme is not None and schemeKey == self._colorSchemeKey:
+            return
+
         colorSchemeClass = ColorScheme.getColorScheme(name, None)
         if colorSchemeClass is None:
             raise ValueError('Color scheme "%s" is invalid!' % name)
@@ -142,6 +157,7 @@ class Chart(object):
         validArgs = getfullargspec(colorSchemeClass.__init__).args
         kwargs = dict([(k, v) for k, v in kwargs.items() if k in validArgs])
         self.colorScheme = colorSchemeClass(keys, **kwargs)
+        self._colorSchemeKey = schemeKey
 
     def _initSurface(self, surface):
         self.surface = surface
@@ -158,21 +174,66 @@ class Chart(object):
         self._updateChart()
         self._updateTicks()
 
-    def _updateXY(self):
-        """Calculates all kinds of metrics for the x and y axis"""
+    def _getExtents(self):
+        """Return the (minx, maxx, miny, maxy) tuple of all the datasets.
+
+        The result is cached until the datasets change, but only when
+        every store provides a version, like Series and RingSeries. Other
+        sequences, like lists, may change in place without changing their
+        length, so their extents are computed every time.
+        """
+        stores = self._getStoreSizes()
+        if not all(hasattr(store, 'version')
+                   for store in self._getDatasetsValues()):
+            self._extentsCache = None
+            return extents([store for store, size in stores])
+
+        cached = self._extentsCache
+        if cached is None or not _sameStores(cached[0], stores):
+            cached = (stores, extents([store for store, n in stores]))
+            self._extentsCache = cached
+        return cached[1]
+
+    def _getStoreSizes(self):
+        # stores that may change without changing their size, like Series
+        # and RingSeries, provide a version
+        return [(store, getattr(store, 'version', len(store)))
+                for store in self._getDatasetsValues()]
+
+    def _extendDataset(self, index, points):
+        """Append points to the store of the dataset at index.
+
+        Return False if the store dropped some of its previous points to
+        make room for the new ones, as windowed stores like RingSeries do.
+        """
+        points = list(points)
+        name, store = self.datasets[index]
+        size = len(store)
+        store = append(store, points)
+        self.datasets[index] = (name, store)
+        return len(store) == size + len(points)
+
+    def _updateXY(self, extents=None):
+        """Calculates all kinds of metrics for the x and y axis.
+
+        The extents of the datasets are computed when some axis has no
+        range, unless they are given. They are kept in _dataExtents.
+        """
         x_range_is_defined = self.options.axis.x.range is not None
         y_range_is_defined = self.options.axis.y.range is not None
 
         if not x_range_is_defined or not y_range_is_defined:
-            stores = self._getDatasetsValues()
+            if extents is None:
+                extents = self._getExtents()
+            minx, maxx, miny, maxy = extents
+        self._dataExtents = extents
 
         # gather data for the x axis
         if x_range_is_defined:
             self.minxval, self.maxxval = self.options.axis.x.range
         else:
-            xdata = [pair[0] for pair in reduce(lambda a, b: a + b, stores)]
-            self.minxval = float(min(xdata))
-            self.maxxval = float(max(xdata))
+            self.minxval = float(minx)
+            self.maxxval = float(maxx)
             if self.minxval * self.maxxval > 0 and self.minxval > 0:
                 self.minxval = 0.0
 
@@ -186,9 +247,8 @@ class Chart(object):
         if y_range_is_defined:
             self.minyval, self.maxyval = self.options.axis.y.range
         else:
-            ydata = [pair[1] for pair in reduce(lambda a, b: a + b, stores)]
-            self.minyval = float(min(ydata))
-            self.maxyval = float(max(ydata))
+            self.minyval = float(miny)
+            self.maxyval = float(maxy)
             if self.minyval * self.maxyval > 0 and self.minyval > 0:
                 self.minyval = 0.0
 
@@ -367,13 +427,13 @@ class Chart(object):
         cx.close_path()
         cx.stroke()
 
-        cx.select_font_face(self.options.axis.tickFont,
-                            cairo.FONT_SLANT_NORMAL,
-                            cairo.FONT_WEIGHT_NORMAL)
-        cx.set_font_size(self.options.axis.tickFontSize)
+        set_font(cx, self.options.axis.tickFont,
+                 self.options.axis.tickFontSize)
 
         label = safe_unicode(tick[1], self.options.encoding)
-        xb, yb, width, height, xa, ya = cx.text_extents(label)
+        xb, yb, width, height, xa, ya = text_extents(
+            cx, label, self.options.axis.tickFont,
+            self.options.axis.tickFontSize)
 
         x, y = text_position
 
@@ -435,13 +495,14 @@ class Chart(object):
 
     def _renderAxisLabel(self, cx, label, x, y, vertical=False):
         cx.save()
-        cx.select_font_face(self.options.axis.labelFont,
-                            cairo.FONT_SLANT_NORMAL,
-                            cairo.FONT_WEIGHT_BOLD)
-        cx.set_font_size(self.options.axis.labelFontSize)
+        set_font(cx, self.options.axis.labelFont,
+                 self.options.axis.labelFontSize,
+                 weight=cairo.FONT_WEIGHT_BOLD)
         cx.set_source_rgb(*hex2rgb(self.options.axis.labelColor))
 
-        xb, yb, width, height, xa, ya = cx.text_extents(label)
+        xb, yb, width, height, xa, ya = text_extents(
+            cx, label, self.options.axis.labelFont,
+            self.options.axis.labelFontSize, weight=cairo.FONT_WEIGHT_BOLD)
 
         if vertical:
             y = y + width / 2.0
@@ -526,14 +587,15 @@ class Chart(object):
     def _renderTitle(self, cx):
         if self.options.title:
             cx.save()
-            cx.select_font_face(self.options.titleFont,
-                                cairo.FONT_SLANT_NORMAL,
-                                cairo.FONT_WEIGHT_BOLD)
-            cx.set_font_size(self.options.titleFontSize)
+            set_font(cx, self.options.titleFont,
+                     self.options.titleFontSize,
+                     weight=cairo.FONT_WEIGHT_BOLD)
             cx.set_source_rgb(*hex2rgb(self.options.titleColor))
 
             title = safe_unicode(self.options.title, self.options.encoding)
-            extents = cx.text_extents(title)
+            extents = text_extents(cx, title, self.options.titleFont,
+                                   self.options.titleFontSize,
+                                   weight=cairo.FONT_WEIGHT_BOLD)
             title_width = extents[2]
 
             x = (self.layout.title.x + self.layout.title.w / 2.0 - title_width / 2.0)
@@ -546,6 +608,7 @@ class Chart(object):
 
     def _renderLegend(self, cx):
         """This function adds a legend to the chart"""
+        self.layout.legend = Area()
         if self.options.legend.hide:
             return
 
@@ -557,15 +620,15 @@ class Chart(object):
         width = 0
         height = padding
         keys = self._getDatasetsKeys()
-        cx.select_font_face(self.options.legend.legendFont,
-                            cairo.FONT_SLANT_NORMAL,
-                            cairo.FONT_WEIGHT_NORMAL)
-        cx.set_font_size(self.options.legend.legendFontSize)
-        for key in keys:
-            key = safe_unicode(key, self.options.encoding)
-            extents = cx.text_extents(key)
+        labels = [safe_unicode(key, self.options.encoding) for key in keys]
+        # each label is measured once and its height reused to draw it
+        heights = []
+        for label in labels:
+            extents = text_extents(cx, label, self.options.legend.legendFont,
+                                   self.options.legend.legendFontSize)
             width = max(extents[2], width)
             height += max(extents[3], bullet) + padding
+            heights.append(extents[3])
         width = padding + bullet + padding + width + padding
 
         # Compute legend position
@@ -580,6 +643,9 @@ class Chart(object):
             )
 
         # Draw the legend
+        self.layout.legend = Area(self.options.legend.position.left,
+                                  self.options.legend.position.top,
+                                  width, height)
         cx.save()
         cx.rectangle(self.options.legend.position.left,
                      self.options.legend.position.top,
@@ -590,7 +656,7 @@ class Chart(object):
         cx.set_source_rgb(*hex2rgb(self.options.legend.borderColor))
         cx.stroke()
 
-        def drawKey(key, x, y, text_height):
+        def drawKey(key, label, x, y, text_height):
             cx.rectangle(x, y, bullet, bullet)
             cx.set_source_rgb(*self.colorScheme[key])
             cx.fill_preserve()
@@ -598,19 +664,55 @@ class Chart(object):
             cx.stroke()
             cx.move_to(x + bullet + padding,
                        y + bullet / 2.0 + text_height / 2.0)
-            cx.show_text(key)
+            cx.show_text(label)
 
+        set_font(cx, self.options.legend.legendFont,
+                 self.options.legend.legendFontSize)
         cx.set_line_width(1)
         x = self.options.legend.position.left + padding
         y = self.options.legend.position.top + padding
-        for key in keys:
-            extents = cx.text_extents(key)
-            drawKey(key, x, y, extents[3])
-            y += max(extents[3], bullet) + padding
+        for key, label, text_height in zip(keys, labels, heights):
+            drawKey(key, label, x, y, text_height)
+            y += max(text_height, bullet) + padding
 
         cx.restore()
 
 
+def render_many(chart_class, options, datasets_iter, surface_factory):
+    """Render one chart for each dataset of datasets_iter.
+
+    All the charts share the same class and options so a single chart
+    object is reused: the options are merged once and the color scheme and
+    the sizes of the title and axis labels are only computed again when
+    they change. surface_factory is called without arguments to get the
+    surface of each chart.
+
+    This is a generator that yields every surface as soon as its chart is
+    rendered, so the memory used does not grow with the number of charts.
+    """
+    chart = chart_class(None, options)
+    for dataset in datasets_iter:
+        surface = surface_factory()
+        chart.datasets = []
+        chart.addDataset(dataset)
+        chart.render(surface)
+        yield surface
+
+
+def _sameStores(old, new):
+    """Return True if both lists hold the same stores with the same sizes.
+
+    Each list holds (store, size) tuples, where size is the version of the
+    stores that have one.
+    """
+    if len(old) != len(new):
+        return False
+    for (store1, size1), (store2, size2) in zip(old, new):
+        if store1 is not store2 or size1 != size2:
+            return False
+    return True
+
+
 def uniqueIndices(arr):
     """Return a list with the indexes of the biggest element of arr"""
     return range(max([len(a) for a in arr]))
@@ -629,13 +731,9 @@ class Area(object):
 
 def get_text_extents(cx, text, font, font_size, encoding):
     if text:
-        cx.save()
-        cx.select_font_face(font,
-                            cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_BOLD)
-        cx.set_font_size(font_size)
         safe_text = safe_unicode(text, encoding)
-        extents = cx.text_extents(safe_text)
-        cx.restore()
+        extents = text_extents(cx, safe_text, font, font_size,
+                               weight=cairo.FONT_WEIGHT_BOLD)
         return extents[2:4]
     return (0.0, 0.0)
 
@@ -652,6 +750,8 @@ class Layout(object):
         self.x_ticks = Area()
         self.y_ticks = Area()
         self.chart = Area()
+        # set when the legend is rendered
+        self.legend = Area()
 
         self._areas = (
             (self.title, (1, 126 / 255.0, 0)),  # orange
@@ -664,25 +764,16 @@ class Layout(object):
             (self.chart, (75 / 255.0, 75 / 255.0, 1.0)),  # blue
         )
 
+        self._labelsKey = None
+        self._labelsSize = None
+
     def update(self, cx, options, width, height, xticks, yticks):
         self.title.x = options.padding.left
         self.title.y = options.padding.top
         self.title.w = width - (options.padding.left + options.padding.right)
-        self.title.h = get_text_extents(cx,
-                                        options.title,
-                                        options.titleFont,
-                                        options.titleFontSize,
-                                        options.encoding)[1]
-        x_axis_label_height = get_text_extents(cx,
-                                               options.axis.x.label,
-                                               options.axis.labelFont,
-                                               options.axis.labelFontSize,
-                                               options.encoding)[1]
-        y_axis_label_width = get_text_extents(cx,
-                                              options.axis.y.label,
-                                              options.axis.labelFont,
-                                              options.axis.labelFontSize,
-                                              options.encoding)[1]
+        (self.title.h,
+         x_axis_label_height,
+         y_axis_label_width) = self._getLabelsSize(cx, options)
 
         x_axis_tick_labels_height = self._getAxisTickLabelsSize(cx, options,
                                                                 options.axis.x,
@@ -731,6 +822,37 @@ class Layout(object):
         self.chart.w = self.x_ticks.w
         self.chart.h = self.y_ticks.h
 
+    def _getLabelsSize(self, cx, options):
+        """Return the title height and the axis labels heights.
+
+        These texts do not depend on the data so their sizes are only
+        measured again when the options that affect them change.
+        """
+        key = (options.title, options.titleFont, options.titleFontSize,
+               options.axis.x.label, options.axis.y.label,
+               options.axis.labelFont, options.axis.labelFontSize,
+               options.encoding)
+        if key != self._labelsKey:
+            self._labelsSize = (
+                get_text_extents(cx,
+                                 options.title,
+                                 options.titleFont,
+                                 options.titleFontSize,
+                                 options.encoding)[1],
+                get_text_extents(cx,
+                                 options.axis.x.label,
+                                 options.axis.labelFont,
+                                 options.axis.labelFontSize,
+                                 options.encoding)[1],
+                get_text_extents(cx,
+                                 options.axis.y.label,
+                                 options.axis.labelFont,
+                                 options.axis.labelFontSize,
+                                 options.encoding)[1],
+            )
+            self._labelsKey = key
+        return self._labelsSize
+
     def render(self, cx):
 
         def draw_area(area, r, g, b):
@@ -744,16 +866,12 @@ class Layout(object):
         cx.restore()
 
     def _getAxisTickLabelsSize(self, cx, options, axis, ticks):
-        cx.save()
-        cx.select_font_face(options.axis.tickFont,
-                            cairo.FONT_SLANT_NORMAL,
-                            cairo.FONT_WEIGHT_NORMAL)
-        cx.set_font_size(options.axis.tickFontSize)
-
         max_width = max_height = 0.0
         if not axis.hide:
             extents = [
-                cx.text_extents(safe_unicode(tick[1], options.encoding))[2:4]  # get width and height as a tuple
+                text_extents(cx, safe_unicode(tick[1], options.encoding),
+                             options.axis.tickFont,
+                             options.axis.tickFontSize)[2:4]  # get width and height as a tuple
                 for tick in ticks
             ]
             if extents:
@@ -767,7 +885,6 @@ class Layout(object):
                         max_width * cos + max_height * sin,
                         max_width * sin + max_height * cos,
                     )
-        cx.restore()
         return max_width, max_height
 
 
@@ -775,11 +892,22 @@ class Option(dict):
     """Useful dict that allow attribute-like access to its keys"""
 
     def __getattr__(self, name):
-        if name in self.keys():
+        try:
             return self[name]
-        else:
+        except KeyError:
             raise AttributeError(name)
 
+    def copy(self):
+        """Return a copy of this Option and all the Options nested in it.
+
+        The rest of the values are shared, not copied, which is much faster
+        than copy.deepcopy and enough as long as they are not modified in
+        place: merge always replaces them.
+        """
+        return Option((key, value.copy() if isinstance(value, Option)
+                       else value)
+                      for key, value in self.items())
+
     def merge(self, other):
         """Recursive merge with other Option or dict object"""
         for key, value in other.items():
@@ -860,10 +988,28 @@ DEFAULT_OPTIONS = Option(
         snapToOrigin=False,
         renderer=None
     ),
+    downsample=Option(
+        method=None,
+        factor=2.0,
+    ),
     fillOpacity=1.0,
     shouldFill=True,
     barWidthFillFraction=0.75,
     pieRadius=0.4,
+    stack=Option(
+        mode='zero',
+    ),
+    scatter=Option(
+        mode='path',
+        binSize=4,
+        binShape='square',
+    ),
+    histogram=Option(
+        binning='sturges',
+        bins=10,
+        binWidth=None,
+        range=None,
+    ),
     colorScheme=Option(
         name='gradient',
         args=Option(
@@ -25,3 +25,8 @@ if PY3:  # pragma: no cover
     from inspect import getfullargspec  # noqa
 else:  # pragma: no cover
     from inspect import getargspec as getfullargspec  # noqa
+
+try:  # pragma: no cover
+    import numpy  # noqa
+except ImportError:  # pragma: no cover
+    numpy = None
@@ -0,0 +1,139 @@
+# Copyright(c) 2007-2019 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Aggregation of scatterplot points into bins.
+
+The functions of this module take the normalized coordinates of the points
+(in the [0, 1] range) and the size in pixels of the chart area and return a
+list of (x, y, count) tuples with the center of each non empty bin, in
+pixels relative to the chart area, and the number of points inside it.
+"""
+
+import math
+
+from six.moves import zip
+
+from pycha.compat import numpy
+from pycha.series import aslist
+
+# horizontal and vertical distance between hexagon centers, in radius units
+HEX_DX = math.sqrt(3)
+HEX_DY = 1.5
+
+
+def square_bins(x, y, width, height, size):
+    """Count the points falling in each cell of a grid of size pixels"""
+    columns = max(int(math.ceil(width / float(size))), 1)
+    rows = max(int(math.ceil(height / float(size))), 1)
+
+    if numpy is not None and isinstance(x, numpy.ndarray):
+        cols = numpy.clip((x * width / size).astype(numpy.int64),
+                          0, columns - 1)
+        rws = numpy.clip((y * height / size).astype(numpy.int64),
+                         0, rows - 1)
+        counts = numpy.bincount(cols * rows + rws, minlength=columns * rows)
+        cells = numpy.flatnonzero(counts)
+        return list(zip(((cells // rows + 0.5) * size).tolist(),
+                        ((cells % rows + 0.5) * size).tolist(),
+                        counts[cells].tolist()))
+
+    bins = {}
+    for i, j in zip(aslist(x), aslist(y)):
+        col = min(max(int(i * width / size), 0), columns - 1)
+        row = min(max(int(j * height / size), 0), rows - 1)
+        bins[(col, row)] = bins.get((col, row), 0) + 1
+    return [((col + 0.5) * size, (row + 0.5) * size, count)
+            for (col, row), count in sorted(bins.items())]
+
+
+def hex_bins(x, y, width, height, radius):
+    """Count the points falling in each cell of a hexagonal grid.
+
+    The hexagons are pointy topped and radius is the distance in pixels
+    from their center to any of their vertices.
+    """
+    dx = radius * HEX_DX
+    dy = radius * HEX_DY
+
+    if numpy is not None and isinstance(x, numpy.ndarray):
+        cols, rows = _hexCellsNumpy(x * width / dx, y * height / dy)
+        cells, counts = numpy.unique(numpy.stack((rows, cols)), axis=1,
+                                     return_counts=True)
+        rows, cols = cells
+        centerx = (cols + (rows & 1) / 2.0) * dx
+        return list(zip(centerx.tolist(), (rows * dy).tolist(),
+                        counts.tolist()))
+
+    bins = {}
+    for i, j in zip(aslist(x), aslist(y)):
+        cell = _hexCell(i * width / dx, j * height / dy)
+        bins[cell] = bins.get(cell, 0) + 1
+    return [((col + (row & 1) / 2.0) * dx, row * dy, count)
+            for (row, col), count in sorted(bins.items())]
+
+
+def _hexCell(px, py):
+    """Return the (row, col) of the hexagon containing a point.
+
+    px and py are measured in units of the horizontal and vertical distance
+    between the hexagon centers. Odd rows are shifted half a hexagon.
+    """
+    row = int(round(py))
+    col = int(round(px - (row & 1) / 2.0))
+    fy = py - row
+    if abs(fy) * 3 > 1:
+        # the point is near the border with the previous or next row
+        fx = px - (row & 1) / 2.0 - col
+        row2 = row + (1 if py > row else -1)
+        col2 = int(round(px - (row2 & 1) / 2.0))
+        fx2 = px - (row2 & 1) / 2.0 - col2
+        fy2 = py - row2
+        # distances are compared in the same units (radius)
+        distance = (fx * HEX_DX) ** 2 + (fy * HEX_DY) ** 2
+        distance2 = (fx2 * HEX_DX) ** 2 + (fy2 * HEX_DY) ** 2
+        if distance > distance2:
+            return row2, col2
+    return row, col
+
+
+def _hexCellsNumpy(px, py):
+    rows = numpy.rint(py).astype(numpy.int64)
+    cols = numpy.rint(px - (rows & 1) / 2.0).astype(numpy.int64)
+    fx = (px - (rows & 1) / 2.0 - cols) * HEX_DX
+    fy = (py - rows) * HEX_DY
+
+    rows2 = rows + numpy.where(py > rows, 1, -1)
+    cols2 = numpy.rint(px - (rows2 & 1) / 2.0).astype(numpy.int64)
+    fx2 = (px - (rows2 & 1) / 2.0 - cols2) * HEX_DX
+    fy2 = (py - rows2) * HEX_DY
+
+    other = fx * fx + fy * fy > fx2 * fx2 + fy2 * fy2
+    return numpy.where(other, cols2, cols), numpy.where(other, rows2, rows)
+
+
+def square(cx, x, y, size):
+    """Add a square of side size centered at (x, y) to the cairo path"""
+    cx.rectangle(x - size / 2.0, y - size / 2.0, size, size)
+
+
+def hexagon(cx, x, y, radius):
+    """Add a pointy topped hexagon centered at (x, y) to the cairo path"""
+    cx.move_to(x, y - radius)
+    for i in range(1, 6):
+        angle = math.pi / 2 - i * math.pi / 3
+        cx.line_to(x + radius * math.cos(angle), y - radius * math.sin(angle))
+    cx.close_path()
@@ -0,0 +1,142 @@
+# Copyright(c) 2007-2019 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Reduce the number of points of a line while keeping its shape.
+
+Every function here returns the indexes of the points to keep, in
+increasing order, so the same selection can be applied to the normalized
+coordinates and to the original values of a dataset.
+"""
+
+from pycha.compat import numpy
+from pycha.series import aslist
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and the last points and, for each of the threshold - 2
+    buckets in between, the point that forms the largest triangle with the
+    point selected in the previous bucket and the average of the next one.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    if numpy is not None and isinstance(x, numpy.ndarray):
+        return _lttbNumpy(x, y, threshold)
+
+    x, y = aslist(x), aslist(y)
+    every = (n - 2) / float(threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # average point of the next bucket
+        avgStart = int((i + 1) * every) + 1
+        avgEnd = min(int((i + 2) * every) + 1, n)
+        avgCount = avgEnd - avgStart
+        avgX = sum(x[avgStart:avgEnd]) / avgCount
+        avgY = sum(y[avgStart:avgEnd]) / avgCount
+
+        # point of this bucket with the largest triangle area
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = x[a], y[a]
+        maxArea = -1.0
+        for j in range(start, end):
+            area = abs((ax - avgX) * (y[j] - ay) - (ax - x[j]) * (avgY - ay))
+            if area > maxArea:
+                maxArea = area
+                a = j
+        selected.append(a)
+
+    selected.append(n - 1)
+    return selected
+
+
+def _lttbNumpy(x, y, threshold):
+    n = len(x)
+    every = (n - 2) / float(threshold - 2)
+    bounds = (numpy.arange(threshold) * every).astype(numpy.int64) + 1
+    bounds[-1] = n - 1
+
+    # the average of each bucket does not depend on the selected points
+    sumX = numpy.add.reduceat(x[1:n - 1], bounds[:-2] - 1)
+    sumY = numpy.add.reduceat(y[1:n - 1], bounds[:-2] - 1)
+    counts = numpy.diff(bounds[:-1])
+    avgX = numpy.append(sumX / counts, x[n - 1])
+    avgY = numpy.append(sumY / counts, y[n - 1])
+
+    selected = numpy.empty(threshold, dtype=numpy.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = bounds[i], bounds[i + 1]
+        ax, ay = x[a], y[a]
+        dx = (ax - avgX[i + 1]) * (y[start:end] - ay)
+        dy = (ax - x[start:end]) * (avgY[i + 1] - ay)
+        a = start + int(numpy.abs(dx - dy).argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(x, y, columns):
+    """Keep the lowest and the highest point of every pixel column.
+
+    x must hold normalized coordinates in the [0, 1] range. Spikes are
+    always preserved, unlike with lttb, at the cost of up to two points
+    per column.
+    """
+    n = len(x)
+    if columns < 1 or n <= 2 * columns:
+        return list(range(n))
+
+    if numpy is not None and isinstance(x, numpy.ndarray):
+        return _minmaxNumpy(x, y, columns)
+
+    x, y = aslist(x), aslist(y)
+    buckets = {}
+    for i in range(n):
+        col = min(int(x[i] * columns), columns - 1)
+        bucket = buckets.get(col)
+        if bucket is None:
+            buckets[col] = [i, i]
+        else:
+            if y[i] < y[bucket[0]]:
+                bucket[0] = i
+            if y[i] > y[bucket[1]]:
+                bucket[1] = i
+    return sorted(set(i for bucket in buckets.values() for i in bucket))
+
+
+def _minmaxNumpy(x, y, columns):
+    cols = numpy.minimum((x * columns).astype(numpy.int64), columns - 1)
+    # sort by column and then by value: the first and the last item of each
+    # column in this order are its lowest and highest points
+    order = numpy.lexsort((y, cols))
+    sortedCols = cols[order]
+    changes = numpy.r_[True, sortedCols[1:] != sortedCols[:-1]]
+    starts = numpy.flatnonzero(changes)
+    ends = numpy.r_[starts[1:], len(order)] - 1
+    return numpy.unique(numpy.concatenate((order[starts], order[ends])))
+
+
+METHODS = {
+    'lttb': lttb,
+    'minmax': minmax,
+}
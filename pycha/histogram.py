@@ -0,0 +1,289 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import math
+
+from pycha.bar import VerticalBarChart
+from pycha.compat import numpy
+from pycha.series import Series, aslist
+
+BINNINGS = ('fixed', 'sturges', 'fd')
+
+
+class Histogram(object):
+    """Number of samples falling in consecutive bins of the same width.
+
+    The last bin includes its right edge and every sample up to stop, which
+    absorbs the rounding errors of bins computed from the range of the
+    samples. Samples out of the bins are counted in underflow and overflow.
+    Histograms with the same bins can be merged, so the samples can be
+    counted in chunks or in several processes.
+    """
+
+    def __init__(self, start, width, bins, stop=None):
+        if width <= 0 or bins < 1:
+            raise ValueError('Histograms need a positive width and bins')
+        self.start = float(start)
+        self.width = float(width)
+        self.counts = [0] * bins
+        self.underflow = 0
+        self.overflow = 0
+        if stop is None:
+            self.stop = self.end
+        else:
+            self.stop = max(float(stop), self.end)
+
+    @classmethod
+    def fromSamples(cls, samples, binning='sturges', bins=10, binWidth=None,
+                    range=None):
+        """Build a Histogram with bins chosen from samples and count them"""
+        histogram = cls(*_layout(samples, binning, bins, binWidth, range))
+        histogram.add(samples)
+        return histogram
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def end(self):
+        return self.start + self.width * len(self.counts)
+
+    @property
+    def edges(self):
+        """Return the len(self) + 1 edges of the bins"""
+        return [self.start + i * self.width
+                for i in range(len(self.counts) + 1)]
+
+    def add(self, samples):
+        """Count more samples"""
+        bins = len(self.counts)
+        if numpy is not None:
+            values = numpy.asarray(samples, dtype=numpy.float64).ravel()
+            values = values[~numpy.isnan(values)]
+            indexes = numpy.floor((values - self.start) / self.width)
+            indexes[(indexes >= bins) & (values <= self.stop)] = bins - 1
+            under = indexes < 0
+            over = indexes >= bins
+            self.underflow += int(under.sum())
+            self.overflow += int(over.sum())
+            inside = indexes[~(under | over)].astype(numpy.int64)
+            counts = numpy.bincount(inside, minlength=bins)
+            self.counts = (numpy.asarray(self.counts) + counts).tolist()
+            return
+
+        stop = self.stop
+        counts = self.counts
+        for value in aslist(samples):
+            if value != value:
+                continue  # NaN
+            index = int(math.floor((value - self.start) / self.width))
+            if index >= bins and value <= stop:
+                index = bins - 1
+            if index < 0:
+                self.underflow += 1
+            elif index >= bins:
+                self.overflow += 1
+            else:
+                counts[index] += 1
+
+    def merge(self, other):
+        """Add the counts of other, which must have the same bins"""
+        bins = (self.start, self.width, len(self))
+        if (other.start, other.width, len(other)) != bins:
+            raise ValueError('Only histograms with the same bins can be '
+                             'merged')
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def __repr__(self):
+        return '<pycha.histogram.Histogram of %d bins from %g to %g>' % (
+            len(self), self.start, self.end)
+
+
+def bin_layout(samples, binning='sturges', bins=10, binWidth=None,
+               range=None):
+    """Return the (start, width, bins) tuple to count samples.
+
+    binning is one of:
+
+     * 'fixed': bins bins, or bins of binWidth if it is given
+     * 'sturges': log2(n) + 1 bins
+     * 'fd': bins of the width given by the Freedman-Diaconis rule,
+       2 IQR / n^(1/3), which suits data with long tails better
+
+    range is the (min, max) interval covered by the bins. By default it
+    goes from the lowest to the highest sample.
+    """
+    return _layout(samples, binning, bins, binWidth, range)[:3]
+
+
+def _layout(samples, binning, bins, binWidth, range):
+    """Like bin_layout, with the highest value of the last bin at the end"""
+    if binning not in BINNINGS:
+        raise ValueError('Binning "%s" is invalid!' % binning)
+
+    if numpy is not None:
+        samples = numpy.asarray(samples, dtype=numpy.float64).ravel()
+    else:
+        samples = aslist(samples)
+    n = len(samples)
+
+    if range is not None:
+        start, end = float(range[0]), float(range[1])
+    elif n:
+        start, end = float(min(samples)), float(max(samples))
+    else:
+        start, end = 0.0, 1.0
+    if end <= start:
+        # every sample has the same value
+        return start - 0.5, 1.0, 1, start
+
+    span = end - start
+    if binning == 'fd' and n > 1:
+        q1, q3 = _quartiles(samples)
+        if q3 > q1:
+            binWidth = 2 * (q3 - q1) / n ** (1 / 3.0)
+            binning = 'fixed'
+        else:
+            binning = 'sturges'
+
+    if binning == 'fixed' and binWidth:
+        return start, binWidth, max(int(math.ceil(span / binWidth)), 1), end
+    elif binning == 'fixed':
+        return start, span / bins, bins, end
+    bins = int(math.ceil(math.log(max(n, 1), 2))) + 1
+    return start, span / bins, bins, end
+
+
+def _quartiles(samples):
+    if numpy is not None and isinstance(samples, numpy.ndarray):
+        q1, q3 = numpy.percentile(samples, (25, 75))
+        return float(q1), float(q3)
+
+    values = sorted(samples)
+
+    def percentile(p):
+        # linear interpolation, as numpy.percentile does by default
+        position = (len(values) - 1) * p
+        low = int(math.floor(position))
+        high = min(low + 1, len(values) - 1)
+        return values[low] + (values[high] - values[low]) * (position - low)
+
+    return percentile(0.25), percentile(0.75)
+
+
+class HistogramChart(VerticalBarChart):
+    """Vertical bar chart of the distribution of some samples.
+
+    Each dataset added with addSamples is binned with the histogram
+    options and rendered as one bar per bin. All the datasets share the
+    same bins.
+    """
+
+    def __init__(self, surface=None, options={}, debug=False):
+        super(HistogramChart, self).__init__(surface, options, debug)
+        self.samples = []
+        self.histograms = []
+        self._histogramsKey = None
+
+    def addSamples(self, dataset):
+        """Adds (name, samples) pairs to the chart.
+
+        samples can be any sequence of numbers, like a NumPy array, or a
+        Histogram with counts computed before. All the Histogram objects
+        of a chart must have the same bins.
+        """
+        for name, samples in dataset:
+            if numpy is not None and not isinstance(samples, Histogram):
+                samples = numpy.asarray(samples, dtype=numpy.float64)
+            self.samples.append((name, samples))
+        self._histogramsKey = None
+
+    def reset(self):
+        super(HistogramChart, self).reset()
+        self.samples = []
+        self.histograms = []
+        self._histogramsKey = None
+
+    def _updateHistograms(self):
+        """Counts the samples and turns the counts into bar datasets"""
+        options = self.options.histogram
+        key = (options.binning, options.bins, options.binWidth,
+               options.range, len(self.samples))
+        if key == self._histogramsKey:
+            return
+
+        counted = [samples for name, samples in self.samples
+                   if isinstance(samples, Histogram)]
+        raw = [samples for name, samples in self.samples
+               if not isinstance(samples, Histogram)]
+        if counted:
+            first = counted[0]
+            layout = first.start, first.width, len(first), first.stop
+        else:
+            if numpy is not None:
+                allSamples = numpy.concatenate(raw)
+            else:
+                allSamples = [value for samples in raw
+                              for value in aslist(samples)]
+            layout = _layout(allSamples, options.binning, options.bins,
+                             options.binWidth, options.range)
+
+        self.histograms = []
+        for name, samples in self.samples:
+            histogram = Histogram(*layout)
+            if isinstance(samples, Histogram):
+                histogram.merge(samples)
+            else:
+                histogram.add(samples)
+            self.histograms.append((name, histogram))
+
+        indexes = list(range(layout[2]))
+        self.datasets = [(name, Series(indexes, histogram.counts))
+                         for name, histogram in self.histograms]
+        self._histogramsKey = key
+
+    def _update(self, options={}):
+        # the datasets must exist before the color scheme is built
+        self.setOptions(options)
+        if self.samples:
+            self._updateHistograms()
+        super(HistogramChart, self)._update()
+
+    def _updateTicks(self):
+        """Labels the x ticks with the sample value at their position.
+
+        The ticks are placed at the center of the bars, so a tick on a
+        bar gets the center of its bin. Ticks between bars (like those of
+        the axis.x.interval option) are interpolated between the bins.
+        """
+        super(HistogramChart, self)._updateTicks()
+        if not self.histograms or self.options.axis.x.ticks:
+            return
+
+        histogram = self.histograms[0][1]
+        prec = self.options.axis.x.tickPrecision
+        xticks = []
+        for pos, label in self.xticks:
+            center = histogram.start + (float(label) + 0.5) * histogram.width
+            center = round(center, prec)
+            if prec == 0:
+                center = int(center)
+            xticks.append((pos, center))
+        self.xticks = xticks
@@ -15,96 +15,289 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
 
-from pycha.chart import Chart
+import itertools
+
+from six.moves import zip
+
+from pycha.backend import cairo
+from pycha.chart import Chart, _sameStores
 from pycha.color import hex2rgb
+from pycha.downsample import METHODS as DOWNSAMPLE_METHODS
+from pycha.series import (aslist, column, columns, compress, concatenate,
+                          extents, normalize, take)
 
 
 class LineChart(Chart):
 
     def __init__(self, surface=None, options={}, debug=False):
         super(LineChart, self).__init__(surface, options, debug)
+        self.seriesPoints = []
+        self.seriesIndex = {}
+        self.renderIndex = {}
         self.points = []
+        self._lastRender = None
+
+    @property
+    def points(self):
+        """Visible points of all the datasets as Point objects.
+
+        They are built the first time this attribute is read after each
+        update of the chart.
+        """
+        if self._points is None:
+            self._points = [point
+                            for series in self.seriesPoints
+                            for point in series.toPoints()]
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        self._points = points
+
+    def render(self, surface=None, options={}):
+        super(LineChart, self).render(surface, options)
+        self._lastRender = (self.surface, self.options.copy(),
+                            self._getAxesState(), self._getStoreSizes(),
+                            self._dataExtents)
+
+    def _getAxesState(self):
+        return (self.minxval, self.maxxval, self.minyval, self.maxyval,
+                list(self.xticks), list(self.yticks))
+
+    def extend(self, name, points, surface=None):
+        """Appends points to the dataset called name and draws them.
+
+        This is meant for charts updated with a few points at a time. When
+        the options, axes ranges and ticks of the previous render are still
+        valid, only the line from the last point of the dataset to the new
+        ones is drawn on the surface. Otherwise the whole chart is rendered
+        again, as render would do. Fixed axis ranges and ticks (or tick
+        intervals) avoid the full renders caused by the growing extents.
+        Stores that drop old points, like a full RingSeries, are always
+        rendered again.
+
+        The extents of the datasets are not computed again: those of the
+        previous render are grown with the new points, so the stores must
+        not change in any other way between calls.
+
+        Returns True if only the new segment was drawn.
+        """
+        points = list(points)
+        indexes = [i for i, (key, store) in enumerate(self.datasets)
+                   if key == name]
+        if not indexes:
+            self.addDataset([(name, points)])
+            self.render(surface)
+            return False
+
+        canExtend = self._canExtend(name, surface)
+        # the points dropped by windowed stores must be erased
+        if not self._extendDataset(indexes[-1], points):
+            canExtend = False
+        if not canExtend:
+            self.render(surface)
+            return False
+
+        dataExtents = self._lastRender[4]
+        if dataExtents is not None and points:
+            dataExtents = _growExtents(dataExtents, extents([points]))
+        self._updateXY(dataExtents)
+        self._updateTicks()
+        if self._getAxesState() != self._lastRender[2]:
+            self.render(surface)
+            return False
+
+        xvals = column([point[0] for point in points])
+        yvals = column([point[1] for point in points])
+        x, y, visible = normalize(xvals, yvals, self.minxval, self.xscale,
+                                  self.minyval, self.yscale)
+        if not all(visible):
+            self.render(surface)
+            return False
+
+        old = self.seriesIndex[name][0]
+        if len(old):
+            last = (old.x[-1], old.y[-1])
+        else:
+            last = None
+        series = old.extend(x, y, xvals, yvals)
+        self.seriesPoints[self.seriesPoints.index(old)] = series
+        self.seriesIndex[name] = [series]
+        self.renderIndex = self.seriesIndex
+        self.points = None
+
+        self._renderSegment(name, last, list(zip(aslist(x), aslist(y))))
+        self._lastRender = self._lastRender[:3] + (self._getStoreSizes(),
+                                                   dataExtents)
+        return True
+
+    def _canExtend(self, name, surface):
+        """Tell if a new segment can be drawn over the previous render"""
+        if self._lastRender is None or self.resetFlag:
+            return False
+        lastSurface, lastOptions, axes, stores = self._lastRender[:4]
+        if surface is not None and surface is not lastSurface:
+            return False
+        # the datasets must not have changed since they were drawn
+        if not _sameStores(stores, self._getStoreSizes()):
+            return False
+        if self.options != lastOptions:
+            return False
+        if self._dependsOnAllPoints():
+            return False
+        return len(self.seriesIndex.get(name, ())) == 1
+
+    def _dependsOnAllPoints(self):
+        """Tell if the drawing of any point depends on the other points"""
+        # filled areas and downsampled lines do
+        return bool(self.options.shouldFill or self.options.downsample.method)
+
+    def _getSegmentContext(self):
+        """Return a saved context to draw new points over the last render.
+
+        The drawing is clipped to the chart area without the legend so the
+        legend stays on top of the new points.
+        """
+        chart = self.layout.chart
+        legend = self.layout.legend
+
+        cx = cairo.Context(self.surface)
+        cx.save()
+        cx.set_fill_rule(cairo.FILL_RULE_EVEN_ODD)
+        cx.rectangle(chart.x, chart.y, chart.w, chart.h)
+        cx.rectangle(legend.x, legend.y, legend.w, legend.h)
+        cx.clip()
+        return cx
+
+    def _renderSegment(self, name, last, coordinates):
+        """Draws the line joining last and coordinates"""
+        chart = self.layout.chart
+        cx = self._getSegmentContext()
+        cx.new_path()
+        if last is not None:
+            coordinates = [last] + coordinates
+        for x, y in coordinates:
+            cx.line_to(x * chart.w + chart.x, y * chart.h + chart.y)
+        cx.set_line_width(self.options.stroke.width)
+        cx.set_source_rgb(*self.colorScheme[name])
+        cx.stroke()
+        cx.restore()
 
     def _updateChart(self):
         """Evaluates measures for line charts"""
-        self.points = []
+        self.seriesPoints = []
+        self.seriesIndex = {}
+        self.points = None
+
+        for name, store in self.datasets:
+            xvals, yvals = columns(store)
+            x, y, visible = normalize(xvals, yvals,
+                                      self.minxval, self.xscale,
+                                      self.minyval, self.yscale)
+            series = SeriesPoints(
+                name, compress(x, visible), compress(y, visible),
+                compress(xvals, visible), compress(yvals, visible),
+            )
+            self.seriesPoints.append(series)
+            self.seriesIndex.setdefault(name, []).append(series)
+
+        self.renderIndex = self.seriesIndex
+
+    def _downsample(self):
+        """Reduces the points of each dataset to fit the chart width.
 
-        for i, (name, store) in enumerate(self.datasets):
-            for item in store:
-                xval, yval = item
-                x = (xval - self.minxval) * self.xscale
-                y = 1.0 - (yval - self.minyval) * self.yscale
-                point = Point(x, y, xval, yval, name)
+        This only happens if the downsample.method option is set. It is
+        done once the layout is known, long after the extents were computed
+        from all the points, so the axes are not affected.
+        """
+        method = self.options.downsample.method
+        if not method:
+            self.renderIndex = self.seriesIndex
+            return
 
-                if 0.0 <= point.x <= 1.0 and 0.0 <= point.y <= 1.0:
-                    self.points.append(point)
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError('Downsample method "%s" is invalid!' % method)
+
+        threshold = int(self.layout.chart.w * self.options.downsample.factor)
+        self.renderIndex = dict(
+            (name, [series.downsample(method, threshold) for series in group])
+            for name, group in self.seriesIndex.items()
+        )
+
+    def _getCoordinates(self, storeName):
+        """Return an iterator over the normalized coordinates of a dataset"""
+        return itertools.chain.from_iterable(
+            series.coordinates()
+            for series in self.renderIndex.get(storeName, ())
+        )
 
     def _renderChart(self, cx):
         """Renders a line chart"""
+        self._downsample()
+
+        chart = self.layout.chart
+        shouldFill = self.options.shouldFill
 
         def preparePath(storeName):
             cx.new_path()
             firstPoint = True
             lastX = None
-            if self.options.shouldFill:
+            if shouldFill:
                 # Go to the (0,0) coordinate to start drawing the area
                 # cx.move_to(self.layout.chart.x,
                 #           self.layout.chart.y + self.layout.chart.h)
-                offset = (1.0 - self.origin) * self.layout.chart.h
-                cx.move_to(self.layout.chart.x, self.layout.chart.y + offset)
-
-            for point in self.points:
-                if point.name == storeName:
-                    if not self.options.shouldFill and firstPoint:
-                        # starts the first point of the line
-                        cx.move_to(
-                            point.x * self.layout.chart.w + self.layout.chart.x,
-                            point.y * self.layout.chart.h + self.layout.chart.y
-                        )
-                        firstPoint = False
-                        continue
-                    cx.line_to(
-                        point.x * self.layout.chart.w + self.layout.chart.x,
-                        point.y * self.layout.chart.h + self.layout.chart.y
-                    )
-                    # we remember the last X coordinate to close the area
-                    # properly. See bug #4
-                    lastX = point.x
-
-            if self.options.shouldFill:
+                offset = (1.0 - self.origin) * chart.h
+                cx.move_to(chart.x, chart.y + offset)
+
+            for x, y in self._getCoordinates(storeName):
+                if not shouldFill and firstPoint:
+                    # starts the first point of the line
+                    cx.move_to(x * chart.w + chart.x, y * chart.h + chart.y)
+                    firstPoint = False
+                    continue
+                cx.line_to(x * chart.w + chart.x, y * chart.h + chart.y)
+                # we remember the last X coordinate to close the area
+                # properly. See bug #4
+                lastX = x
+
+            if shouldFill:
                 # Close the path to the start point
-                y = ((1.0 - self.origin) * self.layout.chart.h + self.layout.chart.y)
-                cx.line_to(lastX * self.layout.chart.w + self.layout.chart.x, y)
-                cx.line_to(self.layout.chart.x, y)
+                y = (1.0 - self.origin) * chart.h + chart.y
+                cx.line_to(lastX * chart.w + chart.x, y)
+                cx.line_to(chart.x, y)
                 cx.close_path()
-            else:
-                cx.set_source_rgb(*self.colorScheme[storeName])
-                cx.stroke()
 
         cx.save()
         cx.set_line_width(self.options.stroke.width)
-        if self.options.shouldFill:
+        if shouldFill:
 
             def drawLine(storeName):
+                # the path is built once and reused for every pass
+                preparePath(storeName)
+                path = cx.copy_path()
+
                 if self.options.stroke.shadow:
                     # draw shadow
                     cx.save()
                     cx.set_source_rgba(0, 0, 0, 0.15)
                     cx.translate(2, -2)
-                    preparePath(storeName)
+                    cx.new_path()
+                    cx.append_path(path)
                     cx.fill()
                     cx.restore()
 
                 # fill the line
                 cx.set_source_rgb(*self.colorScheme[storeName])
-                preparePath(storeName)
-                cx.fill()
+                cx.new_path()
+                cx.append_path(path)
 
                 if not self.options.stroke.hide:
+                    cx.fill_preserve()
                     # draw stroke
                     cx.set_source_rgb(*hex2rgb(self.options.stroke.color))
-                    preparePath(storeName)
                     cx.stroke()
+                else:
+                    cx.fill()
 
             # draw the lines
             for key in self._getDatasetsKeys():
@@ -112,12 +305,77 @@ class LineChart(Chart):
         else:
             for key in self._getDatasetsKeys():
                 preparePath(key)
+                cx.set_source_rgb(*self.colorScheme[key])
+                cx.stroke()
 
         cx.restore()
 
 
+def _growExtents(old, new):
+    """Return the (minx, maxx, miny, maxy) tuple covering old and new"""
+    return (min(old[0], new[0]), max(old[1], new[1]),
+            min(old[2], new[2]), max(old[3], new[3]))
+
+
+class SeriesPoints(object):
+    """Visible points of one dataset.
+
+    The normalized coordinates and the original values are kept in
+    columns, so no Point object is created unless toPoints is called.
+    """
+
+    def __init__(self, name, x, y, xval, yval):
+        self.name = name
+        self.x, self.y = x, y
+        self.xval, self.yval = xval, yval
+
+    def __len__(self):
+        return len(self.x)
+
+    def take(self, indexes):
+        """Return a new SeriesPoints with the points at indexes"""
+        return SeriesPoints(self.name,
+                            take(self.x, indexes), take(self.y, indexes),
+                            take(self.xval, indexes), take(self.yval, indexes))
+
+    def extend(self, x, y, xval, yval):
+        """Return a new SeriesPoints with more points at the end"""
+        return SeriesPoints(self.name,
+                            concatenate([self.x, x]), concatenate([self.y, y]),
+                            concatenate([self.xval, xval]),
+                            concatenate([self.yval, yval]))
+
+    def downsample(self, method, threshold):
+        """Return a new SeriesPoints with about threshold points.
+
+        method is the name of one of the pycha.downsample functions.
+        """
+        if len(self) <= threshold:
+            return self
+        if method == 'minmax':
+            # two points per pixel column
+            indexes = DOWNSAMPLE_METHODS[method](self.x, self.y,
+                                                 threshold // 2)
+        else:
+            indexes = DOWNSAMPLE_METHODS[method](self.x, self.y, threshold)
+        return self.take(indexes)
+
+    def coordinates(self):
+        """Return an iterator over the (x, y) normalized coordinates"""
+        return zip(aslist(self.x), aslist(self.y))
+
+    def toPoints(self):
+        """Return the visible points as a list of Point objects"""
+        return [Point(x, y, xval, yval, self.name)
+                for x, y, xval, yval in zip(aslist(self.x), aslist(self.y),
+                                            aslist(self.xval),
+                                            aslist(self.yval))]
+
+
 class Point(object):
 
+    __slots__ = ('x', 'y', 'xval', 'yval', 'name')
+
     def __init__(self, x, y, xval, yval, name):
         self.x, self.y = x, y
         self.xval, self.yval = xval, yval
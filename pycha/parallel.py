@@ -0,0 +1,186 @@
+# Copyright(c) 2007-2019 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Render many charts using a pool of worker processes.
+
+Each job is a (chartClass, options, dataset, output) tuple where chartClass
+is a chart class or its dotted name (like 'pycha.bar.VerticalBarChart'),
+options and dataset are what you would pass to the chart constructor and to
+addDataset and output is a dict with these optional keys:
+
+ * format: 'png' (default), 'svg' or 'pdf'
+ * width and height: size of the surface in pixels or points (400x300)
+ * path: file to write the chart to. If it is not given the chart is
+   returned as bytes in the result.
+
+Example::
+
+  jobs = [(VerticalBarChart, options, dataset, {'path': 'chart%d.png' % i})
+          for i, dataset in enumerate(datasets)]
+  for result in render_all(jobs):
+      if result.error:
+          print(result.error)
+"""
+
+import importlib
+import io
+import multiprocessing
+import time
+import traceback
+
+import six
+
+from pycha.backend import cairo
+
+# time.perf_counter is not available in Python 2
+clock = getattr(time, 'perf_counter', time.time)
+
+DEFAULT_OUTPUT = {'format': 'png', 'width': 400, 'height': 300, 'path': None}
+
+# maximum number of chart settings each worker keeps for reuse
+MAX_CACHED_CHARTS = 32
+
+# merged options and color scheme of the charts rendered in this process,
+# keyed by class and options
+_charts = {}
+
+
+class Result(object):
+    """Outcome of a rendering job"""
+
+    def __init__(self, index, data=None, path=None, elapsed=0.0, error=None):
+        self.index = index
+        self.data = data
+        self.path = path
+        self.elapsed = elapsed
+        self.error = error
+
+    def __str__(self):
+        if self.error:
+            status = 'failed'
+        else:
+            status = 'ok'
+        return '<pycha.parallel.Result #%d %s in %.3fs>' % (
+            self.index, status, self.elapsed)
+
+
+def resolve_chart_class(chartClass):
+    """Return the chart class named by a dotted path or the class itself"""
+    if isinstance(chartClass, six.string_types):
+        moduleName, className = chartClass.rsplit('.', 1)
+        return getattr(importlib.import_module(moduleName), className)
+    return chartClass
+
+
+def _getChart(chartClass, options):
+    """Return a (key, chart) tuple with a new chart of chartClass.
+
+    Charts keep the state of the data they rendered, so every job gets its
+    own chart. The merged options and the color scheme do not depend on
+    the data, so they are taken from the previous chart of this worker
+    with the same class and options, if any. The color scheme is only
+    used while the dataset names are the same.
+    """
+    key = (chartClass, repr(options))
+    settings = _charts.get(key)
+    if settings is None:
+        return key, chartClass(None, options)
+
+    chart = chartClass(None)
+    chart.options = settings[0].copy()
+    chart.colorScheme, chart._colorSchemeKey = settings[1:]
+    return key, chart
+
+
+def _keepChart(key, chart):
+    """Remember the settings of a rendered chart for the next jobs"""
+    if key not in _charts and len(_charts) >= MAX_CACHED_CHARTS:
+        _charts.clear()
+    _charts[key] = (chart.options, chart.colorScheme, chart._colorSchemeKey)
+
+
+def create_surface(fileFormat, target, width, height):
+    """Return a cairo surface of fileFormat that will be saved to target"""
+    if fileFormat == 'png':
+        return cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    elif fileFormat == 'svg':
+        return cairo.SVGSurface(target, width, height)
+    elif fileFormat == 'pdf':
+        return cairo.PDFSurface(target, width, height)
+    raise ValueError('Output format "%s" is invalid!' % fileFormat)
+
+
+def render_chart(chart, dataset, target, fileFormat='png',
+                 width=400, height=300):
+    """Render dataset with chart and save it to target.
+
+    target is a file name or a file object. The previous datasets of chart
+    are discarded.
+    """
+    surface = create_surface(fileFormat, target, width, height)
+    chart.datasets = []
+    chart.addDataset(dataset)
+    chart.render(surface)
+    if fileFormat == 'png':
+        surface.write_to_png(target)
+    surface.finish()
+
+
+def render_job(job):
+    """Render a single job and return its Result.
+
+    job is an (index, (chartClass, options, dataset, output)) tuple. Errors
+    are never raised: the traceback is stored in the result instead.
+    """
+    index, (chartClass, options, dataset, output) = job
+    spec = dict(DEFAULT_OUTPUT)
+    spec.update(output or {})
+
+    start = clock()
+    try:
+        key, chart = _getChart(resolve_chart_class(chartClass), options)
+        target = spec['path'] or io.BytesIO()
+        render_chart(chart, dataset, target, spec['format'],
+                     spec['width'], spec['height'])
+        _keepChart(key, chart)
+        if spec['path']:
+            data = None
+        else:
+            data = target.getvalue()
+        return Result(index, data, spec['path'], clock() - start)
+    except Exception:
+        return Result(index, elapsed=clock() - start,
+                      error=traceback.format_exc())
+
+
+def render_all(jobs, processes=None, chunksize=1):
+    """Render all the jobs and return their results in the same order.
+
+    The jobs are distributed across a pool of processes worker processes
+    (by default, one per CPU). With processes=1 the jobs are rendered in
+    the current process.
+    """
+    jobs = list(enumerate(jobs))
+    if processes == 1:
+        return [render_job(job) for job in jobs]
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(render_job, jobs, chunksize)
+    finally:
+        pool.close()
+        pool.join()
@@ -17,10 +17,10 @@
 
 import math
 
-import cairocffi as cairo
-
+from pycha.backend import cairo
 from pycha.chart import Chart, Option, Layout, Area, get_text_extents
 from pycha.color import hex2rgb
+from pycha.text import set_font
 
 
 class PieChart(Chart):
@@ -140,10 +140,8 @@ class PieChart(Chart):
                 cx.arc(x, y, 2 * px, 0, 2 * math.pi)
                 cx.fill()
 
-        cx.select_font_face(self.options.axis.tickFont,
-                            cairo.FONT_SLANT_NORMAL,
-                            cairo.FONT_WEIGHT_NORMAL)
-        cx.set_font_size(self.options.axis.tickFontSize)
+        set_font(cx, self.options.axis.tickFont,
+                 self.options.axis.tickFontSize)
 
         cx.set_source_rgb(*hex2rgb(self.options.axis.labelColor))
 
@@ -161,6 +159,9 @@ class PieChart(Chart):
 
 class Slice(object):
 
+    __slots__ = ('name', 'fraction', 'xval', 'yval', 'startAngle',
+                 'endAngle')
+
     def __init__(self, name, fraction, xval, yval, angle):
         self.name = name
         self.fraction = fraction
@@ -213,6 +214,11 @@ class PieLayout(Layout):
         self._lines = []
 
     def update(self, cx, options, width, height, xticks, yticks):
+        # the ticks are computed again on every update so the same chart
+        # can be rendered several times
+        self.ticks = []
+        self._lines = []
+
         self.title.x = options.padding.left
         self.title.y = options.padding.top
         self.title.w = width - (options.padding.left + options.padding.right)
@@ -18,11 +18,11 @@
 
 import math
 
-import cairo
-
 from pycha.chart import Chart
 from pycha.line import Point
 from pycha.color import hex2rgb
+from pycha.spokes import get_spokes
+from pycha.text import set_font
 from pycha.utils import safe_unicode
 
 
@@ -31,13 +31,21 @@ class PolygonalChart(Chart):
     def __init__(self, surface=None, options={}):
         super(PolygonalChart, self).__init__(surface, options)
         self.points = []
+        self.seriesVertices = {}
+        self.spokeCount = 0
 
     def _updateChart(self):
         """Evaluates measures for polygonal charts"""
         self.points = []
-
-        for i, (name, store) in enumerate(self.datasets):
-            for item in store:
+        # spoke index and distance to the center (as a fraction of the
+        # chart radius) of the visible points of each dataset
+        self.seriesVertices = {}
+        self.spokeCount = 0
+
+        for name, store in self.datasets:
+            indexes, radii = self.seriesVertices.setdefault(name, ([], []))
+            self.spokeCount = max(self.spokeCount, len(store))
+            for index, item in enumerate(store):
                 xval, yval = item
                 x = (xval - self.minxval) * self.xscale
                 y = 1.0 - (yval - self.minyval) * self.yscale
@@ -45,6 +53,8 @@ class PolygonalChart(Chart):
 
                 if 0.0 <= point.x <= 1.0 and 0.0 <= point.y <= 1.0:
                     self.points.append(point)
+                    indexes.append(index)
+                    radii.append(1.0 - y)
 
     def _renderBackground(self, cx):
         """Renders the background area of the chart"""
@@ -60,20 +70,8 @@ class PolygonalChart(Chart):
         if self.options.background.chartColor:
             cx.set_source_rgb(*hex2rgb(self.options.background.chartColor))
             cx.set_line_width(10.0)
-            cx.new_path()
-            init = None
-            count = len(self.xticks)
-            for index, tick in enumerate(self.xticks):
-                ang = math.pi / 2 - index * 2 * math.pi / count
-                x = (self.layout.chart.x + self.layout.chart.w / 2 - math.cos(ang) * min(self.layout.chart.w / 2, self.layout.chart.h / 2))
-                y = (self.layout.chart.y + self.layout.chart.h / 2 - math.sin(ang) * min(self.layout.chart.w / 2, self.layout.chart.h / 2))
-                if init is None:
-                    cx.move_to(x, y)
-                    init = (x, y)
-                else:
-                    cx.line_to(x, y)
-            cx.line_to(init[0], init[1])
-            cx.close_path()
+            rad = min(self.layout.chart.w / 2, self.layout.chart.h / 2)
+            self._preparePolygon(cx, rad)
             cx.fill()
 
         if self.options.background.lineColor:
@@ -87,45 +85,42 @@ class PolygonalChart(Chart):
         """Aux function for _renderLines"""
 
         rad = (self.layout.chart.h / 2) * (1 - tick[0])
+        self._preparePolygon(cx, rad)
+        cx.stroke()
+
+    def _preparePolygon(self, cx, rad):
+        """Adds a polygon with a vertex on each x tick spoke to the path"""
         cx.new_path()
-        init = None
         count = len(self.xticks)
-        for index, tick in enumerate(self.xticks):
-            ang = math.pi / 2 - index * 2 * math.pi / count
-            x = (self.layout.chart.x + self.layout.chart.w / 2 - math.cos(ang) * rad)
-            y = (self.layout.chart.y + self.layout.chart.h / 2 - math.sin(ang) * rad)
-            if init is None:
-                cx.move_to(x, y)
-                init = (x, y)
-            else:
-                cx.line_to(x, y)
-        cx.line_to(init[0], init[1])
+        if not count:
+            return
+        vertices = get_spokes(count).vertices(
+            range(count), [rad] * count,
+            self.layout.chart.x + self.layout.chart.w / 2,
+            self.layout.chart.y + self.layout.chart.h / 2)
+        for x, y in vertices:
+            cx.line_to(x, y)
+        cx.line_to(*vertices[0])
         cx.close_path()
-        cx.stroke()
 
     def _renderXAxis(self, cx):
         """Draws the horizontal line representing the X axis"""
 
         count = len(self.xticks)
+        if not count:
+            return
 
         centerx = self.layout.chart.x + self.layout.chart.w / 2
         centery = self.layout.chart.y + self.layout.chart.h / 2
+        rad = self.layout.chart.h / 2
 
-        for i in range(0, count):
-            offset1 = i * 2 * math.pi / count
-            offset = math.pi / 2 - offset1
-
-            rad = self.layout.chart.h / 2
-            (r1, r2) = (0, rad + 5)
-
-            x1 = centerx - math.cos(offset) * r1
-            x2 = centerx - math.cos(offset) * r2
-            y1 = centery - math.sin(offset) * r1
-            y2 = centery - math.sin(offset) * r2
-
+        spokes = get_spokes(count)
+        ends = spokes.vertices(range(count), [rad + 5] * count,
+                               centerx, centery)
+        for x, y in ends:
             cx.new_path()
-            cx.move_to(x1, y1)
-            cx.line_to(x2, y2)
+            cx.move_to(centerx, centery)
+            cx.line_to(x, y)
             cx.close_path()
             cx.stroke()
 
@@ -149,10 +144,8 @@ class PolygonalChart(Chart):
         cx.close_path()
         cx.stroke()
 
-        cx.select_font_face(self.options.axis.tickFont,
-                            cairo.FONT_SLANT_NORMAL,
-                            cairo.FONT_WEIGHT_NORMAL)
-        cx.set_font_size(self.options.axis.tickFontSize)
+        set_font(cx, self.options.axis.tickFont,
+                 self.options.axis.tickFontSize)
 
         label = safe_unicode(tick[1], self.options.encoding)
         extents = cx.text_extents(label)
@@ -242,10 +235,8 @@ class PolygonalChart(Chart):
             return
 
         count = len(self.xticks)
-        cx.select_font_face(self.options.axis.tickFont,
-                            cairo.FONT_SLANT_NORMAL,
-                            cairo.FONT_WEIGHT_NORMAL)
-        cx.set_font_size(self.options.axis.tickFontSize)
+        set_font(cx, self.options.axis.tickFont,
+                 self.options.axis.tickFontSize)
 
         label = safe_unicode(tick[1], self.options.encoding)
         extents = cx.text_extents(label)
@@ -265,24 +256,23 @@ class PolygonalChart(Chart):
             cx.show_text(label)
             cx.rotate(-radians)
         else:
-            offset1 = i * 2 * math.pi / count
-            offset = math.pi / 2 - offset1
+            spokes = get_spokes(count)
+            offset = spokes.angles[i]
 
             rad = self.layout.chart.h / 2 + 10
 
-            x = center[0] - math.cos(offset) * rad
-            y = center[1] - math.sin(offset) * rad
+            x, y = spokes.point(i, center[0], center[1], rad)
 
             cx.move_to(x, y)
             cx.rotate(offset - math.pi / 2)
 
-            if math.sin(offset) < 0.0:
+            if spokes.sin[i] < 0.0:
                 cx.rotate(math.pi)
                 cx.rel_move_to(0.0, 5.0)
 
             cx.rel_move_to(-labelWidth / 2.0, 0)
             cx.show_text(label)
-            if math.sin(offset) < 0.0:
+            if spokes.sin[i] < 0.0:
                 cx.rotate(-math.pi)
 
             cx.rotate(-(offset - math.pi / 2))
@@ -290,70 +280,54 @@ class PolygonalChart(Chart):
 
     def _renderChart(self, cx):
         """Renders a polygonal chart"""
-        # draw the polygon.
-        def preparePath(storeName):
-            cx.new_path()
-            firstPoint = True
-
-            count = len(self.points) / len(self.datasets)
-            centerx = self.layout.chart.x + self.layout.chart.w / 2
-            centery = self.layout.chart.y + self.layout.chart.h / 2
-
-            firstPointCoord = None
-
-            for index, point in enumerate(self.points):
-                if point.name == storeName:
-                    offset1 = index * 2 * math.pi / count
-                    offset = math.pi / 2 - offset1
-
-                    rad = (self.layout.chart.h / 2) * (1 - point.y)
-
-                    x = centerx - math.cos(offset) * rad
-                    y = centery - math.sin(offset) * rad
+        if not self.points:
+            return
 
-                    if firstPointCoord is None:
-                        firstPointCoord = (x, y)
+        centerx = self.layout.chart.x + self.layout.chart.w / 2
+        centery = self.layout.chart.y + self.layout.chart.h / 2
+        rad = self.layout.chart.h / 2
 
-                    if not self.options.shouldFill and firstPoint:
-                        # starts the first point of the line
-                        cx.move_to(x, y)
-                        firstPoint = False
-                        continue
-                    cx.line_to(x, y)
+        spokes = get_spokes(self.spokeCount)
 
-            if firstPointCoord is not None:
-                cx.line_to(firstPointCoord[0], firstPointCoord[1])
+        def getVertices(storeName):
+            indexes, radii = self.seriesVertices.get(storeName, ((), ()))
+            return spokes.vertices(indexes, radii, centerx, centery, rad)
 
-            if self.options.shouldFill:
-                # Close the path to the start point
-                y = ((1.0 - self.origin) * self.layout.chart.h + self.layout.chart.y)
-            else:
-                cx.set_source_rgb(*self.colorScheme[storeName])
-                cx.stroke()
+        def preparePath(vertices):
+            cx.new_path()
+            if not vertices:
+                return
+            cx.move_to(*vertices[0])
+            for x, y in vertices[1:]:
+                cx.line_to(x, y)
+            cx.line_to(*vertices[0])
 
         cx.save()
         cx.set_line_width(self.options.stroke.width)
         if self.options.shouldFill:
 
             def drawLine(storeName):
+                # the vertices are computed once for every pass
+                vertices = getVertices(storeName)
+
                 if self.options.stroke.shadow:
                     # draw shadow
                     cx.save()
                     cx.set_source_rgba(0, 0, 0, 0.15)
                     cx.translate(2, -2)
-                    preparePath(storeName)
+                    preparePath(vertices)
                     cx.fill()
                     cx.restore()
 
                 # fill the line
                 cx.set_source_rgb(*self.colorScheme[storeName])
-                preparePath(storeName)
+                preparePath(vertices)
                 cx.fill()
 
                 if not self.options.stroke.hide:
                     # draw stroke
                     cx.set_source_rgb(*hex2rgb(self.options.stroke.color))
-                    preparePath(storeName)
+                    preparePath(vertices)
                     cx.stroke()
 
             # draw the lines
@@ -361,5 +335,7 @@ class PolygonalChart(Chart):
                 drawLine(key)
         else:
             for key in self._getDatasetsKeys():
-                preparePath(key)
+                preparePath(getVertices(key))
+                cx.set_source_rgb(*self.colorScheme[key])
+                cx.stroke()
         cx.restore()
@@ -17,10 +17,10 @@
 
 import math
 
-import cairo
-
+from pycha.backend import cairo
 from pycha.chart import Chart, Option, Layout, Area, get_text_extents
 from pycha.color import hex2rgb
+from pycha.text import set_font
 
 
 class RingChart(Chart):
@@ -38,6 +38,10 @@ class RingChart(Chart):
 
     def _updateChart(self):
         """Evaluates measures for pie charts"""
+        # the rings of the datasets rendered before must not be kept, and
+        # the layout shares this dictionary
+        self.slices.clear()
+
         self.rings = [
             i
             for i in set([data[0] for dataset in self.datasets for data in dataset[1]])
@@ -181,10 +185,8 @@ class RingChart(Chart):
                 cx.arc(x, y, 2 * px, 0, 2 * math.pi)
                 cx.fill()
 
-        cx.select_font_face(self.options.axis.tickFont,
-                            cairo.FONT_SLANT_NORMAL,
-                            cairo.FONT_WEIGHT_NORMAL)
-        cx.set_font_size(self.options.axis.tickFontSize)
+        set_font(cx, self.options.axis.tickFont,
+                 self.options.axis.tickFontSize)
 
         cx.set_source_rgb(*hex2rgb(self.options.axis.labelColor))
 
@@ -201,6 +203,9 @@ class RingChart(Chart):
 
 class Slice(object):
 
+    __slots__ = ('name', 'fraction', 'xval', 'yval', 'startAngle',
+                 'endAngle')
+
     def __init__(self, name, fraction, xval, yval, angle):
         self.name = name
         self.fraction = fraction
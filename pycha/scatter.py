@@ -17,22 +17,144 @@
 
 import math
 
+from pycha.backend import cairo
+from pycha.density import hex_bins, hexagon, square, square_bins
 from pycha.line import LineChart
+from pycha.series import concatenate
+
+# number of different opacities used to render the density bins
+DENSITY_LEVELS = 8
 
 
 class ScatterplotChart(LineChart):
 
     def _renderChart(self, cx):
         """Renders a scatterplot"""
+        mode = self.options.scatter.mode
+        if mode == 'density':
+            renderer = None
+        else:
+            renderer = self._getSymbolRenderer(mode)
+
+        size = self.options.stroke.width
+        cx.save()
+        for key in self._getDatasetsKeys():
+            cx.set_source_rgb(*self.colorScheme[key])
+            if renderer is None:
+                self._renderDensity(cx, key, size)
+            else:
+                renderer(cx, self._getSymbolCenters(key), size)
+        cx.restore()
+
+    def _getSymbolRenderer(self, mode):
+        """Return the method that draws the symbols in the scatter mode"""
+        if mode == 'path':
+            return self._renderSymbolsPath
+        elif mode == 'stamp':
+            return self._renderSymbolsStamp
+        elif mode == 'pixel':
+            return self._renderSymbolsPixel
+        raise ValueError('Scatter mode "%s" is invalid!' % mode)
 
-        def drawSymbol(point, size):
-            ox = point.x * self.layout.chart.w + self.layout.chart.x
-            oy = point.y * self.layout.chart.h + self.layout.chart.y
+    def _dependsOnAllPoints(self):
+        # the opacity of the density bins does
+        return self.options.scatter.mode == 'density'
+
+    def _renderSegment(self, name, last, coordinates):
+        """Draws the symbols of the new points of a dataset"""
+        renderer = self._getSymbolRenderer(self.options.scatter.mode)
+        chart = self.layout.chart
+        cx = self._getSegmentContext()
+        cx.set_source_rgb(*self.colorScheme[name])
+        renderer(cx, [(x * chart.w + chart.x, y * chart.h + chart.y)
+                      for x, y in coordinates], self.options.stroke.width)
+        cx.restore()
+
+    def _getSymbolCenters(self, storeName):
+        """Return an iterator over the symbol centers of a dataset"""
+        chart = self.layout.chart
+        return ((x * chart.w + chart.x, y * chart.h + chart.y)
+                for x, y in self._getCoordinates(storeName))
+
+    def _renderSymbolsPath(self, cx, centers, size):
+        """Draws all the symbols centered at centers as a single path"""
+        cx.new_path()
+        for ox, oy in centers:
+            cx.move_to(ox + size, oy)
             cx.arc(ox, oy, size, 0.0, 2 * math.pi)
+        cx.fill()
+
+    def _renderSymbolsStamp(self, cx, centers, size):
+        """Paints a pre-rendered symbol on every center"""
+        # the symbol is rendered once with some room for antialiasing
+        side = int(math.ceil(2 * size)) + 2
+        half = side / 2.0
+        symbol = cx.get_target().create_similar(cairo.CONTENT_COLOR_ALPHA,
+                                                side, side)
+        scx = cairo.Context(symbol)
+        scx.set_source(cx.get_source())
+        scx.arc(half, half, size, 0.0, 2 * math.pi)
+        scx.fill()
+
+        for ox, oy in centers:
+            # snapping to whole pixels makes each paint a plain copy
+            x, y = round(ox - half), round(oy - half)
+            cx.set_source_surface(symbol, x, y)
+            cx.rectangle(x, y, side, side)
             cx.fill()
 
-        for key in self._getDatasetsKeys():
-            cx.set_source_rgb(*self.colorScheme[key])
-            for point in self.points:
-                if point.name == key:
-                    drawSymbol(point, self.options.stroke.width)
+    def _renderSymbolsPixel(self, cx, centers, size):
+        """Draws a single device pixel on every center"""
+        px, py = cx.device_to_user_distance(1.0, 1.0)
+        cx.set_antialias(cairo.ANTIALIAS_NONE)
+        cx.new_path()
+        for ox, oy in centers:
+            cx.rectangle(ox, oy, px, py)
+        cx.fill()
+
+    def _renderDensity(self, cx, storeName, size):
+        """Draws the density of a dataset as a layer of colored bins.
+
+        The points are counted in a grid of square or hexagonal bins that
+        covers the chart area and each bin is painted with the color of the
+        dataset and an opacity proportional to the logarithm of its count.
+        Bins with the same opacity are filled together so the cost does
+        not depend on the number of points.
+        """
+        group = self.renderIndex.get(storeName, ())
+        if not group:
+            return
+
+        chart = self.layout.chart
+        binSize = self.options.scatter.binSize
+        binShape = self.options.scatter.binShape
+        if binShape == 'square':
+            binner, shape = square_bins, square
+        elif binShape == 'hex':
+            binner, shape = hex_bins, hexagon
+        else:
+            raise ValueError('Bin shape "%s" is invalid!' % binShape)
+
+        x = concatenate([series.x for series in group])
+        y = concatenate([series.y for series in group])
+        bins = binner(x, y, chart.w, chart.h, binSize)
+        if not bins:
+            return
+
+        scale = math.log1p(max(count for bx, by, count in bins))
+        levels = {}
+        for bx, by, count in bins:
+            level = int(math.ceil(DENSITY_LEVELS * math.log1p(count) / scale))
+            levels.setdefault(level, []).append((bx, by))
+
+        r, g, b = self.colorScheme[storeName]
+        cx.save()
+        cx.rectangle(chart.x, chart.y, chart.w, chart.h)
+        cx.clip()
+        for level, centers in sorted(levels.items()):
+            cx.set_source_rgba(r, g, b, level / float(DENSITY_LEVELS))
+            cx.new_path()
+            for bx, by in centers:
+                shape(cx, chart.x + bx, chart.y + by, binSize)
+            cx.fill()
+        cx.restore()
@@ -0,0 +1,424 @@
+# Copyright(c) 2007-2019 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
+
+import array
+import collections
+import itertools
+import operator
+
+from six.moves import zip
+
+from pycha.compat import numpy
+
+# buffer formats that are reinterpreted as native doubles
+RAW_FORMATS = ('B', 'b', 'c')
+
+
+def column(values):
+    """Return values as a contiguous column of float64 numbers.
+
+    NumPy arrays of doubles and objects exposing native doubles (or raw
+    bytes) through the buffer protocol are used without copying them.
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        view = None
+    else:
+        try:
+            view = memoryview(values)
+        except TypeError:
+            view = None
+
+    if numpy is not None:
+        if view is not None and view.format in RAW_FORMATS:
+            values = numpy.frombuffer(view, dtype=numpy.float64)
+        elif view is not None:
+            values = numpy.asarray(view)
+        values = numpy.ascontiguousarray(values, dtype=numpy.float64)
+        if values.ndim != 1:
+            raise ValueError('Series columns must be one dimensional')
+        return values
+
+    if view is None:
+        return array.array('d', values)
+    elif view.format in RAW_FORMATS:
+        return view.cast('B').cast('d')
+    elif view.format == 'd' and view.ndim == 1 and view.c_contiguous:
+        return view
+    return array.array('d', view.tolist())
+
+
+class Series(object):
+    """Columnar dataset store.
+
+    The x, y and optional yerr values are kept in contiguous float64
+    columns. A Series behaves like a read only sequence of (x, y) or
+    (x, y, yerr) tuples so it can be used anywhere a list of points is
+    accepted, while the chart update stages can work on whole columns.
+
+    The columns may share memory with the arrays given to the constructor.
+    Charts cache the extents of a Series until its version changes, so
+    invalidate must be called after changing those arrays in place.
+    """
+
+    def __init__(self, x, y, yerr=None):
+        self.version = 0
+        # growable columns owned by this series, created by extend
+        self._buffers = {}
+        self.x = column(x)
+        self.y = column(y)
+        if yerr is None:
+            self.yerr = None
+        else:
+            self.yerr = column(yerr)
+
+        if len(self.x) != len(self.y):
+            raise ValueError('x and y columns must have the same length')
+        if self.yerr is not None and len(self.yerr) != len(self.x):
+            raise ValueError('yerr column must have the same length as x')
+
+    @classmethod
+    def fromPairs(cls, items):
+        """Build a Series from a sequence of (x, y[, yerr]) items"""
+        items = list(items)
+        if items and len(items[0]) == 3:
+            x, y, yerr = zip(*items)
+            return cls(x, y, yerr)
+        elif items:
+            x, y = zip(*items)
+            return cls(x, y)
+        return cls((), ())
+
+    @classmethod
+    def fromArray(cls, data):
+        """Build a Series from a 2-D array with 2 or 3 columns.
+
+        Columns of Fortran ordered float64 arrays are shared with data;
+        otherwise each column is copied once into contiguous storage.
+        """
+        if getattr(data, 'ndim', None) != 2 or data.shape[1] not in (2, 3):
+            raise ValueError('Expected an array of shape (n, 2) or (n, 3)')
+        if data.shape[1] == 3:
+            return cls(data[:, 0], data[:, 1], data[:, 2])
+        return cls(data[:, 0], data[:, 1])
+
+    def __len__(self):
+        return len(self.x)
+
+    def invalidate(self):
+        """Tell the charts using this series that its values changed"""
+        self.version += 1
+
+    def extend(self, points):
+        """Add (x, y) or (x, y, yerr) points at the end of the series.
+
+        The points must have a yerr value if and only if the series has a
+        yerr column. The first call copies the columns into buffers owned by
+        the series, so the arrays it was built from are never changed, and
+        the buffers double their capacity when they are full, so adding a
+        point is amortized O(1).
+        """
+        other = Series.fromPairs(points)
+        if not len(other):
+            return
+        if (self.yerr is None) != (other.yerr is None):
+            raise ValueError('Points must be (x, y, yerr) tuples for series '
+                             'with a yerr column and (x, y) tuples otherwise')
+
+        self.x = self._grow('x', other.x)
+        self.y = self._grow('y', other.y)
+        if self.yerr is not None:
+            self.yerr = self._grow('yerr', other.yerr)
+        self.version += 1
+
+    def _grow(self, name, values):
+        """Return the column called name with values added at its end"""
+        current = getattr(self, name)
+        buffer = self._buffers.get(name)
+        if numpy is None:
+            # arrays of the array module have an amortized growth already
+            if buffer is not current:
+                buffer = self._buffers[name] = array.array('d', current)
+            buffer.extend(values)
+            return buffer
+
+        size = len(current)
+        end = size + len(values)
+        if buffer is None or current.base is not buffer or len(buffer) < end:
+            grown = numpy.empty(max(2 * size, end))
+            grown[:size] = current
+            buffer = self._buffers[name] = grown
+        buffer[size:end] = values
+        return buffer[:end]
+
+    def extents(self):
+        """Return the (minx, maxx, miny, maxy) tuple of this series"""
+        if numpy is not None:
+            return (float(self.x.min()), float(self.x.max()),
+                    float(self.y.min()), float(self.y.max()))
+        return (min(self.x), max(self.x), min(self.y), max(self.y))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if self.yerr is None:
+                return Series(self.x[index], self.y[index])
+            return Series(self.x[index], self.y[index], self.yerr[index])
+
+        if self.yerr is None:
+            return (self.x[index], self.y[index])
+        return (self.x[index], self.y[index], self.yerr[index])
+
+    def __iter__(self):
+        if self.yerr is None:
+            return zip(self.x, self.y)
+        return zip(self.x, self.y, self.yerr)
+
+    def __repr__(self):
+        return '<pycha.series.Series of %d points>' % len(self)
+
+
+class RingSeries(object):
+    """Sliding window with the last capacity (x, y) points appended to it.
+
+    The points are kept in preallocated float64 columns used as a ring
+    buffer, so appending is O(1) and memory is bounded. The minimum and
+    maximum of the window are maintained on each append with monotonic
+    queues, so computing the extents does not scan the points.
+
+    version grows on every append and identifies the content of the
+    window, since its length stops changing once it is full.
+    """
+
+    def __init__(self, capacity, points=()):
+        if capacity < 1:
+            raise ValueError('The capacity must be a positive number')
+        self.capacity = capacity
+        self.version = 0
+        self._start = 0
+        self._size = 0
+        if numpy is not None:
+            self._x = numpy.zeros(capacity)
+            self._y = numpy.zeros(capacity)
+        else:
+            self._x = array.array('d', [0.0]) * capacity
+            self._y = array.array('d', [0.0]) * capacity
+        # (version, value) pairs of the candidates to minimum and maximum
+        self._minx = collections.deque()
+        self._maxx = collections.deque()
+        self._miny = collections.deque()
+        self._maxy = collections.deque()
+        self.extend(points)
+
+    def append(self, point):
+        """Add an (x, y) point, dropping the oldest one if it is full"""
+        x, y = float(point[0]), float(point[1])
+        if self._size < self.capacity:
+            index = self._size
+            self._size += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._x[index] = x
+        self._y[index] = y
+
+        self.version += 1
+        oldest = self.version - self._size
+        _push(self._minx, self.version, x, oldest, operator.ge)
+        _push(self._maxx, self.version, x, oldest, operator.le)
+        _push(self._miny, self.version, y, oldest, operator.ge)
+        _push(self._maxy, self.version, y, oldest, operator.le)
+
+    def extend(self, points):
+        """Add several (x, y) points"""
+        for point in points:
+            self.append(point)
+
+    def __len__(self):
+        return self._size
+
+    def extents(self):
+        """Return the (minx, maxx, miny, maxy) tuple of this window"""
+        if not self._size:
+            raise ValueError('Can not compute the extents of empty series')
+        return (self._minx[0][1], self._maxx[0][1],
+                self._miny[0][1], self._maxy[0][1])
+
+    def _ordered(self, values):
+        if self._start == 0:
+            return values[:self._size]
+        if numpy is not None:
+            return numpy.concatenate((values[self._start:],
+                                      values[:self._start]))
+        return values[self._start:] + values[:self._start]
+
+    @property
+    def x(self):
+        """Copy of the x values, from the oldest to the newest"""
+        return self._ordered(self._x)
+
+    @property
+    def y(self):
+        """Copy of the y values, from the oldest to the newest"""
+        return self._ordered(self._y)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Series(self.x[index], self.y[index])
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('RingSeries index out of range')
+        index = (self._start + index) % self.capacity
+        return (float(self._x[index]), float(self._y[index]))
+
+    def __iter__(self):
+        return zip(aslist(self.x), aslist(self.y))
+
+    def __repr__(self):
+        return '<pycha.series.RingSeries of %d/%d points>' % (
+            self._size, self.capacity)
+
+
+def _push(queue, version, value, oldest, dominates):
+    """Add value to a monotonic queue of a sliding window.
+
+    The values of the queue dominated by the new one can never be the
+    extreme of the window again, and those older than oldest left it.
+    """
+    while queue and dominates(queue[-1][1], value):
+        queue.pop()
+    queue.append((version, value))
+    while queue[0][0] <= oldest:
+        queue.popleft()
+
+
+def as_store(store):
+    """Return the store to keep for a dataset.
+
+    Two dimensional NumPy arrays become a Series sharing their memory; any
+    other store is returned unchanged.
+    """
+    if numpy is not None and isinstance(store, numpy.ndarray):
+        return Series.fromArray(store)
+    return store
+
+
+def append(store, points):
+    """Return store with points added at its end.
+
+    Stores with an extend method, like lists and Series, are extended in
+    place. Other sequences are copied into a new list.
+    """
+    if not points:
+        return store
+    elif hasattr(store, 'extend'):
+        store.extend(points)
+        return store
+    return list(store) + list(points)
+
+
+def extents(stores):
+    """Return the (minx, maxx, miny, maxy) tuple of several stores.
+
+    Every store is visited once. Stores providing an extents method (like
+    Series) compute their own extents, which is vectorized when NumPy is
+    available. Empty stores are ignored.
+    """
+    minx = maxx = miny = maxy = None
+    for store in stores:
+        if not len(store):
+            continue
+
+        if hasattr(store, 'extents'):
+            sminx, smaxx, sminy, smaxy = store.extents()
+        else:
+            xs = [item[0] for item in store]
+            ys = [item[1] for item in store]
+            sminx, smaxx, sminy, smaxy = min(xs), max(xs), min(ys), max(ys)
+
+        if minx is None:
+            minx, maxx, miny, maxy = sminx, smaxx, sminy, smaxy
+        else:
+            minx = min(minx, sminx)
+            maxx = max(maxx, smaxx)
+            miny = min(miny, sminy)
+            maxy = max(maxy, smaxy)
+
+    if minx is None:
+        raise ValueError('Can not compute the extents of empty datasets')
+    return minx, maxx, miny, maxy
+
+
+def columns(store):
+    """Return the x and y values of store as two columns"""
+    if isinstance(store, (Series, RingSeries)):
+        return store.x, store.y
+    return [item[0] for item in store], [item[1] for item in store]
+
+
+def normalize(xs, ys, minxval, xscale, minyval, yscale):
+    """Scale x and y columns to the [0, 1] chart coordinates.
+
+    Return a (x, y, visible) tuple where visible is a mask telling which
+    points fall inside the chart area. The y coordinates grow downwards,
+    as they do in the cairo surface. NumPy columns are normalized in a
+    single vectorized operation.
+    """
+    if numpy is not None and isinstance(xs, numpy.ndarray):
+        x = (xs - minxval) * xscale
+        y = 1.0 - (ys - minyval) * yscale
+        visible = (x >= 0.0) & (x <= 1.0) & (y >= 0.0) & (y <= 1.0)
+        return x, y, visible
+
+    x = [(xval - minxval) * xscale for xval in xs]
+    y = [1.0 - (yval - minyval) * yscale for yval in ys]
+    visible = [0.0 <= i <= 1.0 and 0.0 <= j <= 1.0 for i, j in zip(x, y)]
+    return x, y, visible
+
+
+def compress(values, mask):
+    """Return the items of values whose mask item is true"""
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values[mask]
+    return list(itertools.compress(values, mask))
+
+
+def concatenate(values):
+    """Join several columns into a single one"""
+    if numpy is not None and all(isinstance(v, numpy.ndarray) for v in values):
+        return numpy.concatenate(values)
+    return list(itertools.chain.from_iterable(aslist(v) for v in values))
+
+
+def take(values, indexes):
+    """Return the items of values at the given indexes"""
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values[indexes]
+    return [values[i] for i in aslist(indexes)]
+
+
+def aslist(values):
+    """Return a column as a list of Python numbers.
+
+    Iterating over a list is much faster than iterating over a NumPy
+    array, so this should be used before looping over a column.
+    """
+    if isinstance(values, list):
+        return values
+    elif hasattr(values, 'tolist'):
+        return values.tolist()
+    return list(values)
@@ -0,0 +1,83 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+"""Directions of the spokes of radial and polygonal charts.
+
+The spoke i of n starts at the top of the chart and goes clockwise, so its
+angle is pi / 2 - 2 * pi * i / n and a point at distance r from the center
+(cx, cy) is drawn at (cx - cos(angle) * r, cy - sin(angle) * r).
+"""
+
+import math
+
+from six.moves import range, zip
+
+from pycha.compat import numpy
+
+# maximum number of spoke tables kept for reuse
+MAX_TABLES = 64
+
+_tables = {}
+
+
+class Spokes(object):
+    """Angles of n spokes and their sines and cosines"""
+
+    def __init__(self, count):
+        self.count = count
+        self.angles = [math.pi / 2 - i * 2 * math.pi / count
+                       for i in range(count)]
+        self.cos = [math.cos(angle) for angle in self.angles]
+        self.sin = [math.sin(angle) for angle in self.angles]
+        if numpy is not None:
+            self._cos = numpy.array(self.cos)
+            self._sin = numpy.array(self.sin)
+
+    def __len__(self):
+        return self.count
+
+    def point(self, i, centerx, centery, radius):
+        """Return the point of the spoke i at radius from the center"""
+        i %= self.count
+        return (centerx - self.cos[i] * radius,
+                centery - self.sin[i] * radius)
+
+    def vertices(self, indexes, radii, centerx, centery, scale=1.0):
+        """Return the points of the spokes at indexes and distances radii.
+
+        Every radius is multiplied by scale. The points are computed at once
+        with NumPy when it is available.
+        """
+        if numpy is not None:
+            indexes = numpy.asarray(indexes, dtype=numpy.int64) % self.count
+            radii = numpy.asarray(radii, dtype=numpy.float64) * scale
+            x = centerx - self._cos[indexes] * radii
+            y = centery - self._sin[indexes] * radii
+            return list(zip(x.tolist(), y.tolist()))
+        return [self.point(i, centerx, centery, radius * scale)
+                for i, radius in zip(indexes, radii)]
+
+
+def get_spokes(count):
+    """Return the Spokes table of count spokes, reusing a previous one"""
+    spokes = _tables.get(count)
+    if spokes is None:
+        if len(_tables) >= MAX_TABLES:
+            _tables.clear()
+        spokes = Spokes(count)
+        _tables[count] = spokes
+    return spokes
@@ -0,0 +1,137 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+from six.moves import zip
+
+from pycha.chart import Chart
+from pycha.color import hex2rgb
+from pycha.compat import numpy
+from pycha.series import aslist
+from pycha.stacking import stack
+
+
+class StackedAreaChart(Chart):
+    """Areas of several datasets stacked on top of each other.
+
+    The datasets are aligned by x value and accumulated once, according to
+    the stack.mode option, so every area is drawn between the top of the
+    previous datasets (its baseline) and its own top.
+    """
+
+    def __init__(self, surface=None, options={}, debug=False):
+        super(StackedAreaChart, self).__init__(surface, options, debug)
+        self.stack = None
+        self.layers = []
+
+    def _updateXY(self):
+        super(StackedAreaChart, self)._updateXY()
+
+        self.stack = stack(self._getDatasetsValues(),
+                           self.options.stack.mode)
+
+        if self.options.axis.y.range is None:
+            self.minyval, self.maxyval = self.stack.bounds()
+            self.yrange = self.maxyval - self.minyval
+            if self.yrange == 0:
+                self.yscale = 1.0
+            else:
+                self.yscale = 1.0 / self.yrange
+            self.origin = abs(self.minyval) * self.yscale
+
+    def _updateChart(self):
+        """Evaluates the outline of each stacked area"""
+        xvals = self.stack.xvals
+        start, end = self.stack.start, self.stack.end
+
+        if numpy is not None and isinstance(xvals, numpy.ndarray):
+            x = ((xvals - self.minxval) * self.xscale).tolist()
+            bottoms = (1.0 - (start - self.minyval) * self.yscale).tolist()
+            tops = (1.0 - (end - self.minyval) * self.yscale).tolist()
+        else:
+            x = [(xval - self.minxval) * self.xscale for xval in xvals]
+            bottoms = [[1.0 - (value - self.minyval) * self.yscale
+                        for value in row] for row in start]
+            tops = [[1.0 - (value - self.minyval) * self.yscale
+                     for value in row] for row in end]
+
+        self.layers = [Layer(name, x, aslist(bottom), aslist(top))
+                       for (name, store), bottom, top
+                       in zip(self.datasets, bottoms, tops)]
+
+    def _renderChart(self, cx):
+        """Renders the stacked areas"""
+        chart = self.layout.chart
+
+        cx.save()
+        cx.set_line_width(self.options.stroke.width)
+        for layer in self.layers:
+            if not layer.x:
+                continue
+
+            # the outline is built once and reused for every pass
+            cx.new_path()
+            for x, y in layer.outline():
+                cx.line_to(x * chart.w + chart.x, y * chart.h + chart.y)
+            cx.close_path()
+            path = cx.copy_path()
+
+            if self.options.stroke.shadow:
+                cx.save()
+                cx.set_source_rgba(0, 0, 0, 0.15)
+                cx.translate(2, -2)
+                cx.new_path()
+                cx.append_path(path)
+                cx.fill()
+                cx.restore()
+
+            cx.set_source_rgb(*self.colorScheme[layer.name])
+            cx.new_path()
+            cx.append_path(path)
+
+            if not self.options.stroke.hide:
+                cx.fill_preserve()
+                cx.set_source_rgb(*hex2rgb(self.options.stroke.color))
+                cx.stroke()
+            else:
+                cx.fill()
+
+        cx.restore()
+
+
+class Layer(object):
+    """Normalized coordinates of a stacked area.
+
+    x holds the coordinates of every x value of the chart while bottom and
+    top are where the area begins and ends at each of them.
+    """
+
+    __slots__ = ('name', 'x', 'bottom', 'top')
+
+    def __init__(self, name, x, bottom, top):
+        self.name = name
+        self.x = x
+        self.bottom, self.top = bottom, top
+
+    def outline(self):
+        """Return the points of the top edge followed by the bottom edge"""
+        points = list(zip(self.x, self.top))
+        points.extend(zip(reversed(self.x), reversed(self.bottom)))
+        return points
+
+    def __str__(self):
+        return '<pycha.stackedarea.Layer %s of %d points>' % (self.name,
+                                                              len(self.x))
@@ -16,10 +16,11 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
 
-from six.moves import reduce, xrange
+from six.moves import zip
 
 from pycha.bar import BarChart, VerticalBarChart, HorizontalBarChart, Rect
 from pycha.chart import uniqueIndices
+from pycha.stacking import stack
 
 
 class StackedBarChart(BarChart):
@@ -27,6 +28,7 @@ class StackedBarChart(BarChart):
     def __init__(self, surface=None, options={}, debug=False):
         super(StackedBarChart, self).__init__(surface, options, debug)
         self.barWidth = 0.0
+        self.stack = None
 
     def _updateXY(self):
         super(StackedBarChart, self)._updateXY()
@@ -34,21 +36,21 @@ class StackedBarChart(BarChart):
         # need n + 1 divisions on the x axis
         self.xscale = 1 / (self.xrange + 1.0)
 
+        # the stacks are accumulated once and used for the y range and
+        # for the geometry of the bars
+        self.stack = stack(self._getDatasetsValues(),
+                           self.options.stack.mode)
+
         if self.options.axis.y.range is None:
-            # Fix the yscale as we accumulate the y values
-            stores = self._getDatasetsValues()
-            n_stores = len(stores)
-            flat_y = [pair[1] for pair in reduce(lambda a, b: a + b, stores)]
-            store_size = len(flat_y) // n_stores
-            accum = [sum(flat_y[j]for j in xrange(i,
-                                                  i + store_size * n_stores,
-                                                  store_size))
-                     for i in range(len(flat_y) // n_stores)]
-            self.yrange = float(max(accum))
+            lowest, highest = self.stack.bounds()
+            if lowest < 0:
+                self.minyval = lowest
+            self.yrange = highest - min(lowest, 0.0)
             if self.yrange == 0:
                 self.yscale = 1.0
             else:
                 self.yscale = 1.0 / self.yrange
+            self.origin = abs(min(lowest, 0.0)) * self.yscale
 
     def _updateChart(self):
         """Evaluates measures for vertical bars"""
@@ -67,6 +69,17 @@ class StackedBarChart(BarChart):
 
         self.bars = []
 
+    def _getSegments(self):
+        """Return an iterator over the stacked segments of every dataset.
+
+        Each item is a (name, xval, yval, start, end) tuple where start and
+        end are the stacked values where the bar begins and finishes.
+        """
+        for i, (name, store) in enumerate(self.datasets):
+            xvals, yvals, starts, ends = self.stack.segments(i)
+            for xval, yval, start, end in zip(xvals, yvals, starts, ends):
+                yield name, xval, yval, start, end
+
 
 class StackedVerticalBarChart(StackedBarChart, VerticalBarChart):
 
@@ -74,26 +87,16 @@ class StackedVerticalBarChart(StackedBarChart, VerticalBarChart):
         """Evaluates measures for vertical bars"""
         super(StackedVerticalBarChart, self)._updateChart()
 
-        accumulated_heights = {}
-        for i, (name, store) in enumerate(self.datasets):
-            for item in store:
-                xval, yval = item
-                x = ((xval - self.minxval) * self.xscale) + self.barMargin
-                w = self.barWidth
-                h = abs(yval) * self.yscale
-                if yval > 0:
-                    y = (1.0 - h) - self.origin
-                else:
-                    y = 1 - self.origin
+        for name, xval, yval, start, end in self._getSegments():
+            x = ((xval - self.minxval) * self.xscale) + self.barMargin
+            w = self.barWidth
+            h = abs(end - start) * self.yscale
+            y = 1.0 - (self.origin + max(start, end) * self.yscale)
 
-                accumulated_height = accumulated_heights.setdefault(xval, 0)
-                y -= accumulated_height
-                accumulated_heights[xval] += h
+            rect = Rect(x, y, w, h, xval, yval, name)
 
-                rect = Rect(x, y, w, h, xval, yval, name)
-
-                if (0.0 <= rect.x <= 1.0) and (0.0 <= rect.y <= 1.0):
-                    self.bars.append(rect)
+            if (0.0 <= rect.x <= 1.0) and (0.0 <= rect.y <= 1.0):
+                self.bars.append(rect)
 
 
 class StackedHorizontalBarChart(StackedBarChart, HorizontalBarChart):
@@ -102,23 +105,13 @@ class StackedHorizontalBarChart(StackedBarChart, HorizontalBarChart):
         """Evaluates measures for horizontal bars"""
         super(StackedHorizontalBarChart, self)._updateChart()
 
-        accumulated_widths = {}
-        for i, (name, store) in enumerate(self.datasets):
-            for item in store:
-                xval, yval = item
-                y = ((xval - self.minxval) * self.xscale) + self.barMargin
-                h = self.barWidth
-                w = abs(yval) * self.yscale
-                if yval > 0:
-                    x = self.origin
-                else:
-                    x = self.origin - w
-
-                accumulated_width = accumulated_widths.setdefault(xval, 0)
-                x += accumulated_width
-                accumulated_widths[xval] += w
-
-                rect = Rect(x, y, w, h, xval, yval, name)
-
-                if (0.0 <= rect.x <= 1.0) and (0.0 <= rect.y <= 1.0):
-                    self.bars.append(rect)
+        for name, xval, yval, start, end in self._getSegments():
+            y = ((xval - self.minxval) * self.xscale) + self.barMargin
+            h = self.barWidth
+            w = abs(end - start) * self.yscale
+            x = self.origin + min(start, end) * self.yscale
+
+            rect = Rect(x, y, w, h, xval, yval, name)
+
+            if (0.0 <= rect.x <= 1.0) and (0.0 <= rect.y <= 1.0):
+                self.bars.append(rect)
@@ -0,0 +1,226 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+"""Alignment and accumulation of stacked datasets.
+
+The datasets are aligned by x value in a matrix with one row per dataset
+and one column per distinct x value, so datasets may have different
+lengths or miss some x values. The matrix is accumulated once for the
+whole chart using one of these modes:
+
+ * zero: positive values are stacked upwards from zero and negative
+   values downwards, independently of each other
+ * percent: like zero, but the values of each x are scaled so their
+   absolute values add up to 100
+ * silhouette: the stacks are centered around zero (a streamgraph)
+ * wiggle: the baseline of the streamgraph moves to minimize the changes
+   of slope of the layers, as described by Byron and Wattenberg in
+   "Stacked Graphs - Geometry & Aesthetics"
+
+The streamgraph modes are meant for positive values.
+"""
+
+from six.moves import range, zip
+
+from pycha.compat import numpy
+from pycha.series import column, columns
+
+MODES = ('zero', 'percent', 'silhouette', 'wiggle')
+
+
+class Stack(object):
+    """Cumulative stacks of several datasets.
+
+    xvals holds the sorted distinct x values of all the datasets. The
+    values, present, start and end matrices have a row per dataset and a
+    column per x value:
+
+     * values: the sum of the y values of the dataset at that x value
+     * present: whether the dataset has any point at that x value
+     * start: where the segment of the dataset begins, which is the top
+       (or bottom, for negative values) of the previous datasets
+     * end: where the segment of the dataset finishes
+
+    With NumPy these are arrays; otherwise they are lists of lists.
+    """
+
+    def __init__(self, xvals, values, present, start, end):
+        self.xvals = xvals
+        self.values = values
+        self.present = present
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return len(self.values)
+
+    def bounds(self):
+        """Return the (lowest, highest) stacked values, including zero"""
+        if numpy is not None and isinstance(self.end, numpy.ndarray):
+            if not self.end.size:
+                return 0.0, 0.0
+            return (min(float(self.start.min()), float(self.end.min()), 0.0),
+                    max(float(self.start.max()), float(self.end.max()), 0.0))
+
+        edges = [value for matrix in (self.start, self.end)
+                 for row in matrix for value in row]
+        return min(edges + [0.0]), max(edges + [0.0])
+
+    def segments(self, index):
+        """Return the xvals, values, start and end lists of a dataset.
+
+        Only the x values where the dataset has points are included.
+        """
+        if numpy is not None and isinstance(self.values, numpy.ndarray):
+            mask = self.present[index]
+            return (self.xvals[mask].tolist(),
+                    self.values[index][mask].tolist(),
+                    self.start[index][mask].tolist(),
+                    self.end[index][mask].tolist())
+
+        cells = [(x, value, start, end)
+                 for x, value, present, start, end in zip(
+                     self.xvals, self.values[index], self.present[index],
+                     self.start[index], self.end[index])
+                 if present]
+        if not cells:
+            return [], [], [], []
+        return tuple(list(items) for items in zip(*cells))
+
+
+def stack(stores, mode='zero'):
+    """Align stores by x value and accumulate their y values.
+
+    Values of a store sharing the same x value are added up. mode is one
+    of MODES. Return a Stack object.
+    """
+    if mode not in MODES:
+        raise ValueError('Stack mode "%s" is invalid!' % mode)
+
+    xs, ys = [], []
+    for store in stores:
+        x, y = columns(store)
+        xs.append(column(x))
+        ys.append(column(y))
+
+    if numpy is not None:
+        return _stackNumpy(xs, ys, mode)
+
+    xvals = sorted(set(x for store in xs for x in store))
+    positions = dict((x, j) for j, x in enumerate(xvals))
+    values = [[0.0] * len(xvals) for i in range(len(xs))]
+    present = [[False] * len(xvals) for i in range(len(xs))]
+    for i, (x, y) in enumerate(zip(xs, ys)):
+        row, mask = values[i], present[i]
+        for xval, yval in zip(x, y):
+            j = positions[xval]
+            row[j] += yval
+            mask[j] = True
+
+    # the matrix is accumulated column by column
+    start = [[0.0] * len(xvals) for i in range(len(xs))]
+    end = [[0.0] * len(xvals) for i in range(len(xs))]
+    baseline = _baseline(values, mode)
+    for j in range(len(xvals)):
+        cells = [row[j] for row in values]
+        if mode == 'percent':
+            total = sum(abs(value) for value in cells)
+            if total:
+                cells = [value * 100.0 / total for value in cells]
+
+        positive = negative = baseline[j]
+        for i, value in enumerate(cells):
+            if value >= 0 or mode in ('silhouette', 'wiggle'):
+                start[i][j] = positive
+                positive += value
+                end[i][j] = positive
+            else:
+                start[i][j] = negative
+                negative += value
+                end[i][j] = negative
+
+    return Stack(xvals, values, present, start, end)
+
+
+def _baseline(values, mode):
+    """Return the value where the stacks of each x value begin"""
+    n = len(values[0]) if values else 0
+    totals = [sum(row[j] for row in values) for j in range(n)]
+    if mode == 'silhouette':
+        return [-total / 2.0 for total in totals]
+    elif mode != 'wiggle':
+        return [0.0] * n
+
+    baseline = [0.0] * n
+    for j in range(1, n):
+        # weighted average of the slopes of the middle of each layer
+        below = slope = 0.0
+        for row in values:
+            delta = row[j] - row[j - 1]
+            slope += (below + delta / 2.0) * row[j]
+            below += delta
+        baseline[j] = baseline[j - 1]
+        if totals[j]:
+            baseline[j] -= slope / totals[j]
+    return baseline
+
+
+def _stackNumpy(xs, ys, mode):
+    rows = len(xs)
+    if rows:
+        allx = numpy.concatenate(xs)
+        ally = numpy.concatenate(ys)
+    else:
+        allx = ally = numpy.empty(0)
+    xvals, cols = numpy.unique(allx, return_inverse=True)
+    n = len(xvals)
+
+    # the flat index of the cell of each point in the (rows, n) matrix
+    cells = numpy.repeat(numpy.arange(rows), [len(x) for x in xs]) * n
+    cells += cols.reshape(-1)
+    values = numpy.bincount(cells, weights=ally, minlength=rows * n)
+    values = values.reshape(rows, n)
+    present = numpy.bincount(cells, minlength=rows * n).reshape(rows, n) > 0
+
+    if mode in ('silhouette', 'wiggle'):
+        end = numpy.cumsum(values, axis=0) + _baselineNumpy(values, mode)
+        return Stack(xvals, values, present, end - values, end)
+
+    scaled = values
+    if mode == 'percent':
+        totals = numpy.abs(values).sum(axis=0)
+        scaled = values * numpy.divide(100.0, totals,
+                                       out=numpy.zeros(n), where=totals != 0)
+
+    positive = numpy.where(scaled >= 0, scaled, 0.0)
+    positiveEnd = numpy.cumsum(positive, axis=0)
+    negativeEnd = numpy.cumsum(scaled - positive, axis=0)
+    end = numpy.where(scaled >= 0, positiveEnd, negativeEnd)
+    return Stack(xvals, values, present, end - scaled, end)
+
+
+def _baselineNumpy(values, mode):
+    totals = values.sum(axis=0)
+    if mode == 'silhouette':
+        return -totals / 2.0
+
+    delta = numpy.diff(values, axis=1)
+    below = numpy.cumsum(delta, axis=0) - delta
+    slope = ((below + delta / 2.0) * values[:, 1:]).sum(axis=0)
+    change = numpy.divide(slope, totals[1:], out=numpy.zeros(len(slope)),
+                          where=totals[1:] != 0)
+    return numpy.concatenate(([0.0], -numpy.cumsum(change)))
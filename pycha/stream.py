@@ -0,0 +1,248 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+"""Reading of big datasets in a single pass.
+
+The functions of this module read points from iterators, CSV or TSV files
+and binary files without building a Python object for each point. The
+points are aggregated as they are read: they are grouped in buckets of
+consecutive points and only the first, the last, the lowest and the
+highest point of each bucket are kept (M4 aggregation). This keeps the
+shape of the lines, including their spikes, with a bounded number of
+points. The result is a Series that can be passed to addDataset, and its
+extents are those of all the points read::
+
+  chart.addDataset([('requests', read_csv('requests.csv', header=True))])
+
+Binary files hold little endian float64 (x, y) pairs, like the ones
+written by numpy.ndarray.tofile for an array of shape (n, 2). They are
+memory mapped and, when NumPy is available, reduced with vectorized
+operations.
+"""
+
+import csv
+import mmap
+import os
+import struct
+
+import six
+
+from pycha.compat import numpy
+from pycha.series import Series
+
+DEFAULT_MAX_POINTS = 8192
+
+# number of rows of a binary file processed at once
+BLOCK_SIZE = 1 << 20
+
+PAIR = struct.Struct('<dd')
+
+
+class StreamSeries(Series):
+    """Series with the points kept from a stream.
+
+    count is the number of points read and extents returns the extents of
+    all of them, not only the extents of the points kept.
+    """
+
+    def __init__(self, x, y, count, streamExtents):
+        super(StreamSeries, self).__init__(x, y)
+        self.count = count
+        self._streamExtents = streamExtents
+
+    def extents(self):
+        return self._streamExtents
+
+
+class Aggregator(object):
+    """Single pass M4 aggregation of a stream of points.
+
+    Buckets start with one point each. When there are more than twice the
+    allowed number of buckets, every two consecutive buckets are merged,
+    so the memory used never depends on the number of points.
+    """
+
+    def __init__(self, maxPoints=DEFAULT_MAX_POINTS):
+        # up to twice maxBuckets buckets of four points each
+        self.maxBuckets = max(maxPoints // 8, 1)
+        self.bucketSize = 1
+        self.count = 0
+        self.minx = self.maxx = self.miny = self.maxy = None
+        # [first, last, lowest, highest] (index, x, y) tuples
+        self._buckets = []
+
+    def add(self, x, y):
+        """Add the point (x, y) to the stream"""
+        x, y = float(x), float(y)
+        point = (self.count, x, y)
+        if self.count % self.bucketSize == 0:
+            if len(self._buckets) == 2 * self.maxBuckets:
+                self._merge()
+            self._buckets.append([point, point, point, point])
+        else:
+            bucket = self._buckets[-1]
+            bucket[1] = point
+            if y < bucket[2][2]:
+                bucket[2] = point
+            if y > bucket[3][2]:
+                bucket[3] = point
+        self.count += 1
+
+        if self.minx is None:
+            self.minx = self.maxx = x
+            self.miny = self.maxy = y
+        else:
+            self.minx = min(self.minx, x)
+            self.maxx = max(self.maxx, x)
+            self.miny = min(self.miny, y)
+            self.maxy = max(self.maxy, y)
+
+    def extend(self, points):
+        """Add the (x, y) points of an iterable to the stream"""
+        for point in points:
+            self.add(point[0], point[1])
+
+    def _merge(self):
+        buckets = self._buckets
+        merged = []
+        for left, right in zip(buckets[::2], buckets[1::2]):
+            merged.append([
+                left[0],
+                right[1],
+                left[2] if left[2][2] <= right[2][2] else right[2],
+                left[3] if left[3][2] >= right[3][2] else right[3],
+            ])
+        self._buckets = merged
+        self.bucketSize *= 2
+
+    def extents(self):
+        """Return the (minx, maxx, miny, maxy) tuple of all the points"""
+        if self.minx is None:
+            raise ValueError('Can not compute the extents of empty streams')
+        return self.minx, self.maxx, self.miny, self.maxy
+
+    def series(self):
+        """Return a StreamSeries with the points kept so far"""
+        points = sorted(set(point
+                            for bucket in self._buckets
+                            for point in bucket))
+        x = [point[1] for point in points]
+        y = [point[2] for point in points]
+        if not points:
+            return StreamSeries(x, y, 0, None)
+        return StreamSeries(x, y, self.count, self.extents())
+
+
+def read_points(points, maxPoints=DEFAULT_MAX_POINTS):
+    """Return a StreamSeries reading (x, y) points from an iterable"""
+    aggregator = Aggregator(maxPoints)
+    aggregator.extend(points)
+    return aggregator.series()
+
+
+def read_csv(source, xColumn=0, yColumn=1, delimiter=',', header=False,
+             maxPoints=DEFAULT_MAX_POINTS):
+    """Return a StreamSeries reading two columns of a CSV file.
+
+    source is a file name or a file object. Empty rows are ignored and, if
+    header is true, the first row too.
+    """
+    if isinstance(source, six.string_types):
+        with open(source) as f:
+            return read_csv(f, xColumn, yColumn, delimiter, header,
+                            maxPoints)
+
+    rows = csv.reader(source, delimiter=delimiter)
+    if header:
+        next(rows, None)
+    return read_points(((row[xColumn], row[yColumn]) for row in rows if row),
+                       maxPoints)
+
+
+def read_tsv(source, xColumn=0, yColumn=1, header=False,
+             maxPoints=DEFAULT_MAX_POINTS):
+    """Return a StreamSeries reading two columns of a TSV file"""
+    return read_csv(source, xColumn, yColumn, '\t', header, maxPoints)
+
+
+def read_binary(path, maxPoints=DEFAULT_MAX_POINTS):
+    """Return a StreamSeries reading a file of float64 (x, y) pairs"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return StreamSeries([], [], 0, None)
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            count = size // PAIR.size
+            if numpy is not None:
+                pairs = numpy.frombuffer(data, dtype='<f8',
+                                         count=count * 2).reshape(count, 2)
+                try:
+                    return reduce_columns(pairs[:, 0], pairs[:, 1],
+                                          maxPoints)
+                finally:
+                    del pairs
+
+            aggregator = Aggregator(maxPoints)
+            for i in range(count):
+                aggregator.add(*PAIR.unpack_from(data, i * PAIR.size))
+            return aggregator.series()
+        finally:
+            data.close()
+
+
+def reduce_columns(x, y, maxPoints=DEFAULT_MAX_POINTS):
+    """Return a StreamSeries with the M4 aggregation of NumPy columns.
+
+    The columns are processed in blocks so they can be memory mapped
+    arrays bigger than the available memory.
+    """
+    count = len(x)
+    if count == 0:
+        return StreamSeries([], [], 0, None)
+    buckets = max(maxPoints // 4, 1)
+    bucketSize = -(-count // buckets)
+    blockSize = max(BLOCK_SIZE // bucketSize, 1) * bucketSize
+
+    indexes = []
+    blockExtents = []
+    for start in range(0, count, blockSize):
+        end = min(start + blockSize, count)
+        bx, by = x[start:end], y[start:end]
+        blockExtents.append((bx.min(), bx.max(), by.min(), by.max()))
+
+        # the last bucket of the file may be shorter
+        full = (end - start) // bucketSize * bucketSize
+        if full:
+            rows = by[:full].reshape(-1, bucketSize)
+            firsts = numpy.arange(start, start + full, bucketSize)
+            indexes.extend((firsts, firsts + bucketSize - 1,
+                            firsts + rows.argmin(axis=1),
+                            firsts + rows.argmax(axis=1)))
+        if full < end - start:
+            rest = by[full:]
+            first = start + full
+            indexes.append(numpy.array([first, end - 1,
+                                        first + int(rest.argmin()),
+                                        first + int(rest.argmax())]))
+
+    minx, maxx, miny, maxy = zip(*blockExtents)
+    selected = numpy.unique(numpy.concatenate(indexes))
+    return StreamSeries(numpy.array(x[selected], dtype=numpy.float64),
+                        numpy.array(y[selected], dtype=numpy.float64),
+                        count, (float(min(minx)), float(max(maxx)),
+                                float(min(miny)), float(max(maxy))))
@@ -0,0 +1,114 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+"""Fonts and measurement of texts with process wide caches.
+
+Charts measure the same tick labels, legend keys and titles over and over,
+so the extents returned by cairo are remembered for each combination of
+font face, slant, weight, size and text. The cairo scaled fonts are also
+built once and reused by every chart.
+"""
+
+import collections
+
+from pycha.backend import cairo
+
+DEFAULT_CAPACITY = 4096
+
+# maximum number of scaled fonts kept for reuse
+MAX_FONTS = 256
+
+_scaledFonts = {}
+
+
+def get_scaled_font(face, size,
+                    slant=cairo.FONT_SLANT_NORMAL,
+                    weight=cairo.FONT_WEIGHT_NORMAL):
+    """Return the cairo ScaledFont for a font face, size, slant and weight"""
+    key = (face, slant, weight, size)
+    font = _scaledFonts.get(key)
+    if font is None:
+        if len(_scaledFonts) >= MAX_FONTS:
+            _scaledFonts.clear()
+        # pycairo needs all the arguments
+        font = cairo.ScaledFont(cairo.ToyFontFace(face, slant, weight),
+                                cairo.Matrix(xx=size, yy=size),
+                                cairo.Matrix(), cairo.FontOptions())
+        _scaledFonts[key] = font
+    return font
+
+
+def set_font(cx, face, size,
+             slant=cairo.FONT_SLANT_NORMAL, weight=cairo.FONT_WEIGHT_NORMAL):
+    """Make cx use a font, like select_font_face and set_font_size do"""
+    cx.set_scaled_font(get_scaled_font(face, size, slant, weight))
+
+
+class TextExtentsCache(object):
+    """Least recently used cache of cairo text extents.
+
+    It keeps at most capacity entries and counts its hits and misses.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._extents = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._extents)
+
+    def clear(self):
+        """Forget all the extents and reset the counters"""
+        self._extents.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cx, text, face, size,
+            slant=cairo.FONT_SLANT_NORMAL, weight=cairo.FONT_WEIGHT_NORMAL):
+        """Return the extents of text as cx.text_extents would do.
+
+        The font of cx is only changed, and restored afterwards, when the
+        text was not measured before.
+        """
+        key = (face, slant, weight, size, text)
+        try:
+            # move the key to the end so it is the last one to be evicted
+            extents = self._extents.pop(key)
+        except KeyError:
+            self.misses += 1
+            cx.save()
+            set_font(cx, face, size, slant, weight)
+            extents = tuple(cx.text_extents(text))
+            cx.restore()
+            while self._extents and len(self._extents) >= self.capacity:
+                self._extents.popitem(last=False)
+        else:
+            self.hits += 1
+        if self.capacity > 0:
+            self._extents[key] = extents
+        return extents
+
+
+EXTENTS_CACHE = TextExtentsCache()
+
+
+def text_extents(cx, text, face, size,
+                 slant=cairo.FONT_SLANT_NORMAL, weight=cairo.FONT_WEIGHT_NORMAL):
+    """Return the extents of text using the process wide cache"""
+    return EXTENTS_CACHE.get(cx, text, face, size, slant, weight)
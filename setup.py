@@ -60,6 +60,7 @@ setup(
     tests_require=base_requirements,
     extras_require={
         'testing': testing_requirements,
+        'numpy': ['numpy'],
     },
     test_suite="tests",
 )
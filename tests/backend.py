@@ -0,0 +1,85 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import unittest
+
+import pycha.backend
+
+
+class BackendTests(unittest.TestCase):
+
+    def test_selected(self):
+        self.assertTrue(pycha.backend.name in dict(pycha.backend.BACKENDS))
+        name, module = pycha.backend.load_backend(pycha.backend.name)
+        self.assertEqual(name, pycha.backend.name)
+        self.assertTrue(module is pycha.backend.cairo)
+
+    def test_load_backend(self):
+        name, module = pycha.backend.load_backend()
+        self.assertEqual(name, pycha.backend.name)
+        self.assertRaises(ValueError, pycha.backend.load_backend, 'foo')
+
+    def test_load_backend_fallback(self):
+        imported = []
+
+        def import_module(moduleName):
+            imported.append(moduleName)
+            if moduleName == 'cairocffi':
+                # what cairocffi does when libcairo can not be loaded
+                raise OSError('cannot load library')
+            return pycha.backend.cairo
+
+        original = pycha.backend.importlib.import_module
+        pycha.backend.importlib.import_module = import_module
+        try:
+            name, module = pycha.backend.load_backend()
+        finally:
+            pycha.backend.importlib.import_module = original
+        self.assertEqual(name, 'pycairo')
+        self.assertEqual(imported, ['cairocffi', 'cairo'])
+
+    def test_matrix_tuple(self):
+        matrix = pycha.backend.cairo.Matrix(2, 0, 0, 3, 4, 5)
+        self.assertEqual(pycha.backend.matrix_tuple(matrix),
+                         (2, 0, 0, 3, 4, 5))
+
+        class Matrix(object):
+            xx, yx, xy, yy, x0, y0 = 1, 2, 3, 4, 5, 6
+
+        self.assertEqual(pycha.backend.matrix_tuple(Matrix()),
+                         (1, 2, 3, 4, 5, 6))
+
+    def test_measure_calls(self):
+        times = pycha.backend.measure_calls(pycha.backend.cairo, 10)
+        self.assertEqual(sorted(times),
+                         ['fill', 'line_to', 'set_source_rgb', 'text_extents'])
+        for seconds in times.values():
+            self.assertTrue(seconds >= 0)
+
+    def test_measure_charts(self):
+        times = pycha.backend.measure_charts(1)
+        self.assertEqual(sorted(times), ['bar', 'line', 'pie'])
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(BackendTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
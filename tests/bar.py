@@ -17,8 +17,7 @@
 
 import unittest
 
-import cairocffi as cairo
-
+from pycha.backend import cairo
 import pycha.bar
 
 
@@ -33,6 +32,8 @@ class RectTests(unittest.TestCase):
         self.assertEqual(r.xval, 2.5)
         self.assertEqual(r.yval, 3.4)
         self.assertEqual(r.name, 'test')
+        # rects have no per instance dict
+        self.assertRaises(AttributeError, setattr, r, 'foo', 1)
 
 
 class BarTests(unittest.TestCase):
@@ -365,12 +366,72 @@ class HorizontalBarTests(unittest.TestCase):
         self.assertEqual(shadow, (10, 18, 402, 304))
 
 
+class RecordingContext(object):
+    """Context that records the rectangles and paint operations"""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.operations = []
+        self.rectangles = []
+
+    def get_matrix(self):
+        return self.matrix
+
+    def device_to_user_distance(self, x, y):
+        return x, y
+
+    def rectangle(self, *rectangle):
+        self.rectangles.append(rectangle)
+
+    def fill(self):
+        self.operations.append('fill')
+
+    def stroke(self):
+        self.operations.append('stroke')
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+class RenderBarsTests(unittest.TestCase):
+
+    def _chart(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', [(i, i % 7 + 1) for i in range(100)]),
+            ('dataset2', [(i, i % 5 + 1) for i in range(100)]),
+        )
+        ch = pycha.bar.VerticalBarChart(surface)
+        ch.addDataset(dataset)
+        ch.render()
+        return ch
+
+    def test_alignedBars(self):
+        ch = self._chart()
+        cx = RecordingContext(cairo.Matrix())
+        ch._renderChart(cx)
+        # shadows, one fill per dataset and the strokes
+        self.assertEqual(cx.operations, ['fill', 'fill', 'fill', 'stroke'])
+        self.assertEqual(len(cx.rectangles), 3 * len(ch.bars))
+        for x, y, w, h in cx.rectangles:
+            for value in (x, y, x + w, y + h):
+                self.assertAlmostEqual(value, round(value))
+
+    def test_transformedBars(self):
+        ch = self._chart()
+        cx = RecordingContext(cairo.Matrix(0, 1, -1, 0))
+        ch._renderChart(cx)
+        # shadow, fill and stroke of each bar
+        self.assertEqual(len(cx.operations), 3 * len(ch.bars))
+
+
 def test_suite():
     return unittest.TestSuite((
         unittest.makeSuite(RectTests),
         unittest.makeSuite(BarTests),
         unittest.makeSuite(VerticalBarTests),
         unittest.makeSuite(HorizontalBarTests),
+        unittest.makeSuite(RenderBarsTests),
     ))
 
 if __name__ == '__main__':
@@ -0,0 +1,106 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from pycha.compat import numpy
+import pycha.binary
+import pycha.line
+import pycha.series
+
+
+class SeriesFileTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'series.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_roundtrip(self):
+        points = [(0, 1), (1, 3), (2, 2.5)]
+        pycha.binary.write_series(self.path, points)
+        self.assertEqual(os.path.getsize(self.path), 32 + 2 * 3 * 8)
+
+        series = pycha.binary.read_series(self.path)
+        self.assertTrue(isinstance(series, pycha.series.Series))
+        self.assertEqual(list(series), points)
+        self.assertEqual(series.extents(), (0, 2, 1, 3))
+
+    def test_yerr(self):
+        series = pycha.series.Series([0, 1], [1, 2], [0.5, 0.25])
+        pycha.binary.write_series(self.path, series)
+        self.assertEqual(list(pycha.binary.read_series(self.path)),
+                         [(0, 1, 0.5), (1, 2, 0.25)])
+
+    def test_header(self):
+        pycha.binary.write_series(self.path, [(0, 1)])
+        with open(self.path, 'rb') as f:
+            header = f.read(32)
+        self.assertEqual(header[:8], b'PYCHASER')
+        self.assertEqual(pycha.binary.HEADER.unpack(header),
+                         (b'PYCHASER', 1, 0, 1, 0))
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a series file at all, really')
+        self.assertRaises(ValueError, pycha.binary.read_series, self.path)
+
+        pycha.binary.write_series(self.path, [(0, 1), (1, 2)])
+        with open(self.path, 'r+b') as f:
+            f.truncate(40)
+        self.assertRaises(ValueError, pycha.binary.read_series, self.path)
+
+    def test_pickle(self):
+        pycha.binary.write_series(self.path, [(0, 1), (1, 3)])
+        series = pycha.binary.read_series(self.path)
+        data = pickle.dumps(series)
+        # only the file name is pickled
+        self.assertTrue(len(data) < 200)
+        self.assertEqual(list(pickle.loads(data)), [(0, 1), (1, 3)])
+
+    def test_chart(self):
+        pycha.binary.write_series(self.path, [(0, 1), (1, 3), (2, 2)])
+        ch = pycha.line.LineChart(None)
+        ch.addDataset((('dataset1', pycha.binary.read_series(self.path)), ))
+        ch._updateXY()
+        ch._updateChart()
+        self.assertEqual(ch.maxyval, 3)
+        self.assertEqual([point.yval for point in ch.points], [1, 3, 2])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_maxPoints(self):
+        points = [(i, i % 10) for i in range(1000)]
+        pycha.binary.write_series(self.path, points)
+        series = pycha.binary.read_series(self.path, maxPoints=40)
+        self.assertTrue(len(series) <= 40)
+        self.assertEqual(series.extents(), (0, 999, 0, 9))
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(SeriesFileTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,169 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import shutil
+import tempfile
+import unittest
+
+import pycha.bar
+import pycha.cache
+import pycha.line
+import pycha.series
+
+DATASET = (('dataset1', [(0, 1), (1, 3), (2, 2)]), )
+
+
+class ContentHashTests(unittest.TestCase):
+
+    def _hash(self, chartClass=pycha.bar.VerticalBarChart, options=None,
+              dataset=DATASET, width=400, height=300, fileFormat='png'):
+        return pycha.cache.content_hash(chartClass, options, dataset,
+                                        width, height, fileFormat)
+
+    def test_content_hash(self):
+        digest = self._hash()
+        self.assertEqual(digest, self._hash())
+        # options equal to the defaults do not change the digest
+        self.assertEqual(digest, self._hash(options={'shouldFill': True}))
+
+        self.assertNotEqual(digest, self._hash(pycha.line.LineChart))
+        self.assertNotEqual(digest, self._hash(options={'title': 'Foo'}))
+        self.assertNotEqual(digest, self._hash(width=401))
+        self.assertNotEqual(digest, self._hash(fileFormat='svg'))
+        dataset = (('dataset1', [(0, 1), (1, 3), (2, 2.5)]), )
+        self.assertNotEqual(digest, self._hash(dataset=dataset))
+
+    def test_series(self):
+        series = pycha.series.Series([0, 1, 2], [1, 3, 2])
+        digest = self._hash(dataset=(('dataset1', series), ))
+        series = pycha.series.Series([0, 1, 2], [1, 3, 2])
+        self.assertEqual(digest, self._hash(dataset=(('dataset1', series), )))
+        series = pycha.series.Series([0, 1, 2], [1, 3, 4])
+        self.assertNotEqual(digest,
+                            self._hash(dataset=(('dataset1', series), )))
+
+    def test_stores(self):
+        points = [(0.0, 1.0), (1.0, 3.0), (2.0, 2.0)]
+        digest = self._hash(dataset=(('dataset1', points), ))
+        # the datasets are identified by their values, whatever the store
+        series = pycha.series.Series([0, 1, 2], [1, 3, 2])
+        self.assertEqual(digest, self._hash(dataset=(('dataset1', series), )))
+        ring = pycha.series.RingSeries(5, [(0, 1), (1, 3), (2, 2)])
+        self.assertEqual(digest, self._hash(dataset=(('dataset1', ring), )))
+
+        other = pycha.series.RingSeries(5, [(0, 1), (1, 3), (2, 4)])
+        self.assertNotEqual(digest,
+                            self._hash(dataset=(('dataset1', other), )))
+        ring.append((3, 1))
+        self.assertNotEqual(digest,
+                            self._hash(dataset=(('dataset1', ring), )))
+
+        errors = (('dataset1', [(0, 1, 0.5), (1, 3, 0.5), (2, 2, 0.5)]), )
+        self.assertNotEqual(digest, self._hash(dataset=errors))
+
+        self.assertRaises(TypeError, self._hash, dataset=(('dataset1', 1), ))
+
+    def test_types(self):
+        # the labels of the values depend on their types
+        digest = self._hash()
+        floats = (('dataset1', [(0, 1.0), (1, 3), (2, 2)]), )
+        self.assertNotEqual(digest, self._hash(dataset=floats))
+        self.assertEqual(digest, self._hash(dataset=(
+            ('dataset1', ((0, 1), (1, 3), (2, 2))),
+        )))
+        series = pycha.series.Series([0, 1, 2], [1, 3, 2])
+        self.assertNotEqual(digest,
+                            self._hash(dataset=(('dataset1', series), )))
+
+
+class MemoryStoreTests(unittest.TestCase):
+
+    def test_eviction(self):
+        store = pycha.cache.MemoryStore(maxBytes=10)
+        store.put('a', b'1234')
+        store.put('b', b'1234')
+        self.assertEqual(store.get('a'), b'1234')
+        store.put('c', b'1234')
+        # b was the least recently used
+        self.assertEqual(store.get('b'), None)
+        self.assertEqual(store.get('a'), b'1234')
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.size, 8)
+
+        store.clear()
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.size, 0)
+
+
+class DirectoryStoreTests(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_store(self):
+        store = pycha.cache.DirectoryStore(self.path, maxBytes=10)
+        self.assertEqual(store.get('a'), None)
+        store.put('a', b'1234')
+        store.put('b', b'1234')
+        self.assertEqual(store.get('a'), b'1234')
+        self.assertEqual(store.size, 8)
+
+        # a new store on the same directory sees the same files
+        other = pycha.cache.DirectoryStore(self.path, maxBytes=10)
+        self.assertEqual(other.size, 8)
+        self.assertEqual(len(other), 2)
+
+        store.put('c', b'1234')
+        self.assertEqual(len(store), 2)
+        self.assertTrue(store.size <= 10)
+
+        store.clear()
+        self.assertEqual(len(store), 0)
+
+
+class RenderCacheTests(unittest.TestCase):
+
+    def test_render(self):
+        cache = pycha.cache.RenderCache()
+        data = cache.render(pycha.bar.VerticalBarChart, {}, DATASET)
+        self.assertTrue(data)
+        self.assertEqual(cache.render('pycha.bar.VerticalBarChart', None,
+                                      DATASET), data)
+        cache.render(pycha.bar.VerticalBarChart, {}, DATASET, 200, 100)
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertAlmostEqual(stats['hitRate'], 1 / 3.0)
+        self.assertEqual(stats['entries'], 2)
+        self.assertTrue(stats['bytes'] > 0)
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(ContentHashTests),
+        unittest.makeSuite(MemoryStoreTests),
+        unittest.makeSuite(DirectoryStoreTests),
+        unittest.makeSuite(RenderCacheTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
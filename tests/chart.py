@@ -15,11 +15,16 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with PyCha.  If not, see <http://www.gnu.org/licenses/>.
 
+import array
 import unittest
 
-import cairocffi as cairo
-
+from pycha.backend import cairo
+import pycha.bar
 import pycha.chart
+import pycha.line
+import pycha.ring
+import pycha.series
+from pycha.compat import numpy
 
 
 class FunctionsTests(unittest.TestCase):
@@ -76,6 +81,23 @@ class OptionTests(unittest.TestCase):
         self.assertEqual(opt.a, 10)
         self.assertEqual(opt.b, 20)
 
+    def test_copy(self):
+        opt = pycha.chart.Option(a=1, c=pycha.chart.Option(d=4, e=5))
+        copied = opt.copy()
+        self.assertEqual(copied, opt)
+        self.assertTrue(isinstance(copied, pycha.chart.Option))
+        self.assertTrue(isinstance(copied.c, pycha.chart.Option))
+        self.assertFalse(copied.c is opt.c)
+
+        copied.merge(dict(a=2, c=dict(d=7)))
+        self.assertEqual(opt.a, 1)
+        self.assertEqual(opt.c.d, 4)
+
+        # the defaults are never modified by the charts
+        ch = pycha.chart.Chart(None, dict(axis=dict(x=dict(hide=True))))
+        self.assertEqual(ch.options.axis.x.hide, True)
+        self.assertEqual(pycha.chart.DEFAULT_OPTIONS.axis.x.hide, False)
+
 
 class ChartTests(unittest.TestCase):
 
@@ -108,6 +130,20 @@ class ChartTests(unittest.TestCase):
         self.assertEqual(ch._getDatasetsValues(),
                          [d1[1], d2[1], d3[1]])
 
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_columnarDatasets(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        ch = pycha.chart.Chart(surface)
+        columns = numpy.array([[0, 1], [1, 1], [2, 3]], dtype=float)
+        series = pycha.series.Series([0, 1, 3], [2, 0, 4])
+        ch.addDataset((('dataset1', columns), ('dataset2', series)))
+        stores = ch._getDatasetsValues()
+        self.assertTrue(isinstance(stores[0], pycha.series.Series))
+        self.assertTrue(stores[1] is series)
+        ch._updateXY()
+        self.assertEqual(ch.maxxval, 3)
+        self.assertEqual(ch.maxyval, 4)
+
     def test_options(self):
         ch = pycha.chart.Chart(None)
         opt = pycha.chart.Option(shouldFill=False)
@@ -141,6 +177,15 @@ class ChartTests(unittest.TestCase):
         self.assertTrue(isinstance(ch.colorScheme, dict))
         self.assertEqual(ch.colorScheme, {'dataset1': (0.0, 0.0, 0.0)})
 
+        # the color scheme is reused while the datasets names do not change
+        colorScheme = ch.colorScheme
+        ch._setColorscheme()
+        self.assertTrue(ch.colorScheme is colorScheme)
+        ch.addDataset((('dataset2', ([0, 1], [1, 1])), ))
+        ch._setColorscheme()
+        self.assertEqual(sorted(ch.colorScheme.keys()),
+                         ['dataset1', 'dataset2'])
+
         options = {'colorScheme': {'name': 'foo'}}
         ch = pycha.chart.Chart(None, options)
         ch.addDataset(dataset)
@@ -167,6 +212,48 @@ class ChartTests(unittest.TestCase):
         self.assertEqual(ch.yscale, 1/4.0)
         # TODO: test with different options (axis.range, ...)
 
+    def test_extentsCache(self):
+        ch = pycha.chart.Chart(None)
+        series = pycha.series.Series([0, 1, 2], [1, 1, 3])
+        ch.addDataset((('dataset1', series), ))
+        extents = ch._getExtents()
+        self.assertEqual(extents, (0, 2, 1, 3))
+        self.assertTrue(ch._getExtents() is extents)
+
+        ch.addDataset((('dataset2', pycha.series.Series([3], [4])), ))
+        self.assertEqual(ch._getExtents(), (0, 3, 1, 4))
+
+        # series sharing memory with an array must be invalidated after
+        # changing it in place
+        y = array.array('d', [1, 1, 3])
+        series = pycha.series.Series([0, 1, 2], y)
+        ch = pycha.chart.Chart(None)
+        ch.addDataset((('dataset1', series), ))
+        self.assertEqual(ch._getExtents(), (0, 2, 1, 3))
+        y[2] = 100
+        series.invalidate()
+        self.assertEqual(ch._getExtents(), (0, 2, 1, 100))
+
+        # plain sequences may change in place, so they are never cached
+        store = [[0, 1], [1, 2]]
+        ch = pycha.chart.Chart(None)
+        ch.addDataset((('dataset1', store), ))
+        self.assertEqual(ch._getExtents(), (0, 1, 1, 2))
+        store[1] = (1, 50)
+        self.assertEqual(ch._getExtents(), (0, 1, 1, 50))
+        store.append([5, 0])
+        self.assertEqual(ch._getExtents(), (0, 5, 0, 50))
+
+        # stores with a version are computed again when it changes
+        ring = pycha.series.RingSeries(2, [(0, 1), (1, 2)])
+        ch = pycha.chart.Chart(None)
+        ch.addDataset((('dataset1', ring), ))
+        self.assertEqual(ch._getExtents(), (0, 1, 1, 2))
+        ring.append((2, 3))
+        self.assertEqual(ch._getExtents(), (1, 2, 2, 3))
+        ch._extendDataset(0, [(3, 0)])
+        self.assertEqual(ch._getExtents(), (2, 3, 0, 3))
+
     def test_updateTicks(self):
         surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
         opt = {'padding': dict(left=10, right=10, top=10, bottom=10)}
@@ -286,12 +373,79 @@ class ChartTests(unittest.TestCase):
             self.assertAlmostEqual(tick[1], label, 2)
 
 
+class RenderManyTests(unittest.TestCase):
+
+    def _surface(self):
+        return cairo.ImageSurface(cairo.FORMAT_ARGB32, 200, 100)
+
+    def _checkRenderMany(self, chart_class, datasets, state):
+        rendered = []
+
+        class RecordingChart(chart_class):
+
+            def render(self, surface=None, options={}):
+                super(RecordingChart, self).render(surface, options)
+                rendered.append((surface, state(self)))
+
+        options = {'title': 'Batch'}
+        surfaces = list(pycha.chart.render_many(
+            RecordingChart, options, iter(datasets), self._surface,
+        ))
+        self.assertEqual(len(surfaces), len(datasets))
+        self.assertEqual(len(set(id(surface) for surface in surfaces)),
+                         len(datasets))
+
+        # every surface shows the same chart as a new chart would
+        for dataset, surface, (target, result) in zip(datasets, surfaces,
+                                                      rendered):
+            self.assertTrue(target is surface)
+            chart = chart_class(self._surface(), options)
+            chart.addDataset(dataset)
+            chart.render()
+            self.assertEqual(result, state(chart))
+
+    def test_render_many(self):
+        datasets = [
+            (('dataset1', [(0, i), (1, i + 1), (2, i * 2)]), )
+            for i in range(5)
+        ] + [
+            (('dataset2', [(0, 3), (1, 1)]), ('dataset3', [(5, 10)])),
+        ]
+
+        def lineState(chart):
+            return ([(p.name, p.xval, p.yval) for p in chart.points],
+                    chart.xticks, chart.yticks)
+
+        self._checkRenderMany(pycha.line.LineChart, datasets, lineState)
+
+        def barState(chart):
+            return ([(b.name, b.x, b.y, b.w, b.h) for b in chart.bars],
+                    chart.xticks, chart.yticks)
+
+        self._checkRenderMany(pycha.bar.VerticalBarChart, datasets, barState)
+
+    def test_render_many_rings(self):
+        datasets = [
+            (('dataset1', [(0, 1), (1, 2), (2, 3)]),
+             ('dataset2', [(0, 2), (1, 1), (2, 1)])),
+            (('dataset1', [(0, 1)]), ),
+        ]
+
+        def ringState(chart):
+            return (dict((ring, [(s.name, s.fraction) for s in slices])
+                         for ring, slices in chart.slices.items()),
+                    chart.xticks)
+
+        self._checkRenderMany(pycha.ring.RingChart, datasets, ringState)
+
+
 def test_suite():
     return unittest.TestSuite((
         unittest.makeSuite(FunctionsTests),
         unittest.makeSuite(AreaTests),
         unittest.makeSuite(OptionTests),
         unittest.makeSuite(ChartTests),
+        unittest.makeSuite(RenderManyTests),
     ))
 
 
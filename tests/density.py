@@ -0,0 +1,72 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import unittest
+
+from pycha.compat import numpy
+import pycha.density
+
+
+class SquareBinsTests(unittest.TestCase):
+
+    def test_bins(self):
+        x = [0.0, 0.05, 0.5, 1.0]
+        y = [0.0, 0.05, 0.5, 1.0]
+        bins = pycha.density.square_bins(x, y, 100, 100, 10)
+        self.assertEqual(bins, [(5.0, 5.0, 2), (55.0, 55.0, 1),
+                                (95.0, 95.0, 1)])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        x = numpy.linspace(0, 1, 500)
+        y = (x * 7) % 1
+        expected = pycha.density.square_bins(list(x), list(y), 120, 80, 6)
+        bins = pycha.density.square_bins(x, y, 120, 80, 6)
+        self.assertEqual(sorted(bins), sorted(expected))
+
+
+class HexBinsTests(unittest.TestCase):
+
+    def test_bins(self):
+        # points near the centers of the (0, 0), (0, 1) and (1, 0) hexagons
+        radius = 10
+        dx, dy = radius * pycha.density.HEX_DX, radius * pycha.density.HEX_DY
+        x = [1 / 100.0, 0.5 * dx / 100.0, (dx + 1) / 100.0, 2 / 100.0]
+        y = [1 / 100.0, dy / 100.0, 0.0, 0.0]
+        bins = pycha.density.hex_bins(x, y, 100, 100, radius)
+        self.assertEqual([count for bx, by, count in bins], [2, 1, 1])
+        self.assertAlmostEqual(bins[2][0], 0.5 * dx)
+        self.assertAlmostEqual(bins[2][1], dy)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        x = numpy.linspace(0, 1, 500)
+        y = (x * 7) % 1
+        expected = pycha.density.hex_bins(list(x), list(y), 120, 80, 6)
+        bins = pycha.density.hex_bins(x, y, 120, 80, 6)
+        self.assertEqual(sorted(bins), sorted(expected))
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(SquareBinsTests),
+        unittest.makeSuite(HexBinsTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,85 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import math
+import unittest
+
+from pycha.compat import numpy
+import pycha.downsample
+
+
+def wave(n):
+    x = [i / float(n - 1) for i in range(n)]
+    y = [math.sin(i / 10.0) for i in range(n)]
+    y[n // 3] = 10.0  # spike
+    return x, y
+
+
+class LTTBTests(unittest.TestCase):
+
+    def test_small(self):
+        x, y = wave(10)
+        self.assertEqual(pycha.downsample.lttb(x, y, 20), list(range(10)))
+
+    def test_lttb(self):
+        x, y = wave(1000)
+        indexes = pycha.downsample.lttb(x, y, 100)
+        self.assertEqual(len(indexes), 100)
+        self.assertEqual(indexes[0], 0)
+        self.assertEqual(indexes[-1], 999)
+        self.assertEqual(indexes, sorted(indexes))
+        self.assertTrue(1000 // 3 in indexes)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        x, y = wave(1000)
+        expected = pycha.downsample.lttb(x, y, 100)
+        indexes = pycha.downsample.lttb(numpy.array(x), numpy.array(y), 100)
+        self.assertEqual(list(indexes), expected)
+
+
+class MinMaxTests(unittest.TestCase):
+
+    def test_small(self):
+        x, y = wave(10)
+        self.assertEqual(pycha.downsample.minmax(x, y, 20), list(range(10)))
+
+    def test_minmax(self):
+        x, y = wave(1000)
+        indexes = pycha.downsample.minmax(x, y, 50)
+        self.assertTrue(len(indexes) <= 100)
+        self.assertEqual(indexes, sorted(indexes))
+        self.assertTrue(1000 // 3 in indexes)
+        self.assertTrue(y.index(min(y)) in indexes)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        x, y = wave(1000)
+        expected = pycha.downsample.minmax(x, y, 50)
+        indexes = pycha.downsample.minmax(numpy.array(x), numpy.array(y), 50)
+        self.assertEqual(list(indexes), expected)
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(LTTBTests),
+        unittest.makeSuite(MinMaxTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
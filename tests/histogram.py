@@ -0,0 +1,173 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import random
+import unittest
+
+from pycha.backend import cairo
+import pycha.histogram
+
+
+class BinLayoutTests(unittest.TestCase):
+
+    def test_fixed(self):
+        layout = pycha.histogram.bin_layout([0, 10], 'fixed', bins=5)
+        self.assertEqual(layout, (0, 2, 5))
+        layout = pycha.histogram.bin_layout([0, 10], 'fixed', binWidth=3)
+        self.assertEqual(layout, (0, 3, 4))
+        layout = pycha.histogram.bin_layout([1, 2], 'fixed', bins=4,
+                                            range=(0, 8))
+        self.assertEqual(layout, (0, 2, 4))
+
+    def test_sturges(self):
+        start, width, bins = pycha.histogram.bin_layout(range(100))
+        self.assertEqual(bins, 8)
+        self.assertEqual(start, 0)
+        self.assertAlmostEqual(width, 99 / 8.0)
+
+    def test_fd(self):
+        samples = list(range(1000))
+        start, width, bins = pycha.histogram.bin_layout(samples, 'fd')
+        # IQR is 499.5 and the cube root of 1000 is 10
+        self.assertAlmostEqual(width, 99.9)
+        self.assertEqual(bins, 10)
+
+        # without spread the fd rule falls back to sturges
+        samples = [0] * 10 + [1]
+        self.assertEqual(pycha.histogram.bin_layout(samples, 'fd')[2], 5)
+
+    def test_degenerate(self):
+        self.assertEqual(pycha.histogram.bin_layout([3, 3, 3]), (2.5, 1, 1))
+        self.assertRaises(ValueError, pycha.histogram.bin_layout, [1], 'foo')
+
+
+class HistogramTests(unittest.TestCase):
+
+    def test_add(self):
+        histogram = pycha.histogram.Histogram(0, 2, 3)
+        self.assertEqual(histogram.edges, [0, 2, 4, 6])
+        histogram.add([0, 1, 2, 5.5, 6, -1, 7, float('nan')])
+        self.assertEqual(histogram.counts, [2, 1, 2])
+        self.assertEqual(histogram.underflow, 1)
+        self.assertEqual(histogram.overflow, 1)
+
+    def test_merge(self):
+        a = pycha.histogram.Histogram(0, 1, 3)
+        a.add([0, 1, 1])
+        b = pycha.histogram.Histogram(0, 1, 3)
+        b.add([2, 2, 5])
+        self.assertTrue(a.merge(b) is a)
+        self.assertEqual(a.counts, [1, 2, 2])
+        self.assertEqual(a.overflow, 1)
+
+        c = pycha.histogram.Histogram(0, 2, 3)
+        self.assertRaises(ValueError, a.merge, c)
+
+    def test_fromSamples(self):
+        histogram = pycha.histogram.Histogram.fromSamples(
+            [1, 2, 2, 3, 3, 3], 'fixed', bins=3)
+        self.assertEqual(histogram.counts, [1, 2, 3])
+        self.assertEqual(histogram.underflow + histogram.overflow, 0)
+
+    def test_largestSample(self):
+        # rounding errors of the bin width must not leave the largest
+        # sample out of the last bin
+        generator = random.Random(0)
+        for bins in range(1, 300):
+            samples = [generator.uniform(-100, 100) for i in range(bins + 5)]
+            for binning in ('fixed', 'sturges', 'fd'):
+                histogram = pycha.histogram.Histogram.fromSamples(
+                    samples, binning, bins=bins)
+                self.assertEqual(sum(histogram.counts), len(samples))
+                self.assertEqual(histogram.overflow, 0)
+
+            samples = [i / float(bins) for i in range(bins + 1)]
+            histogram = pycha.histogram.Histogram.fromSamples(
+                samples, 'fixed', bins=bins)
+            self.assertEqual(sum(histogram.counts), len(samples))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, pycha.histogram.Histogram, 0, 0, 3)
+        self.assertRaises(ValueError, pycha.histogram.Histogram, 0, 1, 0)
+
+
+class HistogramChartTests(unittest.TestCase):
+
+    def test_updateChart(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        options = {'histogram': {'binning': 'fixed', 'bins': 4}}
+        ch = pycha.histogram.HistogramChart(surface, options)
+        ch.addSamples((
+            ('dataset1', [0, 1, 1, 2, 3, 4, 5, 6, 7, 8]),
+            ('dataset2', [4, 4, 4, 4]),
+        ))
+        ch.render()
+
+        self.assertEqual(len(ch.histograms), 2)
+        self.assertEqual(ch.histograms[0][1].counts, [3, 2, 2, 3])
+        self.assertEqual(ch.histograms[1][1].counts, [0, 0, 4, 0])
+        self.assertEqual([bar.yval for bar in ch.bars
+                          if bar.name == 'dataset1'], [3, 2, 2, 3])
+        self.assertEqual(ch.maxyval, 4)
+        # each bar is labeled with the center of its bin
+        self.assertEqual([tick[1] for tick in ch.xticks],
+                         [1.0, 3.0, 5.0, 7.0, 9.0])
+
+    def test_intervalTicks(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        options = {
+            'histogram': {'binning': 'fixed', 'bins': 4},
+            'axis': {'x': {'interval': 0.5, 'tickPrecision': 2}},
+        }
+        ch = pycha.histogram.HistogramChart(surface, options)
+        ch.addSamples((('dataset1', [0, 100]), ))
+        ch.render()
+
+        offset = ch.minxdelta * ch.xscale / 2
+        for pos, label in ch.xticks:
+            index = (pos - offset) / ch.xscale + ch.minxval
+            self.assertAlmostEqual(label, (index + 0.5) * 25, 2)
+        self.assertTrue(37.5 in [tick[1] for tick in ch.xticks])
+
+    def test_mergedHistograms(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        chunks = ([1, 2, 3], [3, 4], [9])
+        histogram = pycha.histogram.Histogram(0, 5, 2)
+        for chunk in chunks:
+            part = pycha.histogram.Histogram(0, 5, 2)
+            part.add(chunk)
+            histogram.merge(part)
+
+        ch = pycha.histogram.HistogramChart(surface)
+        ch.addSamples((('dataset1', histogram), ))
+        ch.render()
+        self.assertEqual([bar.yval for bar in ch.bars], [5, 1])
+
+        ch.reset()
+        self.assertEqual(ch.samples, [])
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(BinLayoutTests),
+        unittest.makeSuite(HistogramTests),
+        unittest.makeSuite(HistogramChartTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
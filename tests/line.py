@@ -17,9 +17,9 @@
 
 import unittest
 
-import cairocffi as cairo
-
+from pycha.backend import cairo
 import pycha.line
+import pycha.series
 
 class PointTests(unittest.TestCase):
 
@@ -30,6 +30,7 @@ class PointTests(unittest.TestCase):
         self.assertEqual(point.xval, 1.0)
         self.assertEqual(point.yval, 2.0)
         self.assertEqual(point.name, "test")
+        self.assertRaises(AttributeError, setattr, point, 'foo', 1)
 
 class LineTests(unittest.TestCase):
 
@@ -108,6 +109,171 @@ class LineTests(unittest.TestCase):
             self.assertAlmostEqual(p1.yval, p2.yval, 4)
             self.assertEqual(p1.name, p2.name)
 
+    def test_updateChartWithSeries(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', pycha.series.Series([0, 1, 2], [1, 1, 3])),
+            ('dataset2', ([0, 2], [1, 0], [3, 4])),
+            )
+        ch = pycha.line.LineChart(surface)
+        ch.addDataset(dataset)
+        ch._updateXY()
+        ch._updateChart()
+
+        # points are only built when they are requested
+        self.assertEqual(ch._points, None)
+        self.assertEqual([len(series) for series in ch.seriesPoints], [3, 3])
+        self.assertEqual(list(ch.seriesPoints[0].coordinates()),
+                         [(0, 0.75), (1/3.0, 0.75), (2/3.0, 0.25)])
+        self.assertEqual(list(ch._getCoordinates('dataset2')),
+                         [(0, 0.5), (1/3.0, 1), (1, 0)])
+        self.assertEqual(list(ch._getCoordinates('unknown')), [])
+
+        points = (
+            pycha.line.Point(0, 0.75, 0, 1, 'dataset1'),
+            pycha.line.Point(1/3.0, 0.75, 1, 1, 'dataset1'),
+            pycha.line.Point(2/3.0, 0.25, 2, 3, 'dataset1'),
+            pycha.line.Point(0, 0.5, 0, 2, 'dataset2'),
+            pycha.line.Point(1/3.0, 1, 1, 0, 'dataset2'),
+            pycha.line.Point(1, 0, 3, 4, 'dataset2'),
+        )
+        self.assertEqual(len(ch.points), len(points))
+        for p1, p2 in zip(ch.points, points):
+            self.assertAlmostEqual(p1.x, p2.x, 4)
+            self.assertAlmostEqual(p1.y, p2.y, 4)
+            self.assertAlmostEqual(p1.xval, p2.xval, 4)
+            self.assertAlmostEqual(p1.yval, p2.yval, 4)
+            self.assertEqual(p1.name, p2.name)
+
+    def test_downsample(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', [(i, i % 7) for i in range(1000)]),
+        )
+        ch = pycha.line.LineChart(surface, {'downsample': {'method': 'lttb'}})
+        ch.addDataset(dataset)
+        ch._updateXY()
+        ch._updateChart()
+        ch.layout.chart.w = 100
+        ch._downsample()
+        self.assertEqual(len(list(ch._getCoordinates('dataset1'))), 200)
+        # the extents still come from every point
+        self.assertEqual(ch.maxxval, 999)
+        self.assertEqual(len(ch.points), 1000)
+
+        ch.options.downsample.method = 'foo'
+        self.assertRaises(ValueError, ch._downsample)
+
+    def test_extend(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        options = {
+            'shouldFill': False,
+            'axis': {
+                'x': {'range': (0, 100), 'interval': 10},
+                'y': {'range': (0, 10), 'interval': 1},
+            },
+        }
+        ch = pycha.line.LineChart(surface, options)
+        ch.addDataset((
+            ('dataset1', [(0, 1), (1, 2), (2, 3)]),
+            ('dataset2', [(0, 5), (1, 6)]),
+        ))
+        ch.render()
+        self.assertEqual(ch._getExtents(), (0, 2, 1, 6))
+
+        # the new points fit in the axes of the previous render
+        self.assertTrue(ch.extend('dataset1', [(3, 4), (4, 9)]))
+        self.assertEqual(len(ch.datasets[0][1]), 5)
+        self.assertEqual(ch._getExtents(), (0, 4, 1, 9))
+        self.assertEqual(len(ch.points), 7)
+        self.assertEqual(ch.points[4].xval, 4)
+        self.assertAlmostEqual(ch.points[4].y, 0.1)
+
+        # out of the y range
+        self.assertFalse(ch.extend('dataset2', [(2, 11)]))
+        self.assertEqual(len(ch.points), 7)
+
+        # new datasets are rendered along with the rest of the chart
+        self.assertFalse(ch.extend('dataset3', [(0, 1)]))
+        self.assertEqual(len(ch.datasets), 3)
+        self.assertTrue(ch.extend('dataset3', [(1, 1)]))
+
+        # filled areas are always rendered again
+        ch.setOptions({'shouldFill': True})
+        self.assertFalse(ch.extend('dataset1', [(5, 5)]))
+
+    def test_updateChartWithRingSeries(self):
+        ring = pycha.series.RingSeries(3, [(i, i % 2) for i in range(5)])
+        ch = pycha.line.LineChart(None)
+        ch.addDataset((('dataset1', ring), ))
+        ch._updateXY()
+        ch._updateChart()
+        self.assertEqual([point.xval for point in ch.points], [2, 3, 4])
+        self.assertEqual([point.yval for point in ch.points], [0, 1, 0])
+
+        ring.append((5, 3))
+        ch._updateXY()
+        ch._updateChart()
+        self.assertEqual(ch.maxyval, 3)
+        self.assertEqual([point.xval for point in ch.points], [3, 4, 5])
+
+    def test_extendWithGrowingExtents(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        ch = pycha.line.LineChart(surface, {'shouldFill': False})
+        ch.addDataset((('dataset1', [(0, 1), (1, 2)]), ))
+        ch.render()
+        self.assertFalse(ch.extend('dataset1', [(2, 3)]))
+        self.assertEqual(ch.maxxval, 2)
+        self.assertEqual(ch.maxyval, 3)
+
+    def test_extendKeepsExtents(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        options = {
+            'shouldFill': False,
+            'axis': {'x': {'interval': 2}, 'y': {'interval': 2}},
+        }
+        ch = pycha.line.LineChart(surface, options)
+        ch.addDataset((
+            ('dataset1', [(0, 0), (10, 10)]),
+            ('dataset2', pycha.series.Series([0, 10], [2, 4])),
+        ))
+        ch.render()
+
+        def getExtents():
+            raise AssertionError('The datasets should not be scanned')
+
+        # the extents of the previous render grow with the new points
+        ch._getExtents = getExtents
+        self.assertTrue(ch.extend('dataset1', [(5, 5)]))
+        self.assertTrue(ch.extend('dataset2', [(6, 3), (7, 8)]))
+        self.assertEqual(ch._lastRender[4], (0, 10, 0, 10))
+        self.assertEqual(len(ch.datasets[1][1]), 4)
+        self.assertEqual(len(ch.points), 7)
+
+    def test_extendRingSeries(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        options = {
+            'shouldFill': False,
+            'axis': {
+                'x': {'range': (0, 100), 'interval': 10},
+                'y': {'range': (0, 10), 'interval': 1},
+            },
+        }
+        ring = pycha.series.RingSeries(3, [(0, 1), (1, 2)])
+        ch = pycha.line.LineChart(surface, options)
+        ch.addDataset((('dataset1', ring), ))
+        ch.render()
+
+        # the window still has room for the new point
+        self.assertTrue(ch.extend('dataset1', [(2, 3)]))
+        self.assertEqual(len(ch.seriesIndex['dataset1'][0]), 3)
+
+        # the window is full: the first point is dropped and the whole
+        # chart is rendered again to erase it
+        self.assertFalse(ch.extend('dataset1', [(3, 4)]))
+        self.assertEqual(len(ch.seriesIndex['dataset1'][0]), 3)
+        self.assertEqual([point.xval for point in ch.points], [1, 2, 3])
+
 def test_suite():
     return unittest.TestSuite((
         unittest.makeSuite(PointTests),
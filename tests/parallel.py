@@ -0,0 +1,117 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pycha.bar
+import pycha.parallel
+import pycha.ring
+
+
+def dataset(i):
+    return (('dataset1', [(0, i), (1, i + 1), (2, 3)]), )
+
+
+class RenderAllTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_resolve_chart_class(self):
+        self.assertTrue(pycha.parallel.resolve_chart_class(
+            'pycha.bar.VerticalBarChart') is pycha.bar.VerticalBarChart)
+        self.assertTrue(pycha.parallel.resolve_chart_class(
+            pycha.bar.VerticalBarChart) is pycha.bar.VerticalBarChart)
+
+    def test_render_all(self):
+        path = os.path.join(self.tmpdir, 'chart.svg')
+        jobs = [
+            (pycha.bar.VerticalBarChart, {}, dataset(1), None),
+            ('pycha.line.LineChart', {'title': 'Line'}, dataset(2),
+             {'format': 'svg', 'path': path}),
+            (pycha.bar.VerticalBarChart, {}, dataset(3),
+             {'format': 'gif'}),
+        ]
+        results = pycha.parallel.render_all(jobs, processes=1)
+        self.assertEqual([result.index for result in results], [0, 1, 2])
+
+        self.assertEqual(results[0].error, None)
+        self.assertTrue(results[0].data)
+
+        self.assertEqual(results[1].error, None)
+        self.assertEqual(results[1].data, None)
+        self.assertTrue(os.path.exists(path))
+
+        self.assertTrue('gif' in results[2].error)
+        for result in results:
+            self.assertTrue(result.elapsed >= 0)
+
+    def test_reuse(self):
+        rendered = []
+        original = pycha.parallel.render_chart
+
+        def render_chart(chart, *args):
+            original(chart, *args)
+            rendered.append((chart, sorted(chart.slices), chart.xticks))
+
+        options = {'title': 'Rings'}
+        jobs = [
+            (pycha.ring.RingChart, options,
+             (('dataset1', [(0, 1), (1, 2), (2, 3)]), ), None),
+            (pycha.ring.RingChart, options,
+             (('dataset1', [(0, 1)]), ), None),
+        ]
+        pycha.parallel.render_chart = render_chart
+        try:
+            results = pycha.parallel.render_all(jobs, processes=1)
+        finally:
+            pycha.parallel.render_chart = original
+        for result in results:
+            self.assertEqual(result.error, None)
+
+        (first, rings1, ticks1), (second, rings2, ticks2) = rendered
+        self.assertEqual(rings1, [0, 1, 2])
+        self.assertEqual(rings2, [0])
+        self.assertEqual(ticks2, [(0, u'0')])
+        # only the settings that do not depend on the data are reused
+        self.assertFalse(first is second)
+        self.assertEqual(second.options.title, 'Rings')
+        self.assertTrue(second.colorScheme is first.colorScheme)
+
+    def test_pool(self):
+        jobs = [(pycha.bar.VerticalBarChart, {}, dataset(i), None)
+                for i in range(4)]
+        results = pycha.parallel.render_all(jobs, processes=2)
+        self.assertEqual([result.index for result in results], [0, 1, 2, 3])
+        for result in results:
+            self.assertEqual(result.error, None)
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(RenderAllTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
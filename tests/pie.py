@@ -17,8 +17,7 @@
 import math
 import unittest
 
-import cairocffi as cairo
-
+from pycha.backend import cairo
 import pycha.pie
 
 class SliceTests(unittest.TestCase):
@@ -31,6 +30,7 @@ class SliceTests(unittest.TestCase):
         self.assertEqual(slice.yval, 4)
         self.assertEqual(slice.startAngle, math.pi / 2)
         self.assertEqual(slice.endAngle, 1.7 * math.pi)
+        self.assertRaises(AttributeError, setattr, slice, 'foo', 1)
 
     def test_isBigEnough(self):
         slice = pycha.pie.Slice('test 1', 3/5.0, 0, 4, 1/4.0)
@@ -161,6 +161,19 @@ class PieTests(unittest.TestCase):
             self.assertEqual(s1.xval, s2.xval)
             self.assertEqual(s1.yval, s2.yval)
 
+    def test_renderTwice(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', ([0, 30],)),
+            ('dataset2', ([1, 70],)),
+            )
+        ch = pycha.pie.PieChart(surface, {})
+        ch.addDataset(dataset)
+        ch.render()
+        ticks = list(ch.layout.ticks)
+        ch.render()
+        self.assertEqual(ch.layout.ticks, ticks)
+
 
 def test_suite():
     return unittest.TestSuite((
@@ -0,0 +1,72 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import unittest
+
+from pycha.backend import cairo
+import pycha.polygonal
+import pycha.radial
+
+
+class RadialTests(unittest.TestCase):
+
+    def test_init(self):
+        ch = pycha.radial.RadialChart(None)
+        self.assertEqual(ch.points, [])
+        self.assertEqual(ch.seriesVertices, {})
+
+    def test_updateChart(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', ([0, 1], [1, 2], [2, 4])),
+            ('dataset2', ([0, 4], [1, 3], [2, 2], [3, 1])),
+            )
+        ch = pycha.radial.RadialChart(surface)
+        ch.addDataset(dataset)
+        ch._updateXY()
+        ch._updateChart()
+
+        self.assertEqual(len(ch.points), 7)
+        self.assertEqual(ch.spokeCount, 4)
+        self.assertEqual(ch.seriesVertices, {
+            'dataset1': ([0, 1, 2], [0.25, 0.5, 1.0]),
+            'dataset2': ([0, 1, 2, 3], [1.0, 0.75, 0.5, 0.25]),
+        })
+
+    def test_datasetOrder(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset1 = ('dataset1', ([0, 1], [1, 2], [2, 4]))
+        dataset2 = ('dataset2', ([0, 4], [1, 3], [2, 2]))
+
+        vertices = []
+        for dataset in ((dataset1, dataset2), (dataset2, dataset1)):
+            ch = pycha.polygonal.PolygonalChart(surface)
+            ch.addDataset(dataset)
+            ch._updateXY()
+            ch._updateChart()
+            vertices.append(ch.seriesVertices)
+        self.assertEqual(vertices[0], vertices[1])
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(RadialTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -17,21 +17,51 @@
 
 import unittest
 
+from . import backend
 from . import bar
+from . import binary
+from . import cache
 from . import chart
 from . import color
+from . import density
+from . import downsample
+from . import histogram
 from . import line
+from . import parallel
 from . import pie
+from . import radial
+from . import scatter
+from . import series
+from . import spokes
+from . import stackedarea
+from . import stacking
+from . import stream
+from . import text
 from . import utils
 
 
 def test_suite():
     return unittest.TestSuite((
+        backend.test_suite(),
         bar.test_suite(),
+        binary.test_suite(),
+        cache.test_suite(),
         chart.test_suite(),
         color.test_suite(),
+        density.test_suite(),
+        downsample.test_suite(),
+        histogram.test_suite(),
         line.test_suite(),
+        parallel.test_suite(),
         pie.test_suite(),
+        radial.test_suite(),
+        scatter.test_suite(),
+        series.test_suite(),
+        spokes.test_suite(),
+        stackedarea.test_suite(),
+        stacking.test_suite(),
+        stream.test_suite(),
+        text.test_suite(),
         utils.test_suite(),
     ))
 
@@ -0,0 +1,167 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import unittest
+
+from pycha.backend import cairo
+import pycha.line
+import pycha.scatter
+
+
+class RecordingContext(object):
+    """Context that records every call made to a real context"""
+
+    def __init__(self, surface):
+        self.context = cairo.Context(surface)
+        self.calls = []
+
+    def names(self):
+        return [name for name, args in self.calls]
+
+    def __getattr__(self, name):
+        method = getattr(self.context, name)
+
+        def record(*args):
+            self.calls.append((name, args))
+            return method(*args)
+        return record
+
+
+class ScatterplotTests(unittest.TestCase):
+
+    def _render(self, mode, binShape='square'):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 200, 200)
+        dataset = (
+            ('dataset1', [(i, i % 7) for i in range(100)]),
+            ('dataset2', [(i, i % 5) for i in range(100)]),
+        )
+        options = {'scatter': {'mode': mode, 'binShape': binShape}}
+        ch = pycha.scatter.ScatterplotChart(surface, options)
+        ch.addDataset(dataset)
+        ch.render()
+        return ch
+
+    def _record(self, ch):
+        cx = RecordingContext(ch.surface)
+        ch._renderChart(cx)
+        return cx.names()
+
+    def test_modes(self):
+        # a single path with every symbol of each dataset
+        names = self._record(self._render('path'))
+        self.assertEqual(names.count('fill'), 2)
+        self.assertEqual(names.count('arc'), 200)
+
+        # the pre-rendered symbol is the source of every paint
+        names = self._record(self._render('stamp'))
+        self.assertEqual(names.count('set_source_surface'), 200)
+        self.assertEqual(names.count('arc'), 0)
+
+        # a single path with one pixel per point of each dataset
+        names = self._record(self._render('pixel'))
+        self.assertEqual(names.count('fill'), 2)
+        self.assertEqual(names.count('rectangle'), 200)
+        self.assertEqual(names.count('arc'), 0)
+
+    def _renderDensity(self, binShape):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 200, 200)
+        # clusters of 1, 10 and 100 points
+        points = [(10, 10)] + [(50, 50)] * 10 + [(90, 90)] * 100
+        options = {
+            'axis': {'x': {'range': (0, 100)}, 'y': {'range': (0, 100)}},
+            'scatter': {'mode': 'density', 'binShape': binShape,
+                        'binSize': 4},
+        }
+        ch = pycha.scatter.ScatterplotChart(surface, options)
+        ch.addDataset((('dataset1', points), ))
+        ch.render()
+        cx = RecordingContext(surface)
+        ch._renderChart(cx)
+        return ch, cx
+
+    def test_density(self):
+        for binShape, calls in (('square', 'rectangle'), ('hex', 'move_to')):
+            ch, cx = self._renderDensity(binShape)
+            chart = ch.layout.chart
+            names = cx.names()
+
+            # the bins are clipped to the chart area
+            clip = names.index('clip')
+            self.assertEqual(cx.calls[clip - 1],
+                             ('rectangle', (chart.x, chart.y,
+                                            chart.w, chart.h)))
+            self.assertTrue(names.index('restore') > clip)
+
+            # one bin and one fill for each opacity level, with the
+            # opacity growing with the logarithm of the count
+            self.assertEqual(names.count('fill'), 3)
+            self.assertEqual(names[clip:].count(calls), 3)
+            alphas = [args[3] for name, args in cx.calls
+                      if name == 'set_source_rgba']
+            self.assertEqual(alphas, [2 / 8.0, 5 / 8.0, 1.0])
+
+            # each bin is drawn around the points counted in it
+            positions = [args[:2] for name, args in cx.calls[clip:]
+                       if name == calls]
+            for (x, y), value in zip(positions, (10, 50, 90)):
+                self.assertTrue(chart.x <= x <= chart.x + chart.w)
+                self.assertTrue(chart.y <= y <= chart.y + chart.h)
+                self.assertTrue(
+                    abs(x - (chart.x + value / 100.0 * chart.w)) <= 8)
+                self.assertTrue(
+                    abs(y - (chart.y + (1 - value / 100.0) * chart.h)) <= 8)
+
+        self.assertRaises(ValueError, self._render, 'density', 'foo')
+
+    def test_extend(self):
+        for mode in ('path', 'stamp', 'pixel'):
+            ch = self._render(mode)
+            cx = RecordingContext(ch.surface)
+            original = pycha.line.cairo.Context
+
+            def context(surface):
+                if surface is ch.surface:
+                    return cx
+                return original(surface)
+
+            pycha.line.cairo.Context = context
+            try:
+                self.assertTrue(ch.extend('dataset1', [(50, 3), (51, 4)]))
+            finally:
+                pycha.line.cairo.Context = original
+            # the new points are drawn as symbols, not joined by lines
+            self.assertFalse('line_to' in cx.names())
+            self.assertFalse('stroke' in cx.names())
+            self.assertTrue('fill' in cx.names())
+            self.assertEqual(len(ch.datasets[0][1]), 102)
+
+        # the density bins depend on all the points
+        ch = self._render('density')
+        self.assertFalse(ch.extend('dataset1', [(50, 3)]))
+
+    def test_invalidMode(self):
+        self.assertRaises(ValueError, self._render, 'foo')
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(ScatterplotTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
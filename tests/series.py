@@ -0,0 +1,229 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import array
+import unittest
+
+from pycha.compat import numpy
+import pycha.series
+
+
+class ColumnTests(unittest.TestCase):
+
+    def test_sequence(self):
+        col = pycha.series.column([1, 2, 3.5])
+        self.assertEqual(list(col), [1.0, 2.0, 3.5])
+
+    def test_buffer(self):
+        values = array.array('d', [1.0, 2.0, 3.0])
+        col = pycha.series.column(values)
+        values[0] = 10.0
+        self.assertEqual(col[0], 10.0)
+
+    def test_raw_bytes(self):
+        raw = array.array('d', [4.0, 5.0]).tobytes()
+        col = pycha.series.column(raw)
+        self.assertEqual(list(col), [4.0, 5.0])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        values = numpy.arange(5, dtype=numpy.float64)
+        col = pycha.series.column(values)
+        self.assertTrue(col is values)
+
+        col = pycha.series.column(numpy.arange(5))
+        self.assertEqual(col.dtype, numpy.float64)
+
+        self.assertRaises(ValueError, pycha.series.column,
+                          numpy.zeros((2, 2)))
+
+
+class SeriesTests(unittest.TestCase):
+
+    def test_sequence_protocol(self):
+        series = pycha.series.Series([0, 1, 2], [3, 4, 5])
+        self.assertEqual(len(series), 3)
+        self.assertEqual(series[1], (1.0, 4.0))
+        self.assertEqual(list(series), [(0.0, 3.0), (1.0, 4.0), (2.0, 5.0)])
+        self.assertEqual(list(series[1:]), [(1.0, 4.0), (2.0, 5.0)])
+
+    def test_yerr(self):
+        series = pycha.series.Series([0, 1], [3, 4], [0.5, 0.25])
+        self.assertEqual(series[0], (0.0, 3.0, 0.5))
+        self.assertEqual(len(series[1]), 3)
+
+    def test_lengths(self):
+        self.assertRaises(ValueError, pycha.series.Series, [0, 1], [1])
+        self.assertRaises(ValueError, pycha.series.Series, [0, 1], [1, 2],
+                          [0.1])
+
+    def test_fromPairs(self):
+        series = pycha.series.Series.fromPairs([(0, 1), (1, 3)])
+        self.assertEqual(list(series.y), [1.0, 3.0])
+        series = pycha.series.Series.fromPairs([(0, 1, 0.1)])
+        self.assertEqual(series[0], (0.0, 1.0, 0.1))
+        self.assertEqual(len(pycha.series.Series.fromPairs([])), 0)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_fromArray(self):
+        data = numpy.asfortranarray([[0.0, 1.0], [1.0, 2.0], [2.0, 0.5]])
+        series = pycha.series.Series.fromArray(data)
+        self.assertEqual(len(series), 3)
+        data[1, 1] = 7.0
+        self.assertEqual(series[1], (1.0, 7.0))
+
+        self.assertRaises(ValueError, pycha.series.Series.fromArray,
+                          numpy.zeros((3, 4)))
+
+    def test_extents(self):
+        series = pycha.series.Series([3, 1, 2], [-1, 5, 0])
+        self.assertEqual(series.extents(), (1.0, 3.0, -1.0, 5.0))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_as_store(self):
+        store = pycha.series.as_store(numpy.zeros((4, 3)))
+        self.assertTrue(isinstance(store, pycha.series.Series))
+        self.assertEqual(len(store[0]), 3)
+
+        points = [(0, 1), (1, 2)]
+        self.assertTrue(pycha.series.as_store(points) is points)
+
+    def test_append(self):
+        points = [(0, 1), (1, 2)]
+        self.assertTrue(pycha.series.append(points, [(2, 3)]) is points)
+        self.assertEqual(points, [(0, 1), (1, 2), (2, 3)])
+
+        self.assertEqual(pycha.series.append(((0, 1), ), [(1, 2)]),
+                         [(0, 1), (1, 2)])
+
+        series = pycha.series.Series([0, 1], [1, 2], [0.1, 0.2])
+        self.assertTrue(pycha.series.append(series, []) is series)
+        self.assertTrue(pycha.series.append(series, [(2, 3, 0.3)]) is series)
+        self.assertEqual(list(series),
+                         [(0, 1, 0.1), (1, 2, 0.2), (2, 3, 0.3)])
+        self.assertRaises(ValueError, pycha.series.append, series, [(3, 4)])
+        self.assertRaises(ValueError, pycha.series.append,
+                          pycha.series.Series([0], [1]), [(1, 2, 0.2)])
+
+    def test_extend(self):
+        x = array.array('d', [0, 1])
+        y = array.array('d', [5, 6])
+        series = pycha.series.Series(x, y)
+        buffer = None
+        allocations = 0
+        for i in range(2, 100):
+            series.extend([(i, i + 5)])
+            if series._buffers['x'] is not buffer:
+                buffer = series._buffers['x']
+                allocations += 1
+        self.assertEqual(list(series), [(i, i + 5) for i in range(100)])
+        self.assertEqual(series.version, 98)
+        self.assertEqual(series.extents(), (0, 99, 5, 104))
+        # the buffers double their capacity when they are full
+        self.assertTrue(allocations <= 8)
+        # the arrays shared by the series are never changed
+        self.assertEqual(list(x), [0, 1])
+        self.assertEqual(list(y), [5, 6])
+
+        series.extend([])
+        self.assertEqual(series.version, 98)
+
+
+class ExtentsTests(unittest.TestCase):
+
+    def test_extents(self):
+        stores = (
+            [(0, 1), (1, 1), (2, 3)],
+            [],
+            pycha.series.Series([-1, 3], [2, 4]),
+        )
+        self.assertEqual(pycha.series.extents(stores), (-1, 3, 1, 4))
+
+    def test_empty(self):
+        self.assertRaises(ValueError, pycha.series.extents, ([], []))
+
+
+class NormalizeTests(unittest.TestCase):
+
+    def test_normalize(self):
+        x, y, visible = pycha.series.normalize([0, 1, 4], [0, 2, 1],
+                                               0, 0.5, 0, 0.5)
+        self.assertEqual(x, [0.0, 0.5, 2.0])
+        self.assertEqual(y, [1.0, 0.0, 0.5])
+        self.assertEqual(visible, [True, True, False])
+        self.assertEqual(pycha.series.compress(x, visible), [0.0, 0.5])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_normalize_numpy(self):
+        series = pycha.series.Series([0, 1, 4], [0, 2, 1])
+        x, y, visible = pycha.series.normalize(series.x, series.y,
+                                               0, 0.5, 0, 0.5)
+        self.assertEqual(x.tolist(), [0.0, 0.5, 2.0])
+        self.assertEqual(y.tolist(), [1.0, 0.0, 0.5])
+        self.assertEqual(visible.tolist(), [True, True, False])
+        self.assertEqual(pycha.series.aslist(
+            pycha.series.compress(y, visible)), [1.0, 0.0])
+
+
+class RingSeriesTests(unittest.TestCase):
+
+    def test_append(self):
+        ring = pycha.series.RingSeries(3)
+        self.assertEqual(len(ring), 0)
+        self.assertEqual(list(ring), [])
+        self.assertRaises(ValueError, ring.extents)
+
+        ring.extend([(0, 5), (1, 6)])
+        self.assertEqual(list(ring), [(0, 5), (1, 6)])
+        ring.extend([(2, 7), (3, 8)])
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.version, 4)
+        self.assertEqual(list(ring), [(1, 6), (2, 7), (3, 8)])
+        self.assertEqual(ring[0], (1, 6))
+        self.assertEqual(ring[-1], (3, 8))
+        self.assertRaises(IndexError, ring.__getitem__, 3)
+        self.assertEqual(list(ring[1:]), [(2, 7), (3, 8)])
+        self.assertEqual(pycha.series.aslist(ring.x), [1, 2, 3])
+
+        x, y = pycha.series.columns(ring)
+        self.assertEqual(pycha.series.aslist(y), [6, 7, 8])
+
+    def test_extents(self):
+        values = [5, 1, 4, 8, 2, 2, 7, 3, 9, 0, 6, 6]
+        ring = pycha.series.RingSeries(4)
+        for i, value in enumerate(values):
+            ring.append((i, value))
+            window = values[max(i - 3, 0):i + 1]
+            self.assertEqual(ring.extents(),
+                             (max(i - 3, 0), i, min(window), max(window)))
+
+    def test_capacity(self):
+        self.assertRaises(ValueError, pycha.series.RingSeries, 0)
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(ColumnTests),
+        unittest.makeSuite(SeriesTests),
+        unittest.makeSuite(RingSeriesTests),
+        unittest.makeSuite(ExtentsTests),
+        unittest.makeSuite(NormalizeTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,75 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import math
+import unittest
+
+import pycha.spokes
+
+
+class SpokesTests(unittest.TestCase):
+
+    def test_angles(self):
+        spokes = pycha.spokes.Spokes(4)
+        self.assertEqual(len(spokes), 4)
+        for angle, expected in zip(spokes.angles,
+                                   (math.pi / 2, 0, -math.pi / 2, -math.pi)):
+            self.assertAlmostEqual(angle, expected)
+        self.assertAlmostEqual(spokes.cos[1], 1.0)
+        self.assertAlmostEqual(spokes.sin[2], -1.0)
+
+    def test_point(self):
+        spokes = pycha.spokes.Spokes(4)
+        # the first spoke points to the top and the next ones go clockwise
+        expected = [(10, 0), (0, 10), (10, 20), (20, 10)]
+        for i, (x, y) in enumerate(expected):
+            point = spokes.point(i, 10, 10, 10)
+            self.assertAlmostEqual(point[0], x)
+            self.assertAlmostEqual(point[1], y)
+
+        # indexes wrap around
+        self.assertEqual(spokes.point(5, 10, 10, 10),
+                         spokes.point(1, 10, 10, 10))
+
+    def test_vertices(self):
+        spokes = pycha.spokes.Spokes(8)
+        vertices = spokes.vertices([0, 2, 9], [1, 2, 3], 5, 5)
+        self.assertEqual(len(vertices), 3)
+        for vertex, (i, radius) in zip(vertices, ((0, 1), (2, 2), (1, 3))):
+            point = spokes.point(i, 5, 5, radius)
+            self.assertAlmostEqual(vertex[0], point[0])
+            self.assertAlmostEqual(vertex[1], point[1])
+
+    def test_vertices_scale(self):
+        spokes = pycha.spokes.Spokes(3)
+        self.assertEqual(spokes.vertices([0, 1], [0.5, 1], 0, 0, 10),
+                         spokes.vertices([0, 1], [5, 10], 0, 0))
+
+    def test_get_spokes(self):
+        spokes = pycha.spokes.get_spokes(360)
+        self.assertEqual(len(spokes), 360)
+        self.assertTrue(pycha.spokes.get_spokes(360) is spokes)
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(SpokesTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,109 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import unittest
+
+from pycha.backend import cairo
+import pycha.stackedarea
+
+
+class StackedAreaTests(unittest.TestCase):
+
+    def test_init(self):
+        ch = pycha.stackedarea.StackedAreaChart(None)
+        self.assertEqual(ch.layers, [])
+
+    def test_updateChart(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', ([0, 1], [1, 2], [2, 3])),
+            ('dataset2', ([0, 2], [2, 1])),
+            )
+        ch = pycha.stackedarea.StackedAreaChart(surface)
+        ch.addDataset(dataset)
+        ch._updateXY()
+        ch._updateChart()
+        self.assertEqual(ch.minyval, 0)
+        self.assertEqual(ch.maxyval, 4)
+        self.assertAlmostEqual(ch.yscale, 0.25, 4)
+
+        layers = (
+            ('dataset1', [0, 0.5, 1], [1, 1, 1], [0.75, 0.5, 0.25]),
+            ('dataset2', [0, 0.5, 1], [0.75, 0.5, 0.25], [0.25, 0.5, 0]),
+        )
+        self.assertEqual(len(ch.layers), len(layers))
+        for layer, (name, x, bottom, top) in zip(ch.layers, layers):
+            self.assertEqual(layer.name, name)
+            self.assertEqual(layer.x, x)
+            self.assertEqual(layer.bottom, bottom)
+            self.assertEqual(layer.top, top)
+
+        self.assertEqual(ch.layers[1].outline(), [
+            (0, 0.25), (0.5, 0.5), (1, 0), (1, 0.25), (0.5, 0.5), (0, 0.75),
+        ])
+
+    def test_percent(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', ([0, 1], [1, 3])),
+            ('dataset2', ([0, 3], [1, 1])),
+            )
+        ch = pycha.stackedarea.StackedAreaChart(surface, {
+            'stack': {'mode': 'percent'},
+        })
+        ch.addDataset(dataset)
+        ch._updateXY()
+        ch._updateChart()
+        self.assertEqual(ch.maxyval, 100)
+        self.assertEqual(ch.layers[0].top, [0.75, 0.25])
+        self.assertEqual(ch.layers[1].top, [0, 0])
+
+    def test_silhouette(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', ([0, 1], [1, 2])),
+            ('dataset2', ([0, 1], [1, 2])),
+            )
+        ch = pycha.stackedarea.StackedAreaChart(surface, {
+            'stack': {'mode': 'silhouette'},
+        })
+        ch.addDataset(dataset)
+        ch._updateXY()
+        self.assertEqual((ch.minyval, ch.maxyval), (-2, 2))
+        self.assertAlmostEqual(ch.origin, 0.5, 4)
+
+    def test_render(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', ([0, 1], [1, 2], [2, 3])),
+            ('dataset2', ([0, 2], [2, 1])),
+            ('dataset3', ()),
+            )
+        ch = pycha.stackedarea.StackedAreaChart(surface)
+        ch.addDataset(dataset)
+        ch.render()
+        self.assertEqual(len(ch.layers), 3)
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(StackedAreaTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -18,8 +18,7 @@
 
 import unittest
 
-import cairocffi as cairo
-
+from pycha.backend import cairo
 import pycha.stackedbar
 
 
@@ -107,6 +106,27 @@ class StackedVerticalBarTests(unittest.TestCase):
             self.assertEqual(b1.yval, b2.yval)
             self.assertEqual(b1.name, b2.name)
 
+    def test_updateChartNegative(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
+        dataset = (
+            ('dataset1', ([0, 2], [1, -1])),
+            ('dataset2', ([0, -3], [1, -2])),
+            )
+        ch = pycha.stackedbar.StackedVerticalBarChart(surface)
+        ch.addDataset(dataset)
+        ch._updateXY()
+        ch._updateChart()
+        self.assertEqual(ch.minyval, -3)
+        self.assertEqual(ch.yrange, 5)
+        self.assertAlmostEqual(ch.origin, 0.6, 4)
+
+        # positive and negative values are stacked separately
+        bars = [(0.0, 0.4), (0.4, 0.2), (0.4, 0.6), (0.6, 0.4)]
+        self.assertEqual(len(ch.bars), len(bars))
+        for bar, (y, h) in zip(ch.bars, bars):
+            self.assertAlmostEqual(bar.y, y, 4)
+            self.assertAlmostEqual(bar.h, h, 4)
+
     def test_updateTicks(self):
         surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 500, 500)
         dataset = (
@@ -123,10 +143,11 @@ class StackedVerticalBarTests(unittest.TestCase):
             self.assertAlmostEqual(ch.xticks[i][0], xticks[i][0], 4)
             self.assertAlmostEqual(ch.xticks[i][1], xticks[i][1], 4)
 
+        # the datasets are aligned by x: the highest stack is 4 at x=3
         yticks = [
-            (1.0, 0.0), (0.9, 0.7), (0.8, 1.4), (0.7, 2.1), (0.6, 2.8),
-            (0.5, 3.5), (0.4, 4.2), (0.3, 4.9), (0.2, 5.6),
-            (0.1, 6.3), (0.0, 7.0),
+            (1.0, 0.0), (0.9, 0.4), (0.8, 0.8), (0.7, 1.2), (0.6, 1.6),
+            (0.5, 2.0), (0.4, 2.4), (0.3, 2.8), (0.2, 3.2),
+            (0.1, 3.6), (0.0, 4.0),
             ]
         for i in range(len(yticks)):
             self.assertAlmostEqual(ch.yticks[i][0], yticks[i][0], 4)
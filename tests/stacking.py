@@ -0,0 +1,125 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import unittest
+
+from pycha.compat import numpy
+from pycha.series import Series, aslist
+import pycha.stacking
+
+
+def rows(matrix):
+    return [aslist(row) for row in matrix]
+
+
+class StackTests(unittest.TestCase):
+
+    def test_aligned(self):
+        s = pycha.stacking.stack([
+            [(0, 1), (1, 2)],
+            [(0, 3), (1, 1)],
+        ])
+        self.assertEqual(aslist(s.xvals), [0, 1])
+        self.assertEqual(rows(s.values), [[1, 2], [3, 1]])
+        self.assertEqual(rows(s.start), [[0, 0], [1, 2]])
+        self.assertEqual(rows(s.end), [[1, 2], [4, 3]])
+        self.assertEqual(s.bounds(), (0.0, 4.0))
+
+    def test_ragged(self):
+        s = pycha.stacking.stack([
+            [(2, 3), (0, 1)],
+            Series([1, 2, 3], [4, 5, 6]),
+        ])
+        self.assertEqual(aslist(s.xvals), [0, 1, 2, 3])
+        self.assertEqual(rows(s.present), [[True, False, True, False],
+                                           [False, True, True, True]])
+        self.assertEqual(rows(s.end), [[1, 0, 3, 0], [1, 4, 8, 6]])
+        self.assertEqual(s.segments(0), ([0, 2], [1, 3], [0, 0], [1, 3]))
+        self.assertEqual(s.segments(1), ([1, 2, 3], [4, 5, 6],
+                                         [0, 3, 0], [4, 8, 6]))
+
+    def test_repeated_x(self):
+        s = pycha.stacking.stack([[(0, 1), (0, 2), (1, 1)]])
+        self.assertEqual(rows(s.values), [[3, 1]])
+
+    def test_negative(self):
+        s = pycha.stacking.stack([
+            [(0, 2), (1, -1)],
+            [(0, -3), (1, -2)],
+            [(0, 1), (1, 4)],
+        ])
+        self.assertEqual(rows(s.start), [[0, 0], [0, -1], [2, 0]])
+        self.assertEqual(rows(s.end), [[2, -1], [-3, -3], [3, 4]])
+        self.assertEqual(s.bounds(), (-3.0, 4.0))
+
+    def test_percent(self):
+        s = pycha.stacking.stack([
+            [(0, 1), (1, 2)],
+            [(0, 3), (1, -2)],
+        ], 'percent')
+        self.assertEqual(rows(s.values), [[1, 2], [3, -2]])
+        self.assertEqual(rows(s.start), [[0, 0], [25, 0]])
+        self.assertEqual(rows(s.end), [[25, 50], [100, -50]])
+        self.assertEqual(s.bounds(), (-50.0, 100.0))
+
+    def test_silhouette(self):
+        s = pycha.stacking.stack([
+            [(0, 1), (1, 2)],
+            [(0, 3), (1, 2)],
+        ], 'silhouette')
+        self.assertEqual(rows(s.start), [[-2, -2], [-1, 0]])
+        self.assertEqual(rows(s.end), [[-1, 0], [2, 2]])
+
+    def test_wiggle(self):
+        s = pycha.stacking.stack([
+            [(0, 1), (1, 2), (2, 3)],
+            [(0, 2), (2, 1)],
+        ], 'wiggle')
+        self.assertEqual(rows(s.start), [[0, -0.5, -1.25], [1, 1.5, 1.75]])
+        self.assertEqual(rows(s.end), [[1, 1.5, 1.75], [3, 1.5, 2.75]])
+
+        # a constant layer does not move the baseline
+        s = pycha.stacking.stack([[(0, 1), (1, 1), (2, 1)]], 'wiggle')
+        self.assertEqual(rows(s.start), [[0, 0, 0]])
+
+    def test_invalid_mode(self):
+        self.assertRaises(ValueError, pycha.stacking.stack, [], 'foo')
+
+    def test_empty(self):
+        s = pycha.stacking.stack([[], []])
+        self.assertEqual(len(s), 2)
+        self.assertEqual(s.bounds(), (0.0, 0.0))
+        self.assertEqual(s.segments(0), ([], [], [], []))
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_numpy(self):
+        layers, buckets = 50, 1000
+        x = numpy.arange(buckets)
+        s = pycha.stacking.stack([Series(x, numpy.ones(buckets))
+                                  for i in range(layers)])
+        self.assertEqual(s.end.shape, (layers, buckets))
+        self.assertEqual(s.bounds(), (0.0, float(layers)))
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(StackTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,118 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import io
+import os
+import struct
+import tempfile
+import unittest
+
+from pycha.compat import numpy
+import pycha.stream
+
+
+def spiky(n):
+    """Return n points of a saw tooth line with a spike in the middle"""
+    return [(i, 100.0 if i == n // 2 else i % 10) for i in range(n)]
+
+
+class AggregatorTests(unittest.TestCase):
+
+    def test_few_points(self):
+        series = pycha.stream.read_points([(0, 1), (1, 3), (2, 2)])
+        self.assertEqual(list(series), [(0, 1), (1, 3), (2, 2)])
+        self.assertEqual(series.count, 3)
+        self.assertEqual(series.extents(), (0, 2, 1, 3))
+
+    def test_aggregation(self):
+        points = spiky(1000)
+        aggregator = pycha.stream.Aggregator(maxPoints=64)
+        aggregator.extend(iter(points))
+        series = aggregator.series()
+
+        self.assertTrue(len(series) <= 64)
+        self.assertEqual(series.count, 1000)
+        self.assertEqual(series.extents(), (0, 999, 0, 100))
+        kept = list(series)
+        self.assertEqual(kept[0], (0, 0))
+        self.assertEqual(kept[-1], (999, 9))
+        self.assertTrue((500, 100) in kept)
+        self.assertEqual(kept, sorted(kept))
+
+    def test_empty(self):
+        series = pycha.stream.read_points([])
+        self.assertEqual(len(series), 0)
+        self.assertEqual(series.count, 0)
+
+
+class ReadTests(unittest.TestCase):
+
+    def test_read_csv(self):
+        source = io.StringIO(u'time,value\n0,1\n\n1,3\n2,2\n')
+        series = pycha.stream.read_csv(source, header=True)
+        self.assertEqual(list(series), [(0, 1), (1, 3), (2, 2)])
+
+        source = io.StringIO(u'a\t0\t1\nb\t1\t3\n')
+        series = pycha.stream.read_tsv(source, xColumn=1, yColumn=2)
+        self.assertEqual(list(series), [(0, 1), (1, 3)])
+
+    def test_read_binary(self):
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for x, y in spiky(5000):
+                    f.write(struct.pack('<dd', x, y))
+            series = pycha.stream.read_binary(path, maxPoints=100)
+        finally:
+            os.remove(path)
+
+        self.assertTrue(len(series) <= 100)
+        self.assertEqual(series.count, 5000)
+        self.assertEqual(series.extents(), (0, 4999, 0, 100))
+        kept = list(series)
+        self.assertEqual(kept[0], (0, 0))
+        self.assertEqual(kept[-1], (4999, 9))
+        self.assertTrue((2500, 100) in kept)
+
+    def test_read_empty_binary(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            self.assertEqual(len(pycha.stream.read_binary(path)), 0)
+        finally:
+            os.remove(path)
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_reduce_columns(self):
+        data = numpy.array(spiky(1001), dtype=numpy.float64)
+        series = pycha.stream.reduce_columns(data[:, 0], data[:, 1],
+                                             maxPoints=40)
+        self.assertTrue(len(series) <= 40)
+        self.assertEqual(series.extents(), (0, 1000, 0, 100))
+        self.assertTrue((500, 100) in list(series))
+        self.assertEqual(list(series)[-1], (1000, 0))
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(AggregatorTests),
+        unittest.makeSuite(ReadTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,87 @@
+# -*- encoding: utf-8 -*-
+# Copyright(c) 2007-2010 by Lorenzo Gil Sanchez <lorenzo.gil.sanchez@gmail.com>
+#              2010 by Yaco S.L. <lgs@yaco.es>
+#
+# This file is part of PyCha.
+#
+# PyCha is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PyCha is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+
+import unittest
+
+from pycha.backend import cairo
+import pycha.text
+
+
+class TextExtentsCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 100, 100)
+        self.cx = cairo.Context(surface)
+
+    def test_get(self):
+        cache = pycha.text.TextExtentsCache()
+        extents = cache.get(self.cx, u'label', 'Tahoma', 9)
+        self.assertEqual(len(extents), 6)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        self.assertEqual(cache.get(self.cx, u'label', 'Tahoma', 9), extents)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache.get(self.cx, u'label', 'Tahoma', 12)
+        cache.get(self.cx, u'label', 'Tahoma', 9,
+                  weight=cairo.FONT_WEIGHT_BOLD)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        self.assertEqual(len(cache), 3)
+
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+        self.assertEqual(len(cache), 0)
+
+    def test_capacity(self):
+        cache = pycha.text.TextExtentsCache(capacity=2)
+        cache.get(self.cx, u'a', 'Tahoma', 9)
+        cache.get(self.cx, u'b', 'Tahoma', 9)
+        cache.get(self.cx, u'a', 'Tahoma', 9)
+        # b is the least recently used text
+        cache.get(self.cx, u'c', 'Tahoma', 9)
+        self.assertEqual(len(cache), 2)
+        cache.get(self.cx, u'a', 'Tahoma', 9)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+        cache.get(self.cx, u'b', 'Tahoma', 9)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+        cache = pycha.text.TextExtentsCache(capacity=0)
+        cache.get(self.cx, u'a', 'Tahoma', 9)
+        self.assertEqual(len(cache), 0)
+
+
+class ScaledFontTests(unittest.TestCase):
+
+    def test_get_scaled_font(self):
+        font = pycha.text.get_scaled_font('Tahoma', 9)
+        self.assertTrue(isinstance(font, cairo.ScaledFont))
+        self.assertTrue(pycha.text.get_scaled_font('Tahoma', 9) is font)
+        self.assertFalse(pycha.text.get_scaled_font('Tahoma', 10) is font)
+        bold = pycha.text.get_scaled_font('Tahoma', 9,
+                                          weight=cairo.FONT_WEIGHT_BOLD)
+        self.assertFalse(bold is font)
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.makeSuite(TextExtentsCacheTests),
+        unittest.makeSuite(ScaledFontTests),
+    ))
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')